@@ -1,40 +1,119 @@
 #!/usr/bin/env python3
-"""Minimal validator for TriSynk Intent DSL drafts."""
+"""Minimal validator for TriSynk Intent DSL drafts.
+
+With no arguments one intent is read from stdin and the result is
+``{"status": "ok"}`` or ``{"status": "fail", "error": ...}``. Given files or
+directories (each expanded to its ``*.yaml``), every intent is validated in this
+one process. Once there are ``POOL_THRESHOLD`` files, they are spread across
+``-j`` worker processes. The result is a single JSON document with every
+problem of every file and the per-file time in ms. Either mode exits 1 if
+anything failed.
+"""
+from __future__ import annotations
+
+import argparse
 import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 try:
     import yaml
 except ModuleNotFoundError as exc:  # pragma: no cover
     raise SystemExit("PyYAML is required: pip install pyyaml") from exc
 
 REQUIRED_TOP_LEVEL = {"intent", "meta", "requirements", "constraints", "interop", "verifications", "telemetry"}
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+POOL_THRESHOLD = 64
 
 
-def load(stream):
-    data = yaml.safe_load(stream)
+def problems(data: object) -> list[str]:
+    """Every schema violation in a parsed intent (empty when valid)."""
     if not isinstance(data, dict):
-        raise TypeError("Intent must be a mapping")
+        return ["Intent must be a mapping"]
+    found = []
     missing = REQUIRED_TOP_LEVEL - data.keys()
     if missing:
-        raise KeyError(f"Missing sections: {sorted(missing)}")
-    if not data["meta"].get("issue"):
-        raise ValueError("meta.issue is required")
-    if not data["meta"].get("docs"):
-        raise ValueError("meta.docs must reference documentation anchors")
-    if not data["telemetry"].get("slos"):
-        raise ValueError("telemetry.slos required")
+        found.append(f"Missing sections: {sorted(missing)}")
+    meta = data.get("meta") if isinstance(data.get("meta"), dict) else {}
+    telemetry = data.get("telemetry") if isinstance(data.get("telemetry"), dict) else {}
+    if not meta.get("issue"):
+        found.append("meta.issue is required")
+    if not meta.get("docs"):
+        found.append("meta.docs must reference documentation anchors")
+    if not telemetry.get("slos"):
+        found.append("telemetry.slos required")
+    return found
+
+
+def load(stream):
+    data = yaml.load(stream, Loader=YAML_LOADER)
+    found = problems(data)
+    if found:
+        raise ValueError("; ".join(found))
     return data
 
 
-def main() -> None:
-    content = sys.stdin.read()
+def check_file(path: str) -> dict:
+    started = time.perf_counter()
     try:
-        load(content)
-    except Exception as exc:  # noqa: BLE001
-        print(json.dumps({"status": "fail", "error": str(exc)}))
-        sys.exit(1)
-    print(json.dumps({"status": "ok"}))
+        errors = problems(yaml.load(Path(path).read_text(encoding="utf-8"), Loader=YAML_LOADER))
+    except (OSError, UnicodeDecodeError, yaml.YAMLError) as exc:
+        errors = [f"{type(exc).__name__}: {exc}"]
+    result = {"status": "fail" if errors else "ok", "ms": round((time.perf_counter() - started) * 1000, 3)}
+    if errors:
+        result["errors"] = errors
+    return result
+
+
+def expand(paths: list[Path]) -> list[str]:
+    files: list[str] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(str(item) for item in sorted(path.glob("*.yaml")))
+        else:
+            files.append(str(path))
+    return files
+
+
+def check_files(files: list[str], jobs: int) -> dict:
+    started = time.perf_counter()
+    if len(files) >= POOL_THRESHOLD and jobs > 1:
+        with ProcessPoolExecutor(jobs) as pool:
+            results = list(pool.map(check_file, files, chunksize=max(1, len(files) // (jobs * 4))))
+    else:
+        results = [check_file(path) for path in files]
+    failed = sum(result["status"] == "fail" for result in results)
+    return {
+        "status": "fail" if failed else "ok",
+        "checked": len(files),
+        "failed": failed,
+        "wall_ms": round((time.perf_counter() - started) * 1000, 3),
+        "files": dict(zip(files, results)),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", type=Path, help="Intent files or directories (default: read one intent from stdin)")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker processes for large batches (default: CPU count)")
+    args = parser.parse_args()
+
+    if not args.paths:
+        try:
+            load(sys.stdin.read())
+        except Exception as exc:  # noqa: BLE001
+            print(json.dumps({"status": "fail", "error": str(exc)}))
+            return 1
+        print(json.dumps({"status": "ok"}))
+        return 0
+
+    report = check_files(expand(args.paths), args.jobs or os.cpu_count() or 1)
+    print(json.dumps(report, indent=2))
+    return 1 if report["status"] == "fail" else 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
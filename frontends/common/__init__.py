@@ -0,0 +1 @@
+"""Shared driver code for the TriSynk prototype frontends."""
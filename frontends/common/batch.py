@@ -0,0 +1,152 @@
+"""Input expansion and process-pool fan-out for frontend batch runs."""
+from __future__ import annotations
+
+import glob
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from common import ir as irmod
+from common import tracing
+from common.cache import IRCache
+from common.ir import RecordSource
+
+GLOB_CHARS = set("*?[")
+
+
+def _at(path: Path, cwd: Path | None) -> Path:
+    """Anchor a user-supplied relative path at ``cwd`` (a no-op for absolute paths or ``cwd=None``)."""
+    return path if cwd is None else cwd / path
+
+
+def is_batch_spec(spec: str, cwd: Path | None = None) -> bool:
+    return bool(GLOB_CHARS & set(spec)) or _at(Path(spec), cwd).is_dir()
+
+
+def expand_inputs(
+    specs: Iterable[str], suffixes: tuple[str, ...], files_from: Path | None = None, cwd: Path | None = None
+) -> list[Path]:
+    """Resolve files, directories, globs and list files into an ordered, de-duplicated path list."""
+    specs = list(specs)
+    if files_from is not None:
+        lines = files_from.read_text(encoding="utf-8").splitlines()
+        specs.extend(line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#"))
+    paths: list[Path] = []
+    seen: set[Path] = set()
+    for spec in specs:
+        if GLOB_CHARS & set(spec):
+            candidates = [Path(item) for item in sorted(glob.glob(spec, root_dir=cwd, recursive=True))]
+        elif _at(Path(spec), cwd).is_dir():
+            root = _at(Path(spec), cwd)
+            candidates = sorted(Path(spec) / path.relative_to(root) for path in root.rglob("*") if path.suffix in suffixes)
+        else:
+            candidates = [Path(spec)]
+        for path in candidates:
+            if _at(path, cwd).is_dir():
+                continue
+            key = _at(path, cwd).resolve()
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+
+def output_path(path: Path, output_dir: Path, base: Path, suffix: str = ".json", cwd: Path | None = None) -> Path:
+    """Mirror ``path`` below ``output_dir`` relative to the common input root."""
+    try:
+        relative = _at(path, cwd).resolve().relative_to(base)
+    except ValueError:
+        relative = Path(path.name)
+    return output_dir / relative.parent / f"{relative.name}{suffix}"
+
+
+def common_root(paths: list[Path], cwd: Path | None = None) -> Path:
+    parents = [str(_at(path, cwd).resolve().parent) for path in paths]
+    return Path(os.path.commonpath(parents)) if parents else (cwd or Path.cwd())
+
+
+def _read_records(records: RecordSource, file: Path, module: str) -> Iterator[dict]:
+    # Text mode with universal newlines, like Path.read_text(), so the frontend can read in chunks.
+    with file.open(encoding="utf-8") as source:
+        yield from records(source, module)
+
+
+def module_records(
+    records: RecordSource, cache: IRCache | None, path: Path, cwd: Path | None = None
+) -> tuple[Iterator[dict], bool]:
+    """Return ``(record_stream, cache_hit)`` for one module; misses are cached once fully consumed.
+
+    The source is never held in memory as a whole: the cache key is digested
+    in chunks and the frontend reads the file through a text handle.
+    """
+    file = _at(path, cwd)
+    module = str(path)
+    if cache is None:
+        return _read_records(records, file, module), False
+    with tracing.span("read"):
+        with file.open("rb") as fh:
+            key = cache.key_stream(fh)
+    with tracing.span("cache.get"):
+        cached = cache.get(key)
+    if cached is not None:
+        return irmod.split({"module": module, **cached}), True
+
+    def produce() -> Iterator[dict]:
+        # Records go into the cache entry as they stream past; an abandoned stream leaves no entry behind.
+        entry = cache.writer(key)
+        try:
+            for record in _read_records(records, file, module):
+                entry.add(record)
+                yield record
+        except BaseException:
+            entry.abort()
+            raise
+        with tracing.span("cache.put"):
+            entry.commit()
+
+    return produce(), False
+
+
+def compile_module(
+    records: RecordSource, cache: IRCache | None, path: Path, cwd: Path | None = None
+) -> tuple[dict, bool]:
+    """Build the full IR document for one module; returns ``(ir, cache_hit)``."""
+    with tracing.span("module", path=str(path)):
+        stream, hit = module_records(records, cache, path, cwd)
+        with tracing.span("build"):
+            return irmod.assemble(stream), hit
+
+
+def run_batch(
+    records: RecordSource,
+    paths: list[Path],
+    jobs: int,
+    cache: IRCache | None = None,
+    *,
+    cwd: Path | None = None,
+    pool: Executor | None = None,
+) -> Iterator[tuple[Path, Iterator[dict], bool]]:
+    """Yield ``(path, record_stream, cache_hit)`` in input order.
+
+    Serial runs stream records straight from the frontend; with ``jobs > 1`` the
+    parse is spread across worker processes that return whole documents. A
+    long-lived caller can pass its own ``pool`` to keep the workers warm.
+    """
+    workers = min(jobs or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        for path in paths:
+            # The span stays open while the caller consumes the stream, so build/serialize nest inside it.
+            with tracing.span("module", path=str(path)):
+                yield (path, *module_records(records, cache, path, cwd))
+        return
+    compile_one = partial(compile_module, records, cache, cwd=cwd)
+    chunksize = max(1, len(paths) // (workers * 4))
+    if pool is not None:
+        for path, (ir, hit) in zip(paths, pool.map(compile_one, paths, chunksize=chunksize)):
+            with tracing.span("write", path=str(path)):
+                yield path, irmod.split(ir), hit
+        return
+    with ProcessPoolExecutor(max_workers=workers) as own_pool:
+        yield from run_batch(records, paths, jobs, cache, cwd=cwd, pool=own_pool)
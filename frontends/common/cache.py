@@ -0,0 +1,170 @@
+"""Content-addressed on-disk cache for frontend IR documents."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, TextIO
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DIR = Path(os.environ.get("TRISYNK_IR_CACHE", ROOT / "data" / "cache" / "ir"))
+DEFAULT_MAX_MB = 256
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def layout_hash(data: bytes) -> int:
+    """Stable 32-bit layout hash derived from the source digest (independent of PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.sha256(data).digest()[:4], "big")
+
+
+class HashingReader:
+    """Text stream wrapper that digests the UTF-8 text as it is read, for :func:`layout_hash` without a second pass."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> str:
+        chunk = self.stream.read(size)
+        self.digest.update(chunk.encode("utf-8"))
+        return chunk
+
+    def layout_hash(self) -> int:
+        """Equal to ``layout_hash`` of everything read so far."""
+        return int.from_bytes(self.digest.digest()[:4], "big")
+
+
+def layout_hash_file(path: Path, chunk_size: int = 1 << 16) -> int:
+    """``layout_hash`` of a source file as the frontends read it: UTF-8 text with universal newlines."""
+    with path.open(encoding="utf-8") as fh:
+        reader = HashingReader(fh)
+        while reader.read(chunk_size):
+            pass
+    return reader.layout_hash()
+
+
+class IRCache:
+    """Stores IR keyed by source digest + frontend name/version; evicts least-recently-used entries."""
+
+    def __init__(self, root: Path, namespace: str, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+
+    def key(self, data: bytes) -> str:
+        digest = hashlib.sha256(self.namespace.encode("utf-8") + b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def key_stream(self, stream: BinaryIO, chunk_size: int = 1 << 16) -> str:
+        """``key`` of everything in ``stream``, read in fixed-size chunks."""
+        digest = hashlib.sha256(self.namespace.encode("utf-8") + b"\0")
+        while chunk := stream.read(chunk_size):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        entry = self._entry(key)
+        try:
+            payload = json.loads(entry.read_bytes())
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(entry)  # refresh recency for LRU eviction
+        except OSError:
+            pass
+        return payload
+
+    def writer(self, key: str) -> EntryWriter:
+        """Build the entry for ``key`` record by record, as the IR streams out."""
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        return EntryWriter(entry)
+
+    def put(self, key: str, ir: dict) -> None:
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(ir, fh, separators=(",", ":"))
+        os.replace(tmp, entry)
+
+    def evict(self) -> int:
+        """Drop the oldest entries until the cache fits in ``max_bytes``; returns the number removed."""
+        if not self.root.exists():
+            return 0
+        entries = []
+        total = 0
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+class EntryWriter:
+    """Writes a cache entry from IR records into a temp file and renames it into place on ``commit``.
+
+    The entry is the document ``put`` would store: the module header without
+    ``module``, then ``functions``, then ``abi``. Only the current record is
+    held in memory.
+    """
+
+    def __init__(self, entry: Path) -> None:
+        self.entry = entry
+        fd, self.tmp = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        self.fh = os.fdopen(fd, "w", encoding="utf-8")
+        self.functions = 0
+        self.closed_functions = False
+
+    @staticmethod
+    def _dumps(value: object) -> str:
+        return json.dumps(value, separators=(",", ":"))
+
+    def add(self, record: dict) -> None:
+        kind = record.get("record")
+        body = {key: value for key, value in record.items() if key not in ("record", "module")}
+        if kind == "module":
+            self.fh.write("{" + "".join(f"{self._dumps(key)}:{self._dumps(value)}," for key, value in body.items()))
+            self.fh.write('"functions":[')
+        elif kind == "function":
+            self.fh.write(("," if self.functions else "") + self._dumps(body))
+            self.functions += 1
+        elif kind == "abi":
+            self.fh.write(f'],"abi":{self._dumps(body)}')
+            self.closed_functions = True
+        else:
+            raise ValueError(f"Unknown IR record kind: {kind!r}")
+
+    def commit(self) -> None:
+        self.fh.write("}" if self.closed_functions else "]}")
+        self.fh.close()
+        os.replace(self.tmp, self.entry)
+
+    def abort(self) -> None:
+        self.fh.close()
+        try:
+            os.unlink(self.tmp)
+        except OSError:
+            pass
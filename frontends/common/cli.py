@@ -0,0 +1,204 @@
+"""Command-line contract shared by trisynk-rs and trisynk-cpp."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import Executor
+from pathlib import Path
+
+from typing import Callable, Iterable, TextIO
+
+from common import batch, irpack, tracing
+from common.cache import DEFAULT_DIR, DEFAULT_MAX_MB, IRCache
+from common.ir import RecordSource, assemble, dumps_compact
+
+FORMATS = ("json", "compact", "ndjson", "tsir")
+OUTPUT_SUFFIXES = {"ndjson": ".ndjson", "tsir": ".tsir"}
+
+Bind = Callable[[argparse.Namespace], tuple[RecordSource, str]]
+
+
+def write_module(stream: TextIO, records: Iterable[dict], fmt: str) -> None:
+    """Serialize one module; ``ndjson`` writes each record as soon as the frontend yields it."""
+    if fmt == "ndjson":
+        with tracing.span("stream"):
+            for record in records:
+                stream.write(dumps_compact(record) + "\n")
+        return
+    with tracing.span("build"):
+        ir = assemble(records)
+    with tracing.span("serialize", format=fmt):
+        text = dumps_compact(ir) if fmt == "compact" else json.dumps(ir, indent=2)
+        stream.write(text + "\n")
+
+
+def write_module_file(target: Path, records: Iterable[dict], fmt: str) -> None:
+    """Write to a temp file beside ``target`` and rename it on success, so a failed run leaves no partial output."""
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    binary = fmt == "tsir"
+    # os.open rather than mkstemp so the output gets the usual umask-derived mode.
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        with os.fdopen(fd, "wb" if binary else "w", encoding=None if binary else "utf-8") as fh:
+            if binary:
+                with tracing.span("build"):
+                    ir = assemble(records)
+                with tracing.span("serialize", format=fmt):
+                    fh.write(irpack.encode(ir))
+            else:
+                write_module(fh, records, fmt)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def build_parser(
+    description: str,
+    add_arguments: Callable[[argparse.ArgumentParser], None] | None = None,
+    parser_class: type[argparse.ArgumentParser] = argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    parser = parser_class(description=description)
+    parser.add_argument("inputs", nargs="*", help="Source files, directories or glob patterns")
+    parser.add_argument("--output", type=Path, help="Output file (single input only)")
+    parser.add_argument("--output-dir", type=Path, help="Write one IR document per module below this directory")
+    parser.add_argument("--files-from", type=Path, help="Read additional input paths from a file, one per line")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker processes for batch runs (default: CPU count)")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_DIR, help="IR cache location (env: TRISYNK_IR_CACHE)")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_MB, help="Evict cache entries beyond this size")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-parse sources")
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="json",
+        help="json (pretty), compact, ndjson records, or tsir (binary; needs --output/--output-dir)",
+    )
+    parser.add_argument("--compact", dest="format", action="store_const", const="compact", help="Alias for --format compact")
+    parser.add_argument("--serve", action="store_true", help="Run as a long-lived parse server on --socket")
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        help="Unix socket of a --serve process; the other options are forwarded to it (env: TRISYNK_FRONTEND_SOCKET)",
+    )
+    if add_arguments is not None:
+        add_arguments(parser)
+    return parser
+
+
+def run(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    records: RecordSource,
+    *,
+    suffixes: tuple[str, ...],
+    tag: str,
+    version: str,
+    bind: Bind | None = None,
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+    cwd: Path | None = None,
+    pool: Executor | None = None,
+    make_cache: Callable[[Path, str, int], IRCache] = IRCache,
+) -> int:
+    """Execute one parsed invocation.
+
+    ``cwd`` resolves relative paths for callers that do not share the process
+    working directory (the server); module names keep the spelling the user typed.
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    namespace = f"{tag}@{version}"
+    if bind is not None:
+        records, salt = bind(args)
+        namespace += salt
+
+    if not args.inputs and args.files_from is None:
+        parser.error("at least one input (or --files-from) is required")
+    if cwd is not None:
+        for name in ("output", "output_dir", "files_from", "cache_dir"):
+            if getattr(args, name) is not None:
+                setattr(args, name, cwd / getattr(args, name))
+    paths = batch.expand_inputs(args.inputs, suffixes, args.files_from, cwd)
+    is_batch = (
+        args.files_from is not None
+        or len(args.inputs) > 1
+        or any(batch.is_batch_spec(spec, cwd) for spec in args.inputs)
+    )
+    if not paths:
+        parser.error("no input files matched")
+    if is_batch and args.output:
+        parser.error("--output accepts a single input; use --output-dir for batch runs")
+    if args.format == "tsir" and args.output is None and args.output_dir is None:
+        parser.error("--format tsir writes binary files; pass --output or --output-dir")
+
+    cache = None
+    if not args.no_cache:
+        cache = make_cache(args.cache_dir, namespace, int(args.cache_max_mb * 1024 * 1024))
+    hits = misses = 0
+    base = batch.common_root(paths, cwd)
+    for path, stream, hit in batch.run_batch(records, paths, args.jobs, cache, cwd=cwd, pool=pool):
+        if args.output_dir is not None:
+            suffix = OUTPUT_SUFFIXES.get(args.format, ".json")
+            target = batch.output_path(path, args.output_dir, base, suffix, cwd)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            write_module_file(target, stream, args.format)
+        elif is_batch:
+            # JSON Lines on stdout: one compact document per module unless records were requested.
+            write_module(stdout, stream, "ndjson" if args.format == "ndjson" else "compact")
+        elif args.output:
+            write_module_file(args.output, stream, args.format)
+        else:
+            write_module(stdout, stream, args.format)
+        hits += hit
+        misses += not hit
+    if cache is not None:
+        evicted = cache.evict() if misses else 0
+        print(f"[{tag}] cache hits={hits} misses={misses} evicted={evicted}", file=stderr)
+    if is_batch:
+        print(f"[{tag}] processed {len(paths)} modules", file=stderr)
+    return 0
+
+
+def main(
+    records: RecordSource,
+    *,
+    description: str,
+    suffixes: tuple[str, ...],
+    tag: str,
+    version: str,
+    add_arguments: Callable[[argparse.ArgumentParser], None] | None = None,
+    bind: Bind | None = None,
+) -> int:
+    """Run the shared driver.
+
+    ``add_arguments`` lets a frontend register extra options; ``bind`` then turns
+    the parsed options into the record source plus a cache-namespace suffix that
+    must change whenever those options change the output.
+    """
+    parser = build_parser(description, add_arguments)
+    args = parser.parse_args()
+    socket_path = args.socket or os.environ.get("TRISYNK_FRONTEND_SOCKET")
+    if args.serve:
+        from common import server
+
+        return server.serve(
+            records,
+            Path(socket_path) if socket_path else server.default_socket(tag),
+            description=description,
+            suffixes=suffixes,
+            tag=tag,
+            version=version,
+            add_arguments=add_arguments,
+            bind=bind,
+        )
+    if socket_path:
+        from common import client
+
+        code = client.forward(Path(socket_path), sys.argv[1:])
+        if code is not None:
+            return code
+        print(f"[{tag}] no server on {socket_path}; running in-process", file=sys.stderr)
+    return run(parser, args, records, suffixes=suffixes, tag=tag, version=version, bind=bind)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Thin client for a frontend started with ``--serve``; accepts the same options as ``frontend.py``.
+
+Only the standard library is imported so the round trip avoids loading the
+frontend itself: ``client.py --socket PATH [frontend options...]``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+
+def request(socket_path: Path, payload: dict) -> socket.socket | None:
+    """Open a connection and send one request line; None when no server is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+    sock.shutdown(socket.SHUT_WR)
+    return sock
+
+
+def forward(socket_path: Path, argv: list[str]) -> int | None:
+    """Replay ``argv`` on the server, relaying its output frames; returns the exit code or None if unreachable."""
+    sock = request(socket_path, {"argv": argv, "cwd": os.getcwd()})
+    if sock is None:
+        return None
+    code = 1
+    with sock, sock.makefile("r", encoding="utf-8") as frames:
+        for line in frames:
+            frame = json.loads(line)
+            if "out" in frame:
+                sys.stdout.write(frame["out"])
+            elif "err" in frame:
+                sys.stderr.write(frame["err"])
+            elif "exit" in frame:
+                code = frame["exit"]
+                if os.environ.get("TRISYNK_CLIENT_TIMING"):
+                    print(f"[client] served in {frame['ms']} ms", file=sys.stderr)
+    sys.stdout.flush()
+    return code
+
+
+def stats(socket_path: Path) -> dict | None:
+    sock = request(socket_path, {"op": "stats"})
+    if sock is None:
+        return None
+    with sock, sock.makefile("r", encoding="utf-8") as frames:
+        return json.loads(frames.readline())
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    socket_path = os.environ.get("TRISYNK_FRONTEND_SOCKET")
+    if argv[:1] == ["--socket"] and len(argv) > 1:
+        socket_path, argv = argv[1], argv[2:]
+    elif argv and argv[0].startswith("--socket="):
+        socket_path, argv = argv[0].split("=", 1)[1], argv[1:]
+    if not socket_path:
+        raise SystemExit("usage: client.py --socket PATH [--stats | frontend options...]")
+    if argv == ["--stats"]:
+        result = stats(Path(socket_path))
+        if result is None:
+            raise SystemExit(f"[client] no server on {socket_path}")
+        print(json.dumps(result, indent=2))
+        return 0
+    code = forward(Path(socket_path), argv)
+    if code is None:
+        raise SystemExit(f"[client] no server on {socket_path}")
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
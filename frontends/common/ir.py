@@ -0,0 +1,47 @@
+"""Record-level view of frontend IR used for streaming (NDJSON) output.
+
+A module streams as one ``module`` header record, one ``function`` record per
+function in source order, and a trailing ``abi`` record::
+
+    {"record": "module", "module": "src/lib.rs", "language": "rust"}
+    {"record": "function", "name": "main", "effects": ["io"], "resources": {...}}
+    {"record": "abi", "calling_convention": "trisynk_fastcall", ...}
+"""
+from __future__ import annotations
+
+import json
+from typing import Callable, Iterable, Iterator, TextIO
+
+# (source text stream, module name) -> records; the stream is read incrementally where the frontend can.
+RecordSource = Callable[[TextIO, str], Iterable[dict]]
+
+
+def assemble(records: Iterable[dict]) -> dict:
+    """Fold a record stream back into the document shape of ``schema/frontend_ir.schema.json``."""
+    ir: dict = {}
+    functions: list[dict] = []
+    for record in records:
+        kind = record.get("record")
+        body = {key: value for key, value in record.items() if key != "record"}
+        if kind == "module":
+            ir.update(body)
+            ir["functions"] = functions
+        elif kind == "function":
+            functions.append(body)
+        elif kind == "abi":
+            ir["abi"] = body
+        else:
+            raise ValueError(f"Unknown IR record kind: {kind!r}")
+    return ir
+
+
+def split(ir: dict) -> Iterator[dict]:
+    """Inverse of :func:`assemble`."""
+    yield {"record": "module", **{key: value for key, value in ir.items() if key not in ("functions", "abi")}}
+    for fn in ir.get("functions", []):
+        yield {"record": "function", **fn}
+    yield {"record": "abi", **ir.get("abi", {})}
+
+
+def dumps_compact(obj: dict) -> str:
+    return json.dumps(obj, separators=(",", ":"))
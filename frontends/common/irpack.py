@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""TSIR: compact binary container for frontend IR with an mmap-backed random-access reader.
+
+Layout (little-endian, every section 4-byte aligned)::
+
+    header      magic "TSIR", version, counts, section offsets, module/abi fields
+    strings     u32 offsets[n + 1] followed by the UTF-8 blob; every string is interned once
+    sequences   u32 offsets[n + 1] followed by u32 string ids; interned lists of strings
+                (effects, capabilities, flattened resource key/value pairs)
+    functions   fixed-width 40-byte records, so function ``i`` lives at a computed offset
+    index       (name id, function number) pairs sorted by name for binary search
+
+Fields without a fixed slot (``type``, ``params``, non-standard spans, ...) are kept
+as an interned compact-JSON string per function, so any schema-valid IR round-trips.
+Decoded dicts use the canonical key order ``name, effects, resources,
+capabilities, span, <extras>``, which is the order every frontend emits.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Iterator
+
+MAGIC = b"TSIR"
+VERSION = 1
+NONE = 0xFFFFFFFF
+HEADER = struct.Struct("<4sHHIIIIIIIIIIIIBxxxqII")
+FUNCTION = struct.Struct("<IIIIIIIIII")
+INDEX_ENTRY = struct.Struct("<II")
+U32 = struct.Struct("<I")
+SPAN_KEYS = ("start_line", "end_line", "start", "end")
+FIXED_KEYS = {"name", "effects", "resources", "capabilities", "span"}
+HAS_SPAN = 1
+
+HASH_NONE, HASH_INT, HASH_STR = 0, 1, 2
+INT64 = range(-(2**63), 2**63)
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+class _Interner:
+    def __init__(self) -> None:
+        self.strings: dict[str, int] = {}
+        self.sequences: dict[tuple[str, ...], int] = {}
+
+    def string(self, text: str | None) -> int:
+        if text is None:
+            return NONE
+        return self.strings.setdefault(text, len(self.strings))
+
+    def sequence(self, items: list[str] | None) -> int:
+        # Keyed by the strings themselves so repeated lists skip per-item interning;
+        # their string ids are assigned once, in ``id_sequences``.
+        if items is None:
+            return NONE
+        return self.sequences.setdefault(tuple(items), len(self.sequences))
+
+    def id_sequences(self) -> list[tuple[int, ...]]:
+        return [tuple(self.string(item) for item in seq) for seq in self.sequences]
+
+
+def _is_string_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _fixed_span(span: Any) -> bool:
+    return (
+        isinstance(span, dict)
+        and tuple(span) == SPAN_KEYS
+        and all(isinstance(v, int) and not isinstance(v, bool) and 0 <= v < NONE for v in span.values())
+    )
+
+
+def _table(entries: list[bytes]) -> bytes:
+    offsets = [0]
+    for entry in entries:
+        offsets.append(offsets[-1] + len(entry))
+    blob = b"".join(entries)
+    blob += b"\0" * (-len(blob) % 4)
+    return struct.pack(f"<{len(offsets)}I", *offsets) + blob
+
+
+def encode(ir: dict) -> bytes:
+    """Serialize one IR document (``schema/frontend_ir.schema.json``) into TSIR bytes."""
+    interner = _Interner()
+    records = []
+    for fn in ir.get("functions", []):
+        extra = {}
+        effects = fn.get("effects")
+        resources = fn.get("resources")
+        capabilities = fn.get("capabilities")
+        span = fn.get("span")
+        if effects is not None and not _is_string_list(effects):
+            extra["effects"], effects = effects, None
+        if resources is not None and not (
+            isinstance(resources, dict) and all(isinstance(v, str) for v in resources.values())
+        ):
+            extra["resources"], resources = resources, None
+        if capabilities is not None and not _is_string_list(capabilities):
+            extra["capabilities"], capabilities = capabilities, None
+        if span is not None and not _fixed_span(span):
+            extra["span"], span = span, None
+        extra.update((key, value) for key, value in fn.items() if key not in FIXED_KEYS)
+        name = fn.get("name")
+        if name is not None and not isinstance(name, str):
+            extra["name"], name = name, None
+        flat = None if resources is None else [item for pair in resources.items() for item in pair]
+        values = (span[key] for key in SPAN_KEYS) if span is not None else (0, 0, 0, 0)
+        records.append(
+            FUNCTION.pack(
+                interner.string(name),
+                interner.sequence(effects),
+                interner.sequence(flat),
+                interner.sequence(capabilities),
+                interner.string(_compact(extra) if extra else None),
+                HAS_SPAN if span is not None else 0,
+                *values,
+            )
+        )
+
+    abi = dict(ir.get("abi", {}))
+    calling_convention = abi.pop("calling_convention", None)
+    abi_caps = abi.pop("capabilities", None)
+    if abi_caps is not None and not _is_string_list(abi_caps):
+        abi["capabilities"], abi_caps = abi_caps, None
+    hash_kind, hash_value = HASH_NONE, 0
+    if "layout_hash" in abi:
+        value = abi["layout_hash"]
+        if isinstance(value, int) and not isinstance(value, bool) and value in INT64:
+            hash_kind, hash_value = HASH_INT, abi.pop("layout_hash")
+        elif isinstance(value, str):
+            hash_kind, hash_value = HASH_STR, interner.string(abi.pop("layout_hash"))
+    module_extra = {key: value for key, value in ir.items() if key not in ("module", "language", "functions", "abi")}
+    fields = {
+        "module": interner.string(ir.get("module")),
+        "language": interner.string(ir.get("language")),
+        "cc": interner.string(calling_convention),
+        "abi_caps": interner.sequence(abi_caps),
+        "module_extra": interner.string(_compact(module_extra) if module_extra else None),
+        "abi_extra": interner.string(_compact(abi) if abi else None),
+    }
+    names = [ir["functions"][i].get("name") for i in range(len(records))]
+    index = sorted(
+        (name.encode("utf-8"), interner.strings[name], i) for i, name in enumerate(names) if isinstance(name, str)
+    )
+
+    sequences = _table([struct.pack(f"<{len(seq)}I", *seq) for seq in interner.id_sequences()])
+    strings = _table([text.encode("utf-8") for text in interner.strings])
+    functions = b"".join(records)
+    index_blob = b"".join(INDEX_ENTRY.pack(name_id, i) for _, name_id, i in index)
+    strings_off = HEADER.size + (-HEADER.size % 4)
+    sequences_off = strings_off + len(strings)
+    functions_off = sequences_off + len(sequences)
+    index_off = functions_off + len(functions)
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        len(interner.strings),
+        len(interner.sequences),
+        len(records),
+        len(index),
+        strings_off,
+        sequences_off,
+        functions_off,
+        index_off,
+        fields["module"],
+        fields["language"],
+        fields["cc"],
+        fields["abi_caps"],
+        hash_kind,
+        hash_value,
+        fields["module_extra"],
+        fields["abi_extra"],
+    )
+    return b"".join((header, b"\0" * (strings_off - HEADER.size), strings, sequences, functions, index_blob))
+
+
+class IRPack:
+    """Random-access view over TSIR bytes; ``IRPack.open(path)`` memory-maps the file."""
+
+    def __init__(self, buf: bytes | mmap.mmap) -> None:
+        self.buf = buf
+        self._mmap = buf if isinstance(buf, mmap.mmap) else None
+        if len(buf) < HEADER.size:
+            raise ValueError(f"Truncated TSIR container ({len(buf)} bytes, header needs {HEADER.size})")
+        (
+            magic,
+            version,
+            _flags,
+            self.n_strings,
+            self.n_sequences,
+            self.n_functions,
+            self.n_index,
+            self.strings_off,
+            self.sequences_off,
+            self.functions_off,
+            self.index_off,
+            self.module_id,
+            self.language_id,
+            self.cc_id,
+            self.abi_caps_id,
+            self.hash_kind,
+            self.hash_value,
+            self.module_extra_id,
+            self.abi_extra_id,
+        ) = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a TSIR container (bad magic)")
+        if version != VERSION:
+            raise ValueError(f"Unsupported TSIR version {version}")
+        self.string_blob = self.strings_off + 4 * (self.n_strings + 1)
+        self.sequence_blob = self.sequences_off + 4 * (self.n_sequences + 1)
+        self._check_bounds()
+        self._strings: dict[int, str] = {}
+
+    def _check_bounds(self) -> None:
+        """Reject containers whose sections overlap or run past the end, before any of them is read."""
+        size = len(self.buf)
+        if not HEADER.size <= self.strings_off <= self.sequences_off <= self.functions_off <= self.index_off <= size:
+            raise ValueError("Corrupt TSIR container (section offsets out of order or past the end)")
+        if self.string_blob > self.sequences_off or self.sequence_blob > self.functions_off:
+            raise ValueError("Corrupt TSIR container (offset table overruns its section)")
+        (strings_end,) = U32.unpack_from(self.buf, self.string_blob - 4)
+        (sequences_end,) = U32.unpack_from(self.buf, self.sequence_blob - 4)
+        if self.string_blob + strings_end > self.sequences_off or self.sequence_blob + sequences_end > self.functions_off:
+            raise ValueError("Corrupt TSIR container (table blob overruns its section)")
+        if self.functions_off + self.n_functions * FUNCTION.size > self.index_off:
+            raise ValueError("Corrupt TSIR container (function records overrun the index)")
+        if self.index_off + self.n_index * INDEX_ENTRY.size > size:
+            raise ValueError("Corrupt TSIR container (index runs past the end)")
+
+    @classmethod
+    def open(cls, path: Path | str) -> IRPack:
+        with open(path, "rb") as fh:
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buf)
+        except BaseException:
+            buf.close()
+            raise
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> IRPack:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.n_functions
+
+    # -- tables -------------------------------------------------------------------
+    def _string_bytes(self, sid: int) -> bytes:
+        start, end = struct.unpack_from("<II", self.buf, self.strings_off + 4 * sid)
+        return self.buf[self.string_blob + start : self.string_blob + end]
+
+    def string(self, sid: int) -> str | None:
+        if sid == NONE:
+            return None
+        text = self._strings.get(sid)
+        if text is None:
+            text = self._strings[sid] = self._string_bytes(sid).decode("utf-8")
+        return text
+
+    def sequence(self, qid: int) -> list[str] | None:
+        if qid == NONE:
+            return None
+        start, end = struct.unpack_from("<II", self.buf, self.sequences_off + 4 * qid)
+        ids = struct.unpack_from(f"<{(end - start) // 4}I", self.buf, self.sequence_blob + start)
+        return [self.string(sid) for sid in ids]
+
+    # -- functions ----------------------------------------------------------------
+    def function(self, i: int) -> dict:
+        """Decode function ``i`` alone; only its record and the strings it references are touched."""
+        if not 0 <= i < self.n_functions:
+            raise IndexError(i)
+        name, effects, resources, capabilities, extra, flags, *span = FUNCTION.unpack_from(
+            self.buf, self.functions_off + i * FUNCTION.size
+        )
+        fn: dict = {}
+        if name != NONE:
+            fn["name"] = self.string(name)
+        if effects != NONE:
+            fn["effects"] = self.sequence(effects)
+        if resources != NONE:
+            flat = self.sequence(resources)
+            fn["resources"] = dict(zip(flat[::2], flat[1::2]))
+        if capabilities != NONE:
+            fn["capabilities"] = self.sequence(capabilities)
+        if flags & HAS_SPAN:
+            fn["span"] = dict(zip(SPAN_KEYS, span))
+        if extra != NONE:
+            fn.update(json.loads(self.string(extra)))
+        return fn
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(self.n_functions):
+            yield self.function(i)
+
+    def find(self, name: str) -> dict | None:
+        """Binary-search the name index; decodes only the matching record."""
+        target = name.encode("utf-8")
+        lo, hi = 0, self.n_index
+        while lo < hi:
+            mid = (lo + hi) // 2
+            sid, _ = INDEX_ENTRY.unpack_from(self.buf, self.index_off + mid * INDEX_ENTRY.size)
+            if self._string_bytes(sid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_index:
+            sid, i = INDEX_ENTRY.unpack_from(self.buf, self.index_off + lo * INDEX_ENTRY.size)
+            if self._string_bytes(sid) == target:
+                return self.function(i)
+        return None
+
+    # -- whole document -----------------------------------------------------------
+    def header(self) -> dict:
+        ir: dict = {}
+        if self.module_id != NONE:
+            ir["module"] = self.string(self.module_id)
+        if self.language_id != NONE:
+            ir["language"] = self.string(self.language_id)
+        if self.module_extra_id != NONE:
+            ir.update(json.loads(self.string(self.module_extra_id)))
+        return ir
+
+    def abi(self) -> dict:
+        abi: dict = {}
+        if self.cc_id != NONE:
+            abi["calling_convention"] = self.string(self.cc_id)
+        if self.abi_caps_id != NONE:
+            abi["capabilities"] = self.sequence(self.abi_caps_id)
+        if self.hash_kind == HASH_INT:
+            abi["layout_hash"] = self.hash_value
+        elif self.hash_kind == HASH_STR:
+            abi["layout_hash"] = self.string(self.hash_value)
+        if self.abi_extra_id != NONE:
+            abi.update(json.loads(self.string(self.abi_extra_id)))
+        return abi
+
+    def _all_strings(self) -> list[str]:
+        offsets = struct.unpack_from(f"<{self.n_strings + 1}I", self.buf, self.strings_off)
+        raw = bytes(self.buf[self.string_blob : self.string_blob + offsets[-1]])
+        text = raw.decode("utf-8")
+        if len(text) == len(raw):  # ASCII: byte offsets are character offsets
+            return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+        return [raw[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def functions(self) -> list[dict]:
+        """Decode every function in one sweep over the tables (faster than ``function(i)`` per record)."""
+        strings = self._all_strings()
+        offsets = struct.unpack_from(f"<{self.n_sequences + 1}I", self.buf, self.sequences_off)
+        ids = struct.unpack_from(f"<{offsets[-1] // 4}I", self.buf, self.sequence_blob)
+        sequences = [[strings[sid] for sid in ids[start // 4 : end // 4]] for start, end in zip(offsets, offsets[1:])]
+        resource_maps = {}
+        extras = {}
+        end = self.functions_off + self.n_functions * FUNCTION.size
+        result = []
+        for name, effects, resources, capabilities, extra, flags, *span in FUNCTION.iter_unpack(
+            self.buf[self.functions_off : end]
+        ):
+            fn: dict = {}
+            if name != NONE:
+                fn["name"] = strings[name]
+            if effects != NONE:
+                fn["effects"] = list(sequences[effects])
+            if resources != NONE:
+                if resources not in resource_maps:
+                    flat = sequences[resources]
+                    resource_maps[resources] = dict(zip(flat[::2], flat[1::2]))
+                fn["resources"] = dict(resource_maps[resources])
+            if capabilities != NONE:
+                fn["capabilities"] = list(sequences[capabilities])
+            if flags & HAS_SPAN:
+                fn["span"] = dict(zip(SPAN_KEYS, span))
+            if extra != NONE:
+                if extra not in extras:
+                    extras[extra] = strings[extra]
+                fn.update(json.loads(extras[extra]))
+            result.append(fn)
+        return result
+
+    def to_ir(self) -> dict:
+        # Section bounds were checked on open; ids inside records are only checked here, as they are decoded.
+        try:
+            ir = self.header()
+            ir["functions"] = self.functions()
+            ir["abi"] = self.abi()
+        except (struct.error, IndexError) as exc:
+            raise ValueError(f"Corrupt TSIR container ({exc})") from exc
+        return ir
+
+
+def decode(data: bytes) -> dict:
+    return IRPack(data).to_ir()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    pack = sub.add_parser("pack", help="JSON IR -> TSIR")
+    pack.add_argument("input", type=Path)
+    pack.add_argument("output", type=Path)
+    unpack = sub.add_parser("unpack", help="TSIR -> JSON IR")
+    unpack.add_argument("input", type=Path)
+    unpack.add_argument("--output", type=Path, help="Output file (default: stdout)")
+    unpack.add_argument("--compact", action="store_true")
+    show = sub.add_parser("show", help="Print one function by name without decoding the rest")
+    show.add_argument("input", type=Path)
+    show.add_argument("name")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        args.output.write_bytes(encode(json.loads(args.input.read_text(encoding="utf-8"))))
+        return 0
+    with IRPack.open(args.input) as pack_file:
+        if args.command == "show":
+            fn = pack_file.find(args.name)
+            if fn is None:
+                raise SystemExit(f"[irpack] {args.name!r} not found in {args.input}")
+            print(json.dumps(fn, indent=2))
+            return 0
+        ir = pack_file.to_ir()
+    text = _compact(ir) if args.compact else json.dumps(ir, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
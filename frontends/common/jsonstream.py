@@ -0,0 +1,175 @@
+"""Pull-style JSON reader over a text stream with bounded memory.
+
+Values are consumed incrementally from fixed-size chunks: callers walk objects
+and arrays key by key, materialise only the small values they need with
+``read_value`` and discard the rest with ``skip_value``. Skipping never builds
+Python objects; it hands each run of text between brackets to an optional
+visitor so callers can still watch for a few keys inside skipped subtrees.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Iterator, TextIO
+
+CHUNK_SIZE = 1 << 16
+WS_RE = re.compile(r"\s*")
+STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+NUMBER_RE = re.compile(r"[-+0-9.eE]+")  # greedy so a match can only end on a delimiter
+# Everything up to the next structural bracket, treating strings as opaque.
+RUN_RE = re.compile(r'(?:[^"{}\[\]]+|"(?:[^"\\]|\\.)*")*', re.DOTALL)
+LITERALS = {"true": True, "false": False, "null": None}
+
+Visitor = Callable[[str, str], None]
+
+
+class JsonStream:
+    def __init__(self, stream: TextIO, chunk_size: int = CHUNK_SIZE) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.consumed = 0  # characters dropped from the front of ``buf``
+
+    # -- buffer management ----------------------------------------------------
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            self.consumed += self.pos
+            self.buf = self.buf[self.pos :]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def _match(self, pattern: re.Pattern[str]) -> re.Match[str]:
+        """Match ``pattern`` at the cursor, pulling chunks until the match cannot grow further."""
+        while True:
+            match = pattern.match(self.buf, self.pos)
+            if match is not None and (match.end() < len(self.buf) or self.eof):
+                return match
+            if not self._fill():
+                if match is None:
+                    raise ValueError(f"Malformed JSON near offset {self.offset}")
+                return match
+
+    @property
+    def offset(self) -> int:
+        return self.consumed + self.pos
+
+    def peek(self) -> str:
+        self.pos = self._match(WS_RE).end()
+        if self.pos >= len(self.buf) and not self._fill():
+            return ""
+        return self.buf[self.pos]
+
+    def _expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.offset}, found {self.peek()!r}")
+        self.pos += 1
+
+    # -- structured access ----------------------------------------------------
+    def iter_object(self) -> Iterator[str]:
+        """Yield keys of the object at the cursor; the caller must consume each value."""
+        self._expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self._expect(":")
+            yield key
+            sep = self.peek()
+            self.pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"Expected ',' or '}}' at offset {self.offset}")
+
+    def iter_array(self) -> Iterator[int]:
+        """Yield element indices of the array at the cursor; the caller must consume each element."""
+        self._expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            sep = self.peek()
+            self.pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {self.offset}")
+
+    def read_string(self) -> str:
+        if self.peek() != '"':
+            raise ValueError(f"Expected string at offset {self.offset}")
+        match = self._match(STRING_RE)
+        self.pos = match.end()
+        raw = match.group()
+        return json.loads(raw) if "\\" in raw else raw[1:-1]
+
+    def read_value(self) -> Any:
+        char = self.peek()
+        if char == "{":
+            return {key: self.read_value() for key in self.iter_object()}
+        if char == "[":
+            return [self.read_value() for _ in self.iter_array()]
+        if char == '"':
+            return self.read_string()
+        if char and char in "-0123456789":
+            match = self._match(NUMBER_RE)
+            self.pos = match.end()
+            return json.loads(match.group())
+        for word, value in LITERALS.items():
+            while len(self.buf) - self.pos < len(word) and self._fill():
+                pass
+            if self.buf.startswith(word, self.pos):
+                self.pos += len(word)
+                return value
+        raise ValueError(f"Unexpected {char!r} at offset {self.offset}")
+
+    def skip_value(self, visit: Visitor | None = None) -> None:
+        """Consume the value at the cursor without building it.
+
+        ``visit(run, opener)`` receives each run of text between brackets
+        together with the text preceding the innermost enclosing ``{``/``[``,
+        so callers can spot keys such as ``"file"`` inside skipped subtrees.
+        """
+        if self.peek() not in "{[":
+            self.read_value()
+            return
+        depth = 0
+        openers: list[str] = []
+        prev_run = ""
+        while True:
+            start = self.pos
+            match = RUN_RE.match(self.buf, start)
+            end = match.end()
+            if end >= len(self.buf) or self.buf[end] == '"':
+                # Run reaches the buffer edge or an unterminated string: rescan once more data arrives.
+                if not self._fill():
+                    raise ValueError(f"Unexpected end of JSON at offset {self.offset}")
+                continue
+            run = match.group()
+            if visit is not None and run:
+                visit(run, openers[-1] if openers else "")
+            bracket = self.buf[end]
+            self.pos = end + 1
+            if bracket in "{[":
+                depth += 1
+                openers.append(run or prev_run)
+            else:
+                depth -= 1
+                if openers:
+                    openers.pop()
+                if not depth:
+                    return
+            prev_run = run
@@ -0,0 +1,261 @@
+"""Long-lived frontend server (``frontend.py --serve``) on a local Unix socket.
+
+Each connection carries one request line ``{"argv": [...], "cwd": "..."}`` and
+receives JSON frames back: ``{"out": text}`` / ``{"err": text}`` as the normal
+CLI would write them, then ``{"exit": code, "ms": latency}``. ``{"op": "stats"}``
+returns request counts and latency percentiles. Requests run concurrently on
+threads and share the imported frontend, an in-memory IR cache in front of the
+on-disk one, and a process pool for ``--jobs`` batches.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+from common import cli
+from common.cache import IRCache
+from common.ir import RecordSource
+
+MEMORY_ENTRIES = 4096
+LATENCY_WINDOW = 1024
+
+
+def default_socket(tag: str) -> Path:
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(runtime) / f"{tag}-{os.getuid()}.sock"
+
+
+class WarmCache(IRCache):
+    """IRCache with a bounded in-memory LRU in front; shared by every request in the server."""
+
+    def __init__(self, root: Path, namespace: str, max_bytes: int, entries: int = MEMORY_ENTRIES) -> None:
+        super().__init__(root, namespace, max_bytes)
+        self.entries = entries
+        self.memory: OrderedDict[str, dict] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __reduce__(self):
+        # Pool workers get a plain disk cache; the memory layer lives in the server process only.
+        return IRCache, (self.root, self.namespace, self.max_bytes)
+
+    def get(self, key: str) -> dict | None:
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+        payload = super().get(key)
+        if payload is not None:
+            self._remember(key, payload)
+        return payload
+
+    def put(self, key: str, ir: dict) -> None:
+        super().put(key, ir)
+        self._remember(key, ir)
+
+    def _remember(self, key: str, ir: dict) -> None:
+        with self.lock:
+            self.memory[key] = ir
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.entries:
+                self.memory.popitem(last=False)
+
+
+class FrameWriter(io.TextIOBase):
+    """Text stream that forwards every write as one ``{kind: text}`` frame."""
+
+    def __init__(self, sink: BinaryIO, kind: str, lock: threading.Lock) -> None:
+        self.sink = sink
+        self.kind = kind
+        self.lock = lock
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            with self.lock:
+                self.sink.write(json.dumps({self.kind: text}).encode("utf-8") + b"\n")
+        return len(text)
+
+
+class _RequestParser(argparse.ArgumentParser):
+    """Routes usage/help/error text to the requesting client instead of the server's own streams."""
+
+    out: io.TextIOBase
+    err: io.TextIOBase
+
+    def _print_message(self, message: str, file: Any = None) -> None:
+        if message:
+            (self.out if file is sys.stdout else self.err).write(message)
+
+
+class ServerState:
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.caches: dict[tuple, WarmCache] = {}
+        self._pool: ProcessPoolExecutor | None = None
+
+    def cache(self, root: Path, namespace: str, max_bytes: int) -> WarmCache:
+        with self.lock:
+            key = (Path(root).resolve(), namespace, max_bytes)
+            if key not in self.caches:
+                self.caches[key] = WarmCache(root, namespace, max_bytes)
+            return self.caches[key]
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+            return self._pool
+
+    def record(self, ms: float, code: int) -> None:
+        with self.lock:
+            self.requests += 1
+            self.failures += code != 0
+            self.latencies.append(ms)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            ordered = sorted(self.latencies)
+            requests, failures = self.requests, self.failures
+            memory = sum(len(cache.memory) for cache in self.caches.values())
+
+        def pct(q: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3) if ordered else 0.0
+
+        return {
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": requests,
+            "failures": failures,
+            "latency_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": round(ordered[-1], 3) if ordered else 0.0},
+            "memory_cache_entries": memory,
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    state: ServerState
+    execute: Callable[[dict, FrameWriter, FrameWriter], int]
+    tag: str
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: _Server
+
+    def handle(self) -> None:
+        start = time.perf_counter()
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            return
+        lock = threading.Lock()
+        if request.get("op") == "stats":
+            self.wfile.write(json.dumps(self.server.state.snapshot()).encode("utf-8") + b"\n")
+            return
+        out = FrameWriter(self.wfile, "out", lock)
+        err = FrameWriter(self.wfile, "err", lock)
+        try:
+            code = self.server.execute(request, out, err)
+        except (BrokenPipeError, ConnectionResetError):
+            code = 1
+        ms = (time.perf_counter() - start) * 1000
+        self.server.state.record(ms, code)
+        print(f"[{self.server.tag}] request exit={code} ms={ms:.2f}", file=sys.stderr)
+        try:
+            self.wfile.write(json.dumps({"exit": code, "ms": round(ms, 3)}).encode("utf-8") + b"\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve(
+    records: RecordSource,
+    socket_path: Path,
+    *,
+    description: str,
+    suffixes: tuple[str, ...],
+    tag: str,
+    version: str,
+    add_arguments: Callable[[argparse.ArgumentParser], None] | None = None,
+    bind: cli.Bind | None = None,
+) -> int:
+    state = ServerState()
+
+    def execute(request: dict, out: FrameWriter, err: FrameWriter) -> int:
+        parser = cli.build_parser(description, add_arguments, parser_class=_RequestParser)
+        parser.out, parser.err = out, err
+        try:
+            args = parser.parse_args(request.get("argv", []))
+            return cli.run(
+                parser,
+                args,
+                records,
+                suffixes=suffixes,
+                tag=tag,
+                version=version,
+                bind=bind,
+                stdout=out,
+                stderr=err,
+                cwd=Path(request.get("cwd") or os.getcwd()),
+                pool=state.pool,
+                make_cache=state.cache,
+            )
+        except SystemExit as exc:
+            if isinstance(exc.code, int) or exc.code is None:
+                return exc.code or 0
+            err.write(f"{exc.code}\n")
+            return 1
+        except (OSError, ValueError, UnicodeDecodeError) as exc:
+            err.write(f"[{tag}] {exc}\n")
+            return 1
+
+    if socket_path.exists():
+        from common import client
+
+        if client.stats(socket_path) is not None:
+            raise SystemExit(f"[{tag}] a server is already listening on {socket_path}")
+        socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    old_umask = os.umask(0o077)
+    try:
+        server = _Server(str(socket_path), _Handler)
+    finally:
+        os.umask(old_umask)
+    server.state, server.execute, server.tag = state, execute, tag
+
+    def stop(signum: int, frame: Any) -> None:
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"[{tag}] serving on {socket_path} (pid {os.getpid()})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        state.close()
+        socket_path.unlink(missing_ok=True)
+        print(f"[{tag}] stopped: {json.dumps(state.snapshot())}", file=sys.stderr)
+    return 0
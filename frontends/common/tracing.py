@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Chrome trace-event spans for the frontends and check scripts (off unless ``TRISYNK_TRACE`` is set).
+
+``TRISYNK_TRACE=trace.json`` turns tracing on. Every ``with span("name"):`` block
+then becomes a complete (``"ph": "X"``) event. Spans nest by time on each
+thread, and every traced process appends its events to the same file. The
+process that creates ``FILE.lock`` (``O_EXCL``) is the owner; child processes
+started meanwhile find the lock and only append. At exit the owner merges the
+appended lines into the file's ``{"traceEvents": [...]}`` document, which
+chrome://tracing and Perfetto load directly, and releases the lock. Commands
+run one after another from a shell therefore add to one trace; remove the file
+(or use ``pipeline.py --trace``, which starts fresh) to begin a new one.
+``tracing.py finalize FILE`` does the merge for a run that died early.
+
+``TRISYNK_TRACE_SAMPLE_MS=N`` adds a sampling profiler. A background thread
+snapshots every thread's Python stack each N ms and emits the stacks as a
+flame chart on a companion track (``tid + SAMPLE_TID_OFFSET``).
+
+Disabled, ``span()`` is one global check that returns a shared null context.
+"""
+from __future__ import annotations
+
+import argparse
+import atexit
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import FrameType
+from typing import Any, ContextManager
+
+ENV_PATH = "TRISYNK_TRACE"
+ENV_SAMPLE = "TRISYNK_TRACE_SAMPLE_MS"
+SAMPLE_TID_OFFSET = 1_000_000
+MAX_STACK = 64
+
+_NULL: ContextManager[None] = contextlib.nullcontext()
+
+
+def _now_us() -> float:
+    # CLOCK_MONOTONIC is system-wide on Linux, so timestamps line up across processes.
+    return time.perf_counter_ns() / 1000
+
+
+def _lock_path(path: Path) -> Path:
+    return path.with_name(path.name + ".lock")
+
+
+def _claim(path: Path) -> bool:
+    """Take ownership of the trace at ``path``; a lock left by a dead process is taken over."""
+    lock = _lock_path(path)
+    for _ in range(2):
+        try:
+            fd = os.open(lock, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            try:
+                os.kill(int(lock.read_text(encoding="utf-8") or 0), 0)
+            except (ProcessLookupError, ValueError, FileNotFoundError):
+                lock.unlink(missing_ok=True)
+                continue
+            except PermissionError:
+                pass
+            return False
+        with os.fdopen(fd, "w") as fh:
+            fh.write(str(os.getpid()))
+        return True
+    return False
+
+
+class Tracer:
+    def __init__(self, path: Path, owner: bool, fresh: bool = False) -> None:
+        self.path = path
+        self.owner = owner
+        self.pid = os.getpid()
+        self.events: list[dict] = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.sampler: Sampler | None = None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if owner and fresh:
+            path.write_text("", encoding="utf-8")
+        self.metadata("process_name", Path(sys.argv[0]).name or "python")
+
+    def _add(self, event: dict) -> None:
+        with self.lock:
+            self.events.append(event)
+
+    def metadata(self, kind: str, name: str, tid: int = 0) -> None:
+        self._add({"name": kind, "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}})
+
+    def complete(self, name: str, cat: str, start: float, end: float, tid: int, args: dict | None) -> None:
+        event = {"name": name, "cat": cat, "ph": "X", "ts": round(start, 3), "dur": round(end - start, 3)}
+        event.update(pid=self.pid, tid=tid)
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    def flush(self) -> None:
+        with self.lock:
+            events, self.events = self.events, []
+        if not events:
+            return
+        data = "".join(json.dumps(event, default=str) + "\n" for event in events).encode("utf-8")
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)  # one O_APPEND write per batch keeps processes from interleaving
+        finally:
+            os.close(fd)
+
+    def close(self) -> None:
+        if self.sampler is not None:
+            self.sampler.stop()
+        self.flush()
+        if self.owner and os.getpid() == self.pid:
+            try:
+                finalize(self.path)
+            finally:
+                _lock_path(self.path).unlink(missing_ok=True)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start", "tid")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self) -> _Span:
+        local = self.tracer.local
+        local.depth = getattr(local, "depth", 0) + 1
+        self.tid = threading.get_native_id()
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        end = _now_us()
+        tracer = self.tracer
+        if exc[0] is not None:
+            self.args = {**self.args, "error": exc[0].__name__}
+        tracer.complete(self.name, self.cat, self.start, end, self.tid, self.args)
+        tracer.local.depth -= 1
+        if tracer.local.depth == 0:
+            # Pool workers leave via os._exit, so flush at every top-level span instead of relying on atexit.
+            tracer.flush()
+
+
+class Sampler:
+    """Periodic stack sampler; consecutive samples sharing a frame prefix merge into one span per frame."""
+
+    def __init__(self, tracer: Tracer, interval_ms: float) -> None:
+        self.tracer = tracer
+        self.interval = interval_ms / 1000
+        self.open: dict[int, list[tuple[str, float]]] = {}
+        self._tids: dict[int, int] = {}
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="trisynk-trace-sampler", daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def _stack(frame: FrameType | None) -> list[str]:
+        names = []
+        while frame is not None and len(names) < MAX_STACK:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.reverse()
+        return names
+
+    def _close(self, ident: int, keep: int, now: float) -> None:
+        stack = self.open.get(ident, [])
+        tid = self._tids.get(ident, ident) + SAMPLE_TID_OFFSET
+        while len(stack) > keep:
+            name, start = stack.pop()
+            self.tracer.complete(name, "sample", start, now, tid, None)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self.stopping.wait(self.interval):
+            now = _now_us()
+            threads = {thread.ident: thread for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                thread = threads.get(ident)
+                if ident not in self._tids:
+                    native = getattr(thread, "native_id", None) or ident
+                    self._tids[ident] = native
+                    label = thread.name if thread else str(ident)
+                    self.tracer.metadata("thread_name", f"{label} (samples)", native + SAMPLE_TID_OFFSET)
+                stack = self._stack(frame)
+                current = self.open.setdefault(ident, [])
+                shared = 0
+                while shared < min(len(stack), len(current)) and stack[shared] == current[shared][0]:
+                    shared += 1
+                self._close(ident, shared, now)
+                current.extend((name, now) for name in stack[shared:])
+            for ident in [ident for ident in self.open if ident not in threads]:
+                self._close(ident, 0, now)
+                del self.open[ident]
+
+    def stop(self) -> None:
+        self.stopping.set()
+        self.thread.join()
+        now = _now_us()
+        for ident in list(self.open):
+            self._close(ident, 0, now)
+
+
+_TRACER: Tracer | None = None
+
+
+def span(name: str, cat: str = "trisynk", **args: Any) -> ContextManager[Any]:
+    """Time a block as one trace event; ``args`` are attached to it (shown in the viewer's detail pane)."""
+    if _TRACER is None:
+        return _NULL
+    return _Span(_TRACER, name, cat, args)
+
+
+def enabled() -> bool:
+    return _TRACER is not None
+
+
+def start(path: Path | str, sample_ms: float | None = None, fresh: bool = False) -> None:
+    """Enable tracing in this process (and, via the environment, in processes it starts).
+
+    ``fresh`` discards events already in the file, provided no other process owns it.
+    """
+    global _TRACER
+    if _TRACER is not None:
+        return
+    os.environ[ENV_PATH] = str(path)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _TRACER = Tracer(path, _claim(path), fresh)
+    if sample_ms:
+        os.environ[ENV_SAMPLE] = str(sample_ms)
+        _TRACER.sampler = Sampler(_TRACER, sample_ms)
+    atexit.register(_TRACER.close)
+
+
+def _after_fork() -> None:
+    # Forked pool workers keep tracing with their own pid and must not re-emit the parent's buffer.
+    if _TRACER is not None:
+        _TRACER.pid = os.getpid()
+        _TRACER.owner = False
+        _TRACER.events = []
+        _TRACER.sampler = None
+        _TRACER.lock = threading.Lock()
+        _TRACER.local = threading.local()
+        _TRACER.metadata("process_name", f"{Path(sys.argv[0]).name} worker")
+
+
+def finalize(path: Path) -> int:
+    """Merge appended event lines into the file's Chrome ``{"traceEvents": [...]}`` document; returns the event count."""
+    text = path.read_text(encoding="utf-8")
+    events: list[dict] = []
+    if text.startswith('{"traceEvents"'):
+        document, _, text = text.partition("\n")
+        events = json.loads(document)["traceEvents"]
+        if not text.strip():
+            return len(events)
+    events += [json.loads(line) for line in text.splitlines() if line.strip()]
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}) + "\n", encoding="utf-8")
+    return len(events)
+
+
+os.register_at_fork(after_in_child=_after_fork)
+if os.environ.get(ENV_PATH) and __name__ != "__main__":
+    start(os.environ[ENV_PATH], float(os.environ.get(ENV_SAMPLE) or 0) or None)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    fin = sub.add_parser("finalize", help="Turn an unfinished trace into Chrome trace JSON")
+    fin.add_argument("path", type=Path)
+    summary = sub.add_parser("summary", help="Total time per span name, slowest first")
+    summary.add_argument("path", type=Path)
+    summary.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    count = finalize(args.path)
+    if args.command == "finalize":
+        print(f"[trace] {args.path}: {count} events")
+        return 0
+    totals: dict[str, list[float]] = {}
+    for event in json.loads(args.path.read_text(encoding="utf-8"))["traceEvents"]:
+        if event.get("ph") == "X" and event.get("cat") != "sample":
+            entry = totals.setdefault(event["name"], [0, 0.0])
+            entry[0] += 1
+            entry[1] += event["dur"]
+    for name, (calls, micros) in sorted(totals.items(), key=lambda item: -item[1][1])[: args.top]:
+        print(f"{micros / 1000:10.2f} ms  {calls:6d}x  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,15 +1,14 @@
 #!/usr/bin/env bash
 set -euo pipefail
 root="$(git rev-parse --show-toplevel)"
-rs_out="$root/frontends/samples/sample.rs.json"
-cpp_out="$root/frontends/samples/sample.cpp.json"
+out_dir="$(mktemp -d)"
+trap 'rm -rf "$out_dir"' EXIT
 
-python3 "$root/frontends/trisynk-rs/frontend.py" "$root/frontends/samples/sample.rs" --output "$rs_out"
-python3 "$root/frontends/trisynk-cpp/frontend.py" "$root/frontends/samples/sample.cpp" --output "$cpp_out"
+python3 "$root/frontends/trisynk-rs/frontend.py" "$root/frontends/samples/*.rs" --output-dir "$out_dir"
+python3 "$root/frontends/trisynk-cpp/frontend.py" "$root/frontends/samples/*.cpp" --output-dir "$out_dir"
 
-for file in "$rs_out" "$cpp_out"; do
+for file in "$out_dir"/*.json; do
   [[ -s "$file" ]] || { echo "[smoke] Missing $file"; exit 1; }
-  echo "[smoke] Generated $file"
-  python3 -m json.tool "$file" > /dev/null
-  rm "$file"
+  echo "[smoke] Generated $(basename "$file")"
 done
+python3 "$root/scripts/ir_schema.py" "$out_dir" --report "$out_dir/validation.json" > /dev/null
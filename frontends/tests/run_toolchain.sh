@@ -14,5 +14,6 @@ rustc "$SAMPLE_RS" -o "$TMP_DIR/borrows_bin"
 "$TMP_DIR/borrows_bin" > "$TMP_DIR/borrows.out"
 
 clang++ -std=c++20 "$TEMPLATE_CPP" -c -o "$TMP_DIR/templates.o"
-clang++ -std=c++20 -fprofile-instr-generate -fcoverage-mapping "$SAMPLE_CPP" -o "$TMP_DIR/sample_bin"
-LLVM_PROFILE_FILE="$TMP_DIR/sample.profraw" "$TMP_DIR/sample_bin"
+# Instrumented builds and profiles come from scripts/collect_coverage.py; this only checks the toolchain.
+clang++ -std=c++20 "$SAMPLE_CPP" -o "$TMP_DIR/sample_bin"
+"$TMP_DIR/sample_bin" > "$TMP_DIR/sample.out"
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Stream a Clang AST JSON dump (`-Xclang -ast-dump=json`) into frontend IR."""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Iterator, TextIO
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from common.cache import layout_hash_file  # noqa: E402
+from common.cli import FORMATS, write_module, write_module_file  # noqa: E402
+from common.jsonstream import JsonStream  # noqa: E402
+
+VERSION = "0.1.0"
+SYSTEM_PREFIXES = (
+    "/usr/include",
+    "/usr/lib",
+    "/usr/local/include",
+    "/usr/local/lib",
+    "/opt/homebrew",
+    "/Library/Developer",
+    "/Applications/Xcode.app",
+    "/nix/store",
+)
+FUNCTION_KINDS = {"FunctionDecl", "CXXMethodDecl", "CXXConstructorDecl", "CXXDestructorDecl", "CXXConversionDecl"}
+SCOPE_KINDS = {"NamespaceDecl", "CXXRecordDecl"}
+CONTAINER_KINDS = {"TranslationUnitDecl", "LinkageSpecDecl", "ClassTemplateDecl", "FunctionTemplateDecl"} | SCOPE_KINDS
+IO_NAMES = ("cout", "cerr", "clog", "printf", "fprintf", "puts", "putchar", "fputs", "fwrite", "perror")
+
+# Clang elides "file"/"line" when unchanged from the previously printed location,
+# so skipped subtrees are still scanned for them to keep the running position right.
+FILE_RE = re.compile(r'"file":\s*"((?:[^"\\]|\\.)*)"')
+LINE_RE = re.compile(r'"line":\s*(\d+)')
+IO_RE = re.compile(r'"name":\s*"(?:%s)"' % "|".join(IO_NAMES))
+
+
+class Importer:
+    def __init__(self, js: JsonStream, system_prefixes: tuple[str, ...]) -> None:
+        self.js = js
+        self.system_prefixes = system_prefixes
+        self.file: str | None = None
+        self.line = 0
+        self.main_file: str | None = None
+        self.scope: list[str] = []
+        self.records: dict[str, str] = {}  # user record id -> qualified name, for out-of-line members
+        self.io = False
+
+    # -- location tracking ------------------------------------------------------
+    def _track(self, value: object) -> None:
+        """Advance the running file/line through a parsed ``loc`` or ``range`` in key order."""
+        if not isinstance(value, dict):
+            return
+        for key, item in value.items():
+            if key == "file":
+                self.file = item
+                if self.main_file is None and "includedFrom" not in value:
+                    self.main_file = item
+            elif key == "line":
+                self.line = item
+            elif key != "includedFrom":
+                self._track(item)
+
+    def _visit(self, run: str, opener: str) -> None:
+        if opener.rstrip().endswith('"includedFrom":'):
+            return
+        files = FILE_RE.findall(run)
+        if files:
+            self.file = files[-1]
+        lines = LINE_RE.findall(run)
+        if lines:
+            self.line = int(lines[-1])
+
+    def _visit_body(self, run: str, opener: str) -> None:
+        self._visit(run, opener)
+        if not self.io and IO_RE.search(run):
+            self.io = True
+
+    def _is_system(self) -> bool:
+        file = self.file or ""
+        return file.startswith(self.system_prefixes) or "include/c++/" in file
+
+    def _qualify(self, name: str, parent: str | None = None) -> str:
+        if parent in self.records:
+            return f"{self.records[parent]}::{name}"
+        return "::".join([*self.scope, name])
+
+    # -- tree walk ----------------------------------------------------------------
+    def nodes(self) -> Iterator[dict]:
+        """Walk the array at the cursor, yielding function records from user code."""
+        for _ in self.js.iter_array():
+            yield from self.node()
+
+    def node(self, emit: bool = True) -> Iterator[dict]:
+        js = self.js
+        kind = ""
+        keep = True
+        fn: dict = {}
+        for key in js.iter_object():
+            if key == "kind":
+                kind = js.read_string()
+                keep = kind in CONTAINER_KINDS or kind in FUNCTION_KINDS
+            elif not keep:
+                js.skip_value(self._visit)
+            elif key == "loc":
+                self._track(js.read_value())
+                keep = not self._is_system()
+            elif key == "range":
+                fn["span"] = self._span(js.read_value())
+            elif key == "isImplicit":
+                keep = not js.read_value()
+            elif key in ("id", "name", "parentDeclContextId"):
+                fn[key] = js.read_string()
+            elif key == "type" and kind in FUNCTION_KINDS:
+                fn["type"] = js.read_value().get("qualType", "")
+            elif key == "inner" and kind in FUNCTION_KINDS:
+                fn["params"], fn["io"] = self._function_inner()
+            elif key == "inner" and kind == "FunctionTemplateDecl":
+                # Keep the pattern only; implicit instantiations follow it in the same list.
+                for _ in js.iter_array():
+                    for record in self.node(emit):
+                        emit = False
+                        yield record
+            elif key == "inner":
+                pushed = kind in SCOPE_KINDS and bool(fn.get("name"))
+                if pushed:
+                    name = self._qualify(fn["name"], fn.get("parentDeclContextId"))
+                    if kind == "CXXRecordDecl":
+                        self.records[fn["id"]] = name
+                    self.scope.append(fn["name"])
+                yield from self.nodes()
+                if pushed:
+                    self.scope.pop()
+            else:
+                js.skip_value(self._visit)
+        if keep and emit and kind in FUNCTION_KINDS and fn.get("name"):
+            yield self._function_record(fn)
+
+    def _function_inner(self) -> tuple[list[dict], bool]:
+        """Collect ``ParmVarDecl`` parameters and skip the body, noting calls into stdio/iostream."""
+        params: list[dict] = []
+        self.io = False
+        for _ in self.js.iter_array():
+            kind = ""
+            param: dict = {}
+            for key in self.js.iter_object():
+                if key == "kind":
+                    kind = self.js.read_string()
+                elif key in ("loc", "range"):
+                    self._track(self.js.read_value())
+                elif kind == "ParmVarDecl" and key == "name":
+                    param["name"] = self.js.read_string()
+                elif kind == "ParmVarDecl" and key == "type":
+                    param["type"] = self.js.read_value().get("qualType", "")
+                else:
+                    self.js.skip_value(self._visit_body)
+            if kind == "ParmVarDecl":
+                params.append(param)
+        return params, self.io
+
+    def _span(self, value: dict) -> dict:
+        """Same span shape as the scanner frontend: lines plus a half-open byte range."""
+        begin, end = value.get("begin", {}), value.get("end", {})
+        self._track(begin)
+        start_line = self.line
+        self._track(end)
+        begin, end = begin.get("expansionLoc", begin), end.get("expansionLoc", end)
+        return {
+            "start_line": start_line,
+            "end_line": self.line,
+            "start": begin.get("offset", 0),
+            "end": end.get("offset", 0) + end.get("tokLen", 0),
+        }
+
+    def _function_record(self, fn: dict) -> dict:
+        record = {
+            "record": "function",
+            "name": self._qualify(fn["name"], fn.get("parentDeclContextId")),
+            "effects": ["io"] if fn.get("io") else [],
+            "resources": {"memory": "capability"},
+            "span": fn.get("span", {}),
+            "type": fn.get("type", ""),
+            "params": fn.get("params", []),
+        }
+        return record
+
+
+def iter_records(stream: TextIO, module: str | None, system_prefixes: tuple[str, ...] = SYSTEM_PREFIXES) -> Iterator[dict]:
+    """Yield IR records while streaming the dump; the module header follows the first user function.
+
+    The IR schema requires at least one function, so a dump without user
+    functions raises ``ValueError`` before anything is yielded.
+    """
+    importer = Importer(JsonStream(stream), system_prefixes)
+    functions = importer.node()
+    first = next(functions, None)
+    if first is None:
+        raise ValueError("no user functions in dump")
+    yield {"record": "module", "module": module or importer.main_file or "<unknown>", "language": "cpp"}
+    yield first
+    yield from functions
+    abi: dict = {"record": "abi", "calling_convention": "trisynk_fastcall"}
+    source = Path(module or importer.main_file or "")
+    if source.is_file():
+        abi["layout_hash"] = layout_hash_file(source)
+    yield abi
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("dump", help="AST JSON produced by clang++ -Xclang -ast-dump=json ('-' for stdin)")
+    parser.add_argument("--module", help="Module name (default: main file recorded in the dump)")
+    parser.add_argument("--output", type=Path, help="Output file (default: stdout)")
+    parser.add_argument("--format", choices=FORMATS, default="json")
+    parser.add_argument("--system-prefix", action="append", default=[], help="Extra header prefix to skip")
+    args = parser.parse_args()
+
+    if args.format == "tsir" and args.output is None:
+        parser.error("--format tsir writes binary files; pass --output")
+    prefixes = SYSTEM_PREFIXES + tuple(args.system_prefix)
+    source = sys.stdin
+    try:
+        if args.dump != "-":
+            source = open(args.dump, encoding="utf-8")
+        records = iter_records(source, args.module, prefixes)
+        if args.output:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            write_module_file(args.output, records, args.format)
+        else:
+            write_module(sys.stdout, records, args.format)
+    except (OSError, ValueError) as exc:
+        raise SystemExit(f"[clang-import] {args.dump}: {exc}")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,60 +2,63 @@
 """Prototype C++-to-clmr frontend stub."""
 from __future__ import annotations
 
-import argparse
-import json
-import re
+import io
+import sys
 from pathlib import Path
+from typing import Iterator, TextIO
 
-FN_RE = re.compile(r"^\s*(?:inline\s+)?(?:constexpr\s+)?(?:void|int|float|double|auto)\s+(?P<name>[A-Za-z0-9_]+)\s*\(")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from common import cli, tracing  # noqa: E402
+from common.cache import HashingReader  # noqa: E402
+from common.ir import assemble  # noqa: E402
+from scanner import FunctionDecl, scan, scan_text  # noqa: E402
 
-def parse_functions(text: str):
-    names = []
-    for line in text.splitlines():
-        line = line.strip()
-        if line.startswith("//"):
-            continue
-        match = re.match(r"^(?:template<.*>)?\s*(?:inline\s+)?(?:constexpr\s+)?([A-Za-z0-9_:<>]+)\s+([A-Za-z0-9_]+)\s*\(", line)
-        if match:
-            names.append(match.group(2))
-    return names
+VERSION = "0.3.1"
+SUFFIXES = (".cpp", ".cc", ".cxx", ".hpp", ".h")
+IO_MARKERS = ("std::cout",)
+
+
+def parse_functions(text: str) -> list[FunctionDecl]:
+    return scan_text(text)
 
 
 def build_ir(path: Path) -> dict:
-    code = path.read_text(encoding="utf-8")
-    functions = parse_functions(code)
-    return {
-        "module": str(path),
-        "language": "cpp",
-        "functions": [
-            {
-                "name": name,
-                "effects": ["io"] if "std::cout" in code else [],
+    with path.open(encoding="utf-8") as source:
+        return assemble(iter_records(source, str(path)))
+
+
+def lower(code: str, module: str) -> dict:
+    return assemble(iter_records(io.StringIO(code), module))
+
+
+def iter_records(source: TextIO, module: str) -> Iterator[dict]:
+    """Yield IR records (module, functions, abi) while the scanner reads ``source`` chunk by chunk.
+
+    A function gets the ``io`` effect when an I/O marker occurs inside its own
+    span. The layout hash is computed over the same chunks as they are read.
+    """
+    yield {"record": "module", "module": module, "language": "cpp"}
+    reader = HashingReader(source)
+    # The scanner is lazy, so under --format ndjson this span also covers writing each record.
+    with tracing.span("scan"):
+        for decl in scan(reader, markers=IO_MARKERS):
+            yield {
+                "record": "function",
+                "name": decl.name,
+                "effects": ["io"] if decl.markers else [],
                 "resources": {"memory": "capability"},
+                "span": {"start_line": decl.line, "end_line": decl.end_line, "start": decl.start, "end": decl.end},
             }
-            for name in functions
-        ],
-        "abi": {
-            "calling_convention": "trisynk_fastcall",
-            "layout_hash": hash(code) & 0xFFFFFFFF,
-        },
+    yield {
+        "record": "abi",
+        "calling_convention": "trisynk_fastcall",
+        "layout_hash": reader.layout_hash(),
     }
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("input", type=Path)
-    parser.add_argument("--output", type=Path)
-    args = parser.parse_args()
-
-    ir = build_ir(args.input)
-    payload = json.dumps(ir, indent=2)
-    if args.output:
-        args.output.write_text(payload, encoding="utf-8")
-    else:
-        print(payload)
-    return 0
+    return cli.main(iter_records, description=__doc__, suffixes=SUFFIXES, version=VERSION, tag="trisynk-cpp")
 
 
 if __name__ == "__main__":
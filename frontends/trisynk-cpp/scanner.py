@@ -0,0 +1,538 @@
+"""Single-pass streaming scanner for C++ function declarations.
+
+The scanner reads its input in fixed-size chunks and keeps only a small
+carry-over buffer between them, so memory stays flat regardless of the
+translation unit size. Comment, string, raw-string, preprocessor and
+template-bracket state survive chunk boundaries. Function bodies are lexed
+(to balance braces) but not parsed. Optional ``markers`` are plain substrings
+(e.g. ``std::cout``) matched against the raw text as it streams past. Each
+declaration reports the markers that occur inside its own span.
+
+Most declarations are plain: an optional ``template<...>`` header, type and name
+tokens, one parameter list, a few qualifiers, then ``;`` or a body without
+preprocessor lines or raw strings. At each statement start ``DECL_RE`` tries to
+match such a declaration whole, body included, in one regex call. Its items are
+atomic and mirror the token-level lexer, so a match means the same as lexing it
+token by token. Anything else, including a declaration cut off at a chunk
+boundary, fails the match and goes through the token-level path.
+"""
+from __future__ import annotations
+
+import io
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterator, TextIO
+
+CHUNK_SIZE = 1 << 16
+HEAD_LIMIT = 64
+
+TOKEN_RE = re.compile(
+    r"""
+    \s*
+    (?:
+      (?P<comment>//|/\*)
+    | (?P<quote>["'])
+    | (?P<ident>[A-Za-z_$][A-Za-z0-9_$]*)
+    | (?P<number>\.?[0-9](?:[A-Za-z0-9_.]|'(?=[A-Za-z0-9_])|(?<=[eEpP])[+-])*)
+    | (?P<punct>::|->|&&|\.\.\.|.)
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# Inside function bodies only braces, literals, comments and directives matter, and inside
+# parameter lists only parentheses do; everything else is skipped by one regex match.
+SKIP_TAIL = r"""|[A-Za-z_][A-Za-z0-9_]*(?!")|[0-9](?:[A-Za-z0-9_.]|'(?=[A-Za-z0-9_]))*|/(?![/*]))*"""
+BODY_RE = re.compile(r"""(?:[^{}"'/\#A-Za-z_0-9]+""" + SKIP_TAIL)
+PAREN_RE = re.compile(r"""(?:[^();"'/\#A-Za-z_0-9]+""" + SKIP_TAIL)
+STRING_END_RE = {
+    '"': re.compile(r'[^"\\\n]*(?:\\.[^"\\\n]*)*["\n]', re.DOTALL),
+    "'": re.compile(r"[^'\\\n]*(?:\\.[^'\\\n]*)*['\n]", re.DOTALL),
+}
+RAW_PREFIXES = {"R", "LR", "uR", "UR", "u8R"}
+
+
+def _nest(pattern: str, depth: int) -> str:
+    """Expand ``{inner}`` in ``pattern`` to ``depth`` levels (re has no recursion)."""
+    inner = pattern.replace("{inner}", "(?!)")
+    for _ in range(depth - 1):
+        inner = pattern.replace("{inner}", inner)
+    return inner
+
+
+# Fast path. Every repetition is possessive and every item atomic, so a match is the one
+# reading the token-level lexer makes; comments and strings end where STRING_END_RE and
+# _find_eol would end them, and anything they would read differently fails the match.
+LINE_COMMENT = r"//(?:[^\\\n]++|\\(?!\r?\n)|\\\r?\n)*+\n"
+BLOCK_COMMENT = r"/\*(?>.*?\*/)"
+FAST_IDENT = r"[A-Za-z_][A-Za-z0-9_]*+"
+ANGLE = _nest(r"<(?:[A-Za-z0-9_\s,*&:=]++|\.\.\.|{inner})*+>", 4)
+PARAMS = _nest(r"\((?:[^()\"'/#;]++|/(?![/*])|{inner})*+\)", 4)
+# A quote glued to an identifier or number may be a raw-string prefix or a digit separator;
+# such bodies are left to the token-level path.
+QUOTED = r"""(?<![A-Za-z0-9_$.])(?:"(?:[^"\\\n]++|\\.)*+"|'(?:[^'\\\n]++|\\.)*+')"""
+BODY = _nest(r"""\{(?:[^{}"'/#]++|/(?![/*])|""" + QUOTED + "|" + LINE_COMMENT + "|" + BLOCK_COMMENT + r"|{inner})*+\}", 8)
+HEAD_TOKEN = rf"(?:{FAST_IDENT}(?:\s*+::\s*+{FAST_IDENT})*+(?:\s*+{ANGLE})?+|&&|[*&])"
+DECL_RE = re.compile(
+    rf"(?:\s++|{LINE_COMMENT}|{BLOCK_COMMENT})*+"
+    rf"(?P<decl>(?:template\s*+{ANGLE}\s*+)*+(?P<type>(?:{HEAD_TOKEN}\s*+(?!\())*+)"
+    rf"(?P<name>{FAST_IDENT}(?:\s*+::\s*+{FAST_IDENT})*+)\s*+{PARAMS}"
+    r"(?:\s*+(?:(?:const|volatile|noexcept|override|final)(?![A-Za-z0-9_$])|&&|&))*+\s*+"
+    rf"(?:(?:=\s*+(?:0|default|delete)(?![A-Za-z0-9_$])\s*+)?;|(?P<body>{BODY})))?",
+    re.DOTALL,
+)
+HEAD_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|[0-9][A-Za-z0-9_]*|::|&&|\.\.\.|\S")
+# Head tokens whose handling the fast path does not reproduce.
+FAST_EXCLUDED = {"operator", "template", "typedef", "using"}
+TYPE_CACHE_LIMIT = 4096
+RAW_DELIM_RE = re.compile(r'"([^()\\\s]{0,16})\(')
+
+# Identifiers that can precede "(" without naming a function.
+NOT_NAMES = {
+    "if", "while", "for", "switch", "return", "sizeof", "alignof", "alignas", "decltype", "catch",
+    "new", "delete", "static_assert", "noexcept", "throw", "typeid", "requires", "__attribute__",
+    "__declspec", "co_await", "co_return", "co_yield", "defined",
+}
+# Identifiers that cannot be the last token of a return type.
+NOT_TYPES = {
+    "return", "else", "new", "delete", "throw", "case", "goto", "typedef", "using", "co_return",
+    "co_yield", "co_await", "sizeof", "public", "private", "protected", "operator", "template",
+}
+TYPE_PUNCT = {">", "*", "&", "&&"}
+SPECIFIERS = {"inline", "static", "constexpr", "consteval", "virtual", "extern", "explicit", "friend", "typename"}
+ACCESS = {"public", "private", "protected"}
+FAST_NOT_NAMES = NOT_NAMES | FAST_EXCLUDED
+
+
+@dataclass(slots=True)  # not frozen: frozen __init__ costs ~3us per declaration
+class FunctionDecl:
+    name: str
+    return_type: str
+    start: int
+    end: int
+    line: int
+    end_line: int
+    definition: bool
+    markers: frozenset[str] = frozenset()
+
+
+def render_type(tokens: list[str]) -> str:
+    """Join type tokens back into compact C++ spelling, dropping specifiers and attributes."""
+    out: list[str] = []
+    attr = 0
+    for idx, tok in enumerate(tokens):
+        if tok == "[" and (attr or (idx + 1 < len(tokens) and tokens[idx + 1] == "[")):
+            attr += 1
+            continue
+        if attr:
+            attr -= tok == "]"
+            continue
+        if tok in SPECIFIERS:
+            continue
+        if out and (tok[0].isalnum() or tok[0] == "_") and (out[-1][-1].isalnum() or out[-1][-1] in "_>*&"):
+            out.append(" ")
+        elif tok == "," and out:
+            tok = ", "
+        out.append(tok)
+    return "".join(out).strip()
+
+
+class Scanner:
+    """Incremental tokenizer + declaration recognizer; feed text chunks, collect ``FunctionDecl``s."""
+
+    def __init__(self, markers: tuple[str, ...] = (), fast: bool = True) -> None:
+        self.markers = markers
+        self.fast = fast
+        self.marker_tail = ""  # last characters seen, so a marker split across chunks still matches
+        self.seen = 0  # characters fed so far
+        self.hits: deque[tuple[int, str]] = deque()  # (absolute offset, marker) in offset order, not yet passed
+        self.buf = ""
+        self.base = 0  # absolute offset of buf[0]
+        self.line = 1
+        self.line_idx = 0  # buf index up to which newlines are counted into ``line``
+        self.bol_start = True  # whether buf[0] sits at the beginning of a line
+        self.state = "code"
+        self.raw_term = ""
+        self.body_depth = 0
+        self.pending: tuple[str, str, int, int] | None = None
+        self.decls: list[FunctionDecl] = []
+        self.types: dict[str, tuple[str, int, bool] | None] = {}  # fast path: type text -> (rendered, tokens, type_ok)
+        self._reset()
+
+    # -- statement recognizer -------------------------------------------------
+    def _reset(self) -> None:
+        self.stmt_start: int | None = None
+        self.stmt_line = 0
+        self.head: list[str] = []
+        self.paren = 0
+        self.angle = 0
+        self.template_hdr = False
+        self.assigned = False
+        self.fnlike = False
+        self.operator = False
+        self.ctor_init = False
+        self.brace_init = 0
+        self.trailing: list[str] | None = None
+        self.cand: tuple[str, str, int] | None = None
+        self.prev = ""
+        self.prev_ident = False
+        self.qual = ""
+        self.qual_prev = ""
+        self.qual_prev_ident = False
+        self.qual_index = 0
+
+    def _return_type(self) -> str:
+        if self.trailing:
+            return render_type(self.trailing)
+        return render_type(self.head[: self.qual_index])
+
+    def _emit(self, end: int, definition: bool, cand: tuple[str, str, int], start: int) -> None:
+        name, ret, line = cand
+        hits = self.hits
+        found = set()
+        while hits and hits[0][0] < end:
+            offset, marker = hits.popleft()
+            if offset >= start:
+                found.add(marker)
+        self.decls.append(FunctionDecl(name, ret, start, end, line, self._line_at(end - 1), definition, frozenset(found)))
+
+    def _token(self, text: str, is_ident: bool, offset: int) -> None:
+        if self.body_depth:
+            if text == "{":
+                self.body_depth += 1
+            elif text == "}":
+                self.body_depth -= 1
+                if self.body_depth == 0:
+                    if self.pending is not None:
+                        name, ret, line, start = self.pending
+                        self._emit(offset + 1, True, (name, ret, line), start)
+                    self.pending = None
+                    self._reset()
+            return
+        if self.stmt_start is None:
+            self.stmt_start = offset
+            self.stmt_line = self._line_at(offset)
+        if self.paren:
+            if text == "(":
+                self.paren += 1
+            elif text == ")":
+                self.paren -= 1
+                if not self.paren:
+                    self.prev, self.prev_ident = ")", False
+            elif text == ";":
+                self.paren = 0  # unbalanced; resynchronise on the terminator below
+            else:
+                return
+            if self.paren or text == ")":
+                return
+        if self.brace_init:
+            self.brace_init += text == "{"
+            self.brace_init -= text == "}"
+            if not self.brace_init:
+                self.prev, self.prev_ident = "}", False
+            return
+        if self.trailing is not None and text not in ";{":
+            self.trailing.append(text)
+            return
+        if len(self.head) < HEAD_LIMIT and not self.template_hdr:
+            self.head.append(text)
+        if self.angle:
+            if text == "<":
+                self.angle += 1
+            elif text == ">":
+                self.angle -= 1
+                if not self.angle:
+                    if self.template_hdr:
+                        self.template_hdr = False
+                        self.head.clear()
+                        self.prev, self.prev_ident = "", False
+                    else:
+                        self.prev, self.prev_ident = ">", False
+            elif text in ";{}":
+                self.angle = 0
+                self.template_hdr = False
+            if self.angle or text == ">":
+                return
+
+        if is_ident:
+            if text == "operator":
+                self.fnlike = self.operator = True
+            if self.prev == "::" and self.qual:
+                self.qual += "::" + text
+            else:
+                self.qual_prev, self.qual_prev_ident = self.prev, self.prev_ident
+                self.qual = text
+                self.qual_index = len(self.head) - 1
+            self.prev, self.prev_ident = text, True
+            return
+        if text == "(":
+            self.paren = 1
+            if self.prev_ident and self.prev not in NOT_NAMES and (not self.assigned or self.operator):
+                self.fnlike = True
+                type_ok = (self.qual_prev_ident and self.qual_prev not in NOT_TYPES) or self.qual_prev in TYPE_PUNCT
+                if self.cand is None and not self.operator and type_ok and self.head[0] not in ("typedef", "using"):
+                    self.cand = (self.qual, self._return_type(), self.stmt_line)
+            return
+        if text == "<" and (self.prev_ident or self.prev == "operator"):
+            self.angle = 1
+            if self.prev == "template":
+                self.template_hdr = True
+                self.head.pop()
+                if self.head and self.head[-1] == "template":
+                    self.head.pop()
+            return
+        if text == ";":
+            if self.cand is not None and self.stmt_start is not None:
+                self._emit(offset + 1, False, self._finish_cand(), self.stmt_start)
+            self._reset()
+            return
+        if text == "{":
+            if self.ctor_init and self.prev_ident:
+                self.brace_init = 1
+                return
+            if self.fnlike:
+                cand = self._finish_cand() if self.cand is not None else None
+                self.pending = (*cand, self.stmt_start) if cand else None
+                self.body_depth = 1
+                return
+            self._reset()
+            return
+        if text == "}":
+            self._reset()
+            return
+        if text == "=" and self.cand is None:
+            self.assigned = True
+        elif text == ":" and self.fnlike and self.prev == ")":
+            self.ctor_init = True
+        elif text == ":" and len(self.head) == 2 and self.head[0] in ACCESS:
+            self._reset()
+            return
+        elif text == "->" and self.fnlike and self.prev == ")" and self.cand is not None:
+            self.trailing = []
+        self.prev, self.prev_ident = text, False
+
+    def _finish_cand(self) -> tuple[str, str, int]:
+        name, ret, line = self.cand
+        if self.trailing:
+            ret = render_type(self.trailing)
+        return name, ret, line
+
+    def _fast_type(self, text: str) -> tuple[str, int, bool] | None:
+        """Render the return-type part of a fast-path head; ``None`` if the token-level path must handle it."""
+        tokens = HEAD_TOKEN_RE.findall(text)
+        if not FAST_EXCLUDED.isdisjoint(tokens):
+            return None
+        # Within DECL_RE's grammar the qualified name starts right after the last type token.
+        prev = tokens[-1] if tokens else ""
+        prev_ident = prev[:1].isalpha() or prev[:1] == "_"
+        type_ok = (prev_ident and prev not in NOT_TYPES) or prev in TYPE_PUNCT
+        return render_type(tokens), len(tokens), type_ok
+
+    def _fast_decls(self, buf: str, pos: int) -> int:
+        """Consume whole plain declarations from a statement start; returns where the token-level path takes over."""
+        base = self.base
+        types = self.types
+        decls = self.decls
+        while True:
+            match = DECL_RE.match(buf, pos)
+            start = match.start("decl")
+            if start < 0:
+                return match.end()
+            text = match.group("type")
+            info = types.get(text, False)
+            if info is False:
+                if len(types) >= TYPE_CACHE_LIMIT:
+                    types.clear()
+                info = types[text] = self._fast_type(text)
+            name = match.group("name")
+            if "::" in name:
+                name = "".join(name.split())
+                parts = name.split("::")
+                if parts[-1] in NOT_NAMES or not FAST_EXCLUDED.isdisjoint(parts):
+                    return start
+                size = 2 * len(parts) - 1
+            elif name in FAST_NOT_NAMES:
+                return start
+            else:
+                size = 1
+            if info is None or info[1] + size >= HEAD_LIMIT:
+                return start
+            pos = match.end()
+            if not info[2]:
+                continue
+            definition = match.start("body") >= 0
+            if self.hits:
+                self._emit(base + pos, definition, (name, info[0], self._line_at(base + start)), base + start)
+                continue
+            # Same as _line_at/_emit, inlined: this loop runs once per declaration.
+            line = self.line + buf.count("\n", self.line_idx, start)
+            end_line = line + buf.count("\n", start, pos - 1)
+            self.line, self.line_idx = end_line, pos - 1
+            decls.append(FunctionDecl(name, info[0], base + start, base + pos, line, end_line, definition))
+
+    # -- lexer ----------------------------------------------------------------
+    def _line_at(self, offset: int) -> int:
+        """Line number of absolute ``offset``; newlines are counted lazily and only once."""
+        idx = offset - self.base
+        self.line += self.buf.count("\n", self.line_idx, idx)
+        self.line_idx = idx
+        return self.line
+
+    def _at_bol(self, idx: int) -> bool:
+        nl = self.buf.rfind("\n", 0, idx)
+        prefix = self.buf[nl + 1 : idx]
+        if prefix and not prefix.isspace():
+            return False
+        return nl >= 0 or self.bol_start
+
+    def _find_eol(self, pos: int) -> int:
+        """Index of the next newline not escaped by a backslash continuation, or -1."""
+        buf = self.buf
+        while True:
+            idx = buf.find("\n", pos)
+            if idx < 0:
+                return -1
+            back = idx - 1
+            if back >= 0 and buf[back] == "\r":
+                back -= 1
+            if back < 0 or buf[back] != "\\":
+                return idx
+            pos = idx + 1
+
+    def _lex_code(self, pos: int, eof: bool) -> tuple[int, bool]:
+        """Tokenize plain code until the lexer state changes; returns ``(pos, need_more_input)``."""
+        buf = self.buf
+        size = len(buf)
+        base = self.base
+        for match in TOKEN_RE.finditer(buf, pos):
+            end = match.end()
+            if end == size and not eof:
+                return match.start(), True  # the token may continue in the next chunk
+            kind = match.lastgroup
+            text = match.group(kind)
+            start = match.start(kind)
+            if kind == "comment":
+                self.state = "line" if text == "//" else "block"
+                return end, False
+            if kind == "quote":
+                self.state = text
+                return end, False
+            if text == "#" and self._at_bol(start):
+                self.state = "pp"
+                return end, False
+            if kind == "ident" and text in RAW_PREFIXES and buf.startswith('"', end):
+                delim = RAW_DELIM_RE.match(buf, end)
+                if delim is not None:
+                    self.raw_term = ")" + delim.group(1) + '"'
+                    self.state = "raw"
+                    return delim.end(), False
+                if not eof and buf.find("(", end, end + 18) < 0 and size - end <= 18:
+                    return start, True  # delimiter may be split across chunks
+            self._token(text, kind == "ident", base + start)
+            if self.body_depth or self.paren or self.stmt_start is None:
+                return end, False  # body, parameter list or next statement: feed picks the matcher
+        return size, False
+
+    def _find_markers(self, chunk: str) -> None:
+        text = self.marker_tail + chunk
+        origin = self.seen - len(self.marker_tail)
+        found = []
+        for marker in self.markers:
+            idx = text.find(marker)
+            while idx >= 0:
+                if idx + len(marker) > len(self.marker_tail):  # matches inside the tail were recorded last time
+                    found.append((origin + idx, marker))
+                idx = text.find(marker, idx + 1)
+        self.hits.extend(sorted(found))
+        self.seen += len(chunk)
+        keep = max(map(len, self.markers)) - 1
+        self.marker_tail = text[-keep:] if keep else ""
+
+    def feed(self, chunk: str, eof: bool = False) -> None:
+        if self.markers and chunk:
+            self._find_markers(chunk)
+        buf = self.buf = self.buf + chunk
+        size = len(buf)
+        pos = 0
+        while pos < size:
+            state = self.state
+            if state == "code":
+                if self.fast and self.stmt_start is None and not self.body_depth:
+                    pos = self._fast_decls(buf, pos)
+                skip = BODY_RE if self.body_depth else PAREN_RE if self.paren else None
+                if skip is not None:
+                    end = skip.match(buf, pos).end()
+                    if end >= size - 1 and not eof:
+                        pos = max(pos, end - 1)
+                        break
+                    pos = end
+                pos, need_more = self._lex_code(pos, eof)
+                if need_more:
+                    break
+            elif state in ('"', "'"):
+                match = STRING_END_RE[state].match(buf, pos)
+                if match is None:
+                    if not eof:
+                        break
+                    pos = size
+                    continue
+                self.state = "code"
+                pos = match.end()
+            elif state in ("line", "pp"):
+                idx = self._find_eol(pos)
+                if idx < 0:
+                    # Every newline seen so far was escaped; only a trailing backslash must be carried.
+                    tail = 0 if eof else 2 if buf.endswith("\\\r") else 1 if buf.endswith("\\") else 0
+                    pos = max(pos, size - tail)
+                    break
+                self.state = "code"
+                pos = idx + 1
+            else:
+                term = "*/" if state == "block" else self.raw_term
+                idx = buf.find(term, pos)
+                if idx < 0:
+                    pos = size if eof else max(pos, size - len(term) + 1)
+                    break
+                self.state = "code"
+                pos = idx + len(term)
+        if self.hits:
+            # Hits before the earliest start a later declaration can have are never reported.
+            if self.pending is not None:
+                limit = self.pending[3]
+            elif self.stmt_start is not None and not self.body_depth:
+                limit = self.stmt_start
+            else:
+                limit = self.base + pos
+            hits = self.hits
+            while hits and hits[0][0] < limit:
+                hits.popleft()
+        if pos:
+            self._line_at(self.base + pos)
+            self.bol_start = self._at_bol(pos)
+            self.buf = buf[pos:]
+            self.base += pos
+            self.line_idx = 0
+
+    def drain(self) -> list[FunctionDecl]:
+        decls, self.decls = self.decls, []
+        return decls
+
+
+def scan(
+    stream: TextIO, chunk_size: int = CHUNK_SIZE, markers: tuple[str, ...] = (), fast: bool = True
+) -> Iterator[FunctionDecl]:
+    """Yield function declarations from ``stream`` in a single pass over fixed-size chunks.
+
+    ``fast=False`` lexes every declaration token by token (for comparison and benchmarks).
+    """
+    scanner = Scanner(markers, fast)
+    while True:
+        chunk = stream.read(chunk_size)
+        scanner.feed(chunk, eof=not chunk)
+        yield from scanner.drain()
+        if not chunk:
+            break
+
+
+def scan_text(text: str, markers: tuple[str, ...] = (), fast: bool = True) -> list[FunctionDecl]:
+    return list(scan(io.StringIO(text), markers=markers, fast=fast))
@@ -3,51 +3,88 @@
 from __future__ import annotations
 
 import argparse
-import json
-import re
+import io
+import sys
+from functools import partial
 from pathlib import Path
+from typing import Iterator, TextIO
 
-FN_RE = re.compile(r"^\s*fn\s+(?P<name>[A-Za-z0-9_]+)")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from common import cli, tracing  # noqa: E402
+from common.cache import content_digest  # noqa: E402
+from common.ir import RecordSource, assemble  # noqa: E402
+import mir  # noqa: E402
+import spans  # noqa: E402
 
-def parse_functions(text: str):
-    return [match.group("name") for match in FN_RE.finditer(text)]
+VERSION = "0.3.0"
+SUFFIXES = (".rs",)
+
+
+def parse_functions(text: str) -> list[str]:
+    return [fn.name for fn in spans.index(text).functions]
 
 
 def build_ir(path: Path) -> dict:
-    code = path.read_text(encoding="utf-8")
-    fns = parse_functions(code)
-    return {
-        "module": str(path),
-        "language": "rust",
-        "functions": [
-            {
-                "name": name,
-                "effects": ["io"] if "print" in code else [],
-                "resources": {"memory": "affine"},
-            }
-            for name in fns
-        ],
-        "abi": {
-            "calling_convention": "trisynk_fastcall",
-            "capabilities": ["borrow", "mut" if "mut" in code else "immut"],
-        },
+    return lower(path.read_text(encoding="utf-8"), str(path))
+
+
+def lower(code: str, module: str) -> dict:
+    return assemble(iter_records(io.StringIO(code), module))
+
+
+def iter_records(source: TextIO, module: str, mir_facts: dict[str, mir.MirFacts] | None = None) -> Iterator[dict]:
+    """Yield IR records (module, functions, abi) in source order.
+
+    Effects and capabilities come from each function's own span; when a MIR
+    index is supplied, its facts take precedence for the functions it covers.
+    """
+    yield {"record": "module", "module": module, "language": "rust"}
+    with tracing.span("scan"):
+        index = spans.index(source.read())
+    mutable = index.mutable
+    for fn in index.functions:
+        facts = (mir_facts or {}).get(fn.name, fn)
+        mutable = mutable or facts.mutable
+        yield {
+            "record": "function",
+            "name": fn.name,
+            "effects": sorted(facts.effects),
+            "resources": {"memory": "affine"},
+            "capabilities": facts.capabilities,
+            "span": {"start_line": fn.line, "end_line": fn.end_line, "start": fn.start, "end": fn.end},
+        }
+    yield {
+        "record": "abi",
+        "calling_convention": "trisynk_fastcall",
+        "capabilities": ["borrow", "mut" if mutable else "immut"],
     }
 
 
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--mir", type=Path, help="Crate MIR dump (rustc -Zunpretty=mir) for per-function attribution")
+
+
+def bind(args: argparse.Namespace) -> tuple[RecordSource, str]:
+    if args.mir is None:
+        return iter_records, ""
+    if not args.mir.is_file():
+        raise SystemExit(f"[trisynk-rs] MIR dump not found: {args.mir}")
+    data = args.mir.read_bytes()
+    facts = mir.index(data.decode("utf-8", errors="replace").splitlines())
+    return partial(iter_records, mir_facts=facts), f"+mir:{content_digest(data)[:16]}"
+
+
 def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("input", type=Path)
-    parser.add_argument("--output", type=Path)
-    args = parser.parse_args()
-
-    ir = build_ir(args.input)
-    payload = json.dumps(ir, indent=2)
-    if args.output:
-        args.output.write_text(payload, encoding="utf-8")
-    else:
-        print(payload)
-    return 0
+    return cli.main(
+        iter_records,
+        description=__doc__,
+        suffixes=SUFFIXES,
+        version=VERSION,
+        tag="trisynk-rs",
+        add_arguments=add_arguments,
+        bind=bind,
+    )
 
 
 if __name__ == "__main__":
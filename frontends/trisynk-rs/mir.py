@@ -0,0 +1,65 @@
+"""Per-function facts from textual MIR (``rustc -Zunpretty=mir``).
+
+The dump is read line by line in a single pass: every body starts with a
+column-0 ``fn`` header and ends at the matching column-0 ``}``, so each line
+is attributed to exactly one body. Closure bodies (``outer::{closure#0}``) and
+impl/trait methods (``<impl at src/lib.rs:3:1: 3:7>::push``, ``Tr::dflt``) are
+folded into the source-level function name the span index reports.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable
+
+HEADER_RE = re.compile(r"^(?:(?:const|async|unsafe)\s+)*fn\s+(?P<path>.+?)\((?P<params>.*)\)\s*->")
+SEGMENT_RE = re.compile(r"<[^<>]*(?:<[^<>]*>[^<>]*)*>|\{[^{}]*\}|[^:<>{}]+")
+IO_RE = re.compile(r"\b(?:_e?print|std::(?:io|fs|net|process)::|Std(?:out|err|in)\b)")
+
+
+@dataclass
+class MirFacts:
+    effects: set[str] = field(default_factory=set)
+    mutable: bool = False
+    borrows: bool = False
+
+    @property
+    def capabilities(self) -> list[str]:
+        return (["borrow"] if self.borrows else []) + ["mut" if self.mutable else "immut"]
+
+
+def source_name(path: str) -> str:
+    """Map a MIR item path to the plain function name the source index uses."""
+    segments = [seg for seg in SEGMENT_RE.findall(path) if seg.strip()]
+    while segments and segments[-1].startswith("{"):
+        segments.pop()  # closures, consts and shims belong to the enclosing fn
+    name = segments[-1] if segments else path
+    return name.removeprefix("r#")
+
+
+def _record(facts: MirFacts, line: str) -> None:
+    if "&" in line:
+        facts.borrows = True
+    if "&mut " in line:
+        facts.mutable = True
+    if "io" not in facts.effects and IO_RE.search(line):
+        facts.effects.add("io")
+
+
+def index(lines: Iterable[str]) -> dict[str, MirFacts]:
+    """Fold every MIR body into facts keyed by source function name."""
+    facts: dict[str, MirFacts] = {}
+    current: MirFacts | None = None
+    for line in lines:
+        if current is None:
+            match = HEADER_RE.match(line)
+            if match is None:
+                continue
+            current = facts.setdefault(source_name(match.group("path")), MirFacts())
+            _record(current, match.group("params"))
+        elif line.startswith("}"):
+            current = None
+        elif not line.lstrip().startswith(("debug ", "let ", "scope ")) or "&mut " in line:
+            # Locals are declarations only; ``&mut`` locals still witness a mutable borrow.
+            _record(current, line)
+    return facts
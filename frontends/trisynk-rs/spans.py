@@ -0,0 +1,169 @@
+"""Single-pass function span index for Rust sources.
+
+The tokenizer walks the file once, keeping a stack of open ``fn`` items; every
+token is attributed to the innermost open function (closures count towards the
+function that contains them), so per-function effects and capabilities come
+out of the same pass that finds the spans. Comments, strings and char literals
+are skipped and never contribute facts.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+
+TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<comment>//[^\n]*|/\*)
+      | (?P<string>b?r(?P<hashes>\#*)"|b?"(?:[^"\\]|\\.)*")
+      | (?P<char>b?'(?:[^'\\\n]|\\(?:u\{[0-9A-Fa-f]+\}|x[0-9A-Fa-f]{2}|.))')
+      | (?P<lifetime>'[A-Za-z_]\w*)
+      | (?P<ident>(?:r\#)?[A-Za-z_]\w*)
+      | (?P<punct>::|->|=>|\S)
+    )""",
+    re.VERBOSE | re.DOTALL,
+)
+BLOCK_COMMENT_RE = re.compile(r"/\*|\*/")
+
+IO_MACROS = {"print", "println", "eprint", "eprintln", "dbg"}
+IO_MODULES = {"io", "fs", "net", "process"}
+IO_CALLS = {"stdout", "stderr", "stdin"}
+
+
+@dataclass
+class FnSpan:
+    name: str
+    start: int
+    line: int
+    end: int = -1
+    end_line: int = 0
+    effects: set[str] = field(default_factory=set)
+    mutable: bool = False
+    borrows: bool = False
+
+    @property
+    def capabilities(self) -> list[str]:
+        return (["borrow"] if self.borrows else []) + ["mut" if self.mutable else "immut"]
+
+
+@dataclass
+class SpanIndex:
+    functions: list[FnSpan]
+    mutable: bool  # any ``mut`` in the module, inside functions or not
+
+
+class _Walker:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.line = 1
+        self.line_pos = 0
+        self.functions: list[FnSpan] = []
+        self.stack: list[FnSpan | None] = []  # one entry per open brace; FnSpan for function bodies
+        self.open: list[FnSpan] = []  # innermost function last, including one still in its signature
+        self.pending: FnSpan | None = None  # ``fn`` seen, body brace not yet reached
+        self.pending_depth = 0
+        self.fn_start = -1  # offset of a ``fn`` keyword still waiting for its name
+        self.mutable = False
+        self.prev = ["", ""]
+
+    def _line_at(self, pos: int) -> int:
+        self.line += self.text.count("\n", self.line_pos, pos)
+        self.line_pos = pos
+        return self.line
+
+    def _skip_block_comment(self, pos: int) -> int:
+        depth = 1
+        while depth:
+            match = BLOCK_COMMENT_RE.search(self.text, pos)
+            if match is None:
+                return len(self.text)
+            depth += 1 if match.group() == "/*" else -1
+            pos = match.end()
+        return pos
+
+    def _skip_raw_string(self, pos: int, hashes: str) -> int:
+        end = self.text.find('"' + hashes, pos)
+        return len(self.text) if end < 0 else end + 1 + len(hashes)
+
+    def run(self) -> SpanIndex:
+        text = self.text
+        pos = 0
+        while pos < len(text):
+            match = TOKEN_RE.match(text, pos)
+            if match is None or match.end() == pos:
+                break
+            pos = match.end()
+            kind = match.lastgroup
+            if kind == "comment":
+                if match.group(kind) == "/*":
+                    pos = self._skip_block_comment(pos)
+            elif kind == "string":
+                if match.group("hashes") is not None:
+                    pos = self._skip_raw_string(pos, match.group("hashes"))
+            elif kind == "ident":
+                self._ident(match.group(kind), match.start(kind))
+            elif kind == "punct":
+                self._punct(match.group(kind), match.start(kind))
+        for fn in self.open:
+            fn.end, fn.end_line = len(text), self._line_at(len(text))
+        return SpanIndex(self.functions, self.mutable)
+
+    def _attribute(self, token: str) -> None:
+        current = self.open[-1] if self.open else None
+        if token == "mut":
+            self.mutable = True
+            if current is not None:
+                current.mutable = True
+        if current is None:
+            return
+        if token == "&":
+            current.borrows = True
+        elif token in IO_MODULES and self.prev == ["std", "::"]:
+            current.effects.add("io")
+
+    def _ident(self, ident: str, start: int) -> None:
+        if self.fn_start >= 0:
+            fn = FnSpan(name=ident.removeprefix("r#"), start=self.fn_start, line=self._line_at(self.fn_start))
+            self.functions.append(fn)
+            self.open.append(fn)
+            self.pending, self.pending_depth, self.fn_start = fn, 0, -1
+        elif ident == "fn":
+            self.fn_start = start
+        else:
+            self._attribute(ident)
+        self.prev = [self.prev[1], ident]
+
+    def _punct(self, char: str, start: int) -> None:
+        prev_ident = self.prev[1]
+        pending = self.pending
+        self.fn_start = -1  # ``fn(`` is a function pointer type, not an item
+        if pending is not None and char in "(<[":
+            self.pending_depth += 1
+        elif pending is not None and char in ")>]" and self.pending_depth:
+            self.pending_depth -= 1
+        elif pending is not None and char == ";" and not self.pending_depth:
+            # Body-less declaration (trait item or extern block): the span ends at the semicolon.
+            pending.end, pending.end_line = start + 1, self._line_at(start)
+            self.open.pop()
+            self.pending = None
+        elif char == "{":
+            if pending is not None and not self.pending_depth:
+                self.stack.append(pending)
+                self.pending = None
+            else:
+                self.stack.append(None)
+        elif char == "}" and self.stack:
+            closed = self.stack.pop()
+            if closed is not None:
+                closed.end, closed.end_line = start + 1, self._line_at(start)
+                self.open.remove(closed)
+        elif char == "!" and prev_ident in IO_MACROS and self.open:
+            self.open[-1].effects.add("io")
+        elif char == "(" and prev_ident in IO_CALLS and self.open:
+            self.open[-1].effects.add("io")
+        self._attribute(char)
+        self.prev = [self.prev[1], char]
+
+
+def index(text: str) -> SpanIndex:
+    """Find every ``fn`` item with its byte/line span and per-function facts in one pass."""
+    return _Walker(text).run()
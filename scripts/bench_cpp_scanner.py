@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark the streaming C++ scanner against the legacy per-line regex parser."""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "frontends" / "trisynk-cpp"))
+
+from scanner import scan  # noqa: E402
+
+LEGACY_RE = r"^(?:template<.*>)?\s*(?:inline\s+)?(?:constexpr\s+)?([A-Za-z0-9_:<>]+)\s+([A-Za-z0-9_]+)\s*\("
+
+UNIT = """// generated unit {idx}: exercises comments, strings and template brackets
+/* block comment with a decoy: int decoy_{idx}(int x); */
+template <typename T, typename U = std::vector<int>>
+static inline std::map<T, U>
+multi_{idx}(const T& a,
+           U b) noexcept {{
+    const char* s = "{{ int fake_{idx}(); }}";
+    return {{}};
+}}
+
+inline double mul_{idx}(double a, double b) {{ return a * b; }}
+int decl_{idx}(int value);
+"""
+
+
+def legacy_parse(text: str) -> list[str]:
+    """Verbatim copy of the pre-scanner ``parse_functions`` for comparison."""
+    names = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("//"):
+            continue
+        match = re.match(LEGACY_RE, line)
+        if match:
+            names.append(match.group(2))
+    return names
+
+
+def generate(path: Path, target_bytes: int) -> int:
+    units = 0
+    written = 0
+    with path.open("w", encoding="utf-8") as fh:
+        while written < target_bytes:
+            chunk = UNIT.format(idx=units)
+            fh.write(chunk)
+            written += len(chunk)
+            units += 1
+    return units
+
+
+def measure(fn) -> tuple[int, float, int]:
+    """Time ``fn`` untraced, then re-run it under tracemalloc for peak Python heap usage."""
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, nargs="+", default=[1.0, 4.0])
+    parser.add_argument("--output", type=Path, help="Write JSON results here")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.size_mb:
+            source = Path(tmp) / f"unit_{size_mb}.cpp"
+            units = generate(source, int(size_mb * 1024 * 1024))
+            mb = source.stat().st_size / (1024 * 1024)
+
+            def run_legacy() -> int:
+                return len(legacy_parse(source.read_text(encoding="utf-8")))
+
+            def run_scanner(fast: bool = True) -> int:
+                with source.open(encoding="utf-8") as fh:
+                    return sum(1 for _ in scan(fh, fast=fast))
+
+            runs = (("regex", run_legacy), ("scanner", run_scanner), ("scanner-tokens", lambda: run_scanner(False)))
+            for name, fn in runs:
+                count, elapsed, peak = measure(fn)
+                row = {
+                    "parser": name,
+                    "size_mb": round(mb, 2),
+                    "expected_functions": units * 3,
+                    "functions": count,
+                    "seconds": round(elapsed, 4),
+                    "mb_per_sec": round(mb / elapsed, 2),
+                    "peak_kib": peak // 1024,
+                }
+                results.append(row)
+                print(f"[bench-cpp-scanner] {json.dumps(row)}")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
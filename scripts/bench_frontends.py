@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for trisynk-rs and trisynk-cpp over generated corpora; writes reports/perf/baseline.json.
+
+Each corpus runs with ``--format compact``, which builds the whole IR document,
+and once with ``--format ndjson``, which streams records. The ndjson peak RSS
+shows whether a frontend's own memory stays flat as the input grows.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "frontends"))
+
+from common.jsonstream import JsonStream  # noqa: E402
+
+BASELINE = ROOT / "reports" / "perf" / "baseline.json"
+FORMAT_VERSION = 1
+
+RUST_UNIT = """// generated unit {idx}: line comments, doc comments, nested block comments
+/// Docs that mention fn decoy_{idx}() must not produce a function.
+/* outer /* nested: fn hidden_{idx}() {{}} */ still a comment */
+pub struct Counter{idx} {{
+    count: u32,
+}}
+
+pub fn add_{idx}(a: i32, b: i32) -> i32 {{
+    a + b
+}}
+
+pub fn generic_{idx}<T: Clone + std::fmt::Debug, U>(
+    value: &T,
+    times: U,
+) -> Vec<T>
+where
+    U: Into<usize>,
+{{
+    let decoy = "fn fake_{idx}() {{ }}";
+    println!("{{:?}} {{}}", value, decoy);
+    vec![value.clone(); times.into()]
+}}
+
+impl Counter{idx} {{
+    fn bump_{idx}(&mut self, by: u32) {{
+        self.count += by;
+    }}
+}}
+
+"""
+
+CPP_UNIT = """// generated unit {idx}: line comments, block comments, strings and templates
+/* block comment with a decoy: int decoy_{idx}(int x); */
+template <typename T, typename U = std::vector<int>>
+static inline std::map<T, U>
+multi_{idx}(const T& a,
+           U b) noexcept {{
+    const char* s = "{{ int fake_{idx}(); }}";
+    // std::cout << "not io here";
+    return {{}};
+}}
+
+inline double mul_{idx}(double a, double b) {{ return a * b; }}
+
+int decl_{idx}(int value);
+
+namespace unit_{idx} {{
+void report(const std::string& text) {{
+    std::cout << text << std::endl;
+}}
+}}
+
+"""
+
+FRONTENDS = {
+    "trisynk-rs": (ROOT / "frontends" / "trisynk-rs" / "frontend.py", ".rs", RUST_UNIT, 3),
+    "trisynk-cpp": (ROOT / "frontends" / "trisynk-cpp" / "frontend.py", ".cpp", CPP_UNIT, 4),
+}
+
+
+def frontend_version(script: Path) -> str:
+    spec = importlib.util.spec_from_file_location(f"bench_{script.parent.name.replace('-', '_')}", script)
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, str(script.parent))
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(script.parent))
+    return module.VERSION
+
+
+def generate(path: Path, unit: str, target_lines: int) -> tuple[int, int]:
+    """Write whole units until ``target_lines`` is reached; return (lines, units)."""
+    per_unit = unit.count("\n")
+    units = max(1, -(-target_lines // per_unit))
+    with path.open("w", encoding="utf-8") as fh:
+        for idx in range(units):
+            fh.write(unit.format(idx=idx))
+    return units * per_unit, units
+
+
+def count_functions(path: Path) -> int:
+    """Count IR functions without materialising the document.
+
+    The benchmark's own heap must stay small: a forked child's ``ru_maxrss``
+    starts from the parent's high-water mark, which would mask the frontend's.
+    """
+    count = 0
+    with path.open(encoding="utf-8") as fh:
+        reader = JsonStream(fh)
+        for key in reader.iter_object():
+            if key != "functions":
+                reader.skip_value()
+                continue
+            for _ in reader.iter_array():
+                reader.skip_value()
+                count += 1
+    return count
+
+
+def run_once(script: Path, source: Path, output: Path, fmt: str = "compact") -> tuple[float, int]:
+    """Run one uncached frontend invocation end to end; return (seconds, peak RSS KiB from wait4)."""
+    command = [sys.executable, str(script), str(source), "--output", str(output), "--format", fmt, "--no-cache"]
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    stderr = proc.stderr.read().decode("utf-8", errors="replace")
+    proc.stderr.close()
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise SystemExit(f"[bench-frontends] {script.parent.name} failed on {source.name}:\n{stderr}")
+    return elapsed, usage.ru_maxrss
+
+
+def bench(name: str, lines: list[int], repeat: int, workdir: Path) -> dict:
+    script, suffix, unit, per_unit = FRONTENDS[name]
+    runs = []
+    for target in lines:
+        source = workdir / f"corpus_{target}{suffix}"
+        output = workdir / f"corpus_{target}.ir.json"
+        line_count, units = generate(source, unit, target)
+        timings = [run_once(script, source, output) for _ in range(repeat)]
+        seconds = min(t[0] for t in timings)
+        functions = count_functions(output)
+        stream_seconds, stream_rss = run_once(script, source, output.with_suffix(".ndjson"), "ndjson")
+        output.with_suffix(".ndjson").unlink()
+        if functions != units * per_unit:
+            raise SystemExit(f"[bench-frontends] {name}: expected {units * per_unit} functions, got {functions}")
+        row = {
+            "lines": line_count,
+            "source_bytes": source.stat().st_size,
+            "functions": functions,
+            "seconds": round(seconds, 4),
+            "lines_per_sec": round(line_count / seconds),
+            "functions_per_sec": round(functions / seconds),
+            "peak_rss_kib": max(t[1] for t in timings),
+            "ndjson_seconds": round(stream_seconds, 4),
+            "ndjson_peak_rss_kib": stream_rss,
+            "output_bytes": output.stat().st_size,
+        }
+        runs.append(row)
+        print(f"[bench-frontends] {name} {json.dumps(row)}")
+        source.unlink()
+        output.unlink()
+    return {"version": frontend_version(script), "repeat": repeat, "runs": runs}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--frontend", choices=sorted(FRONTENDS), action="append", help="Limit to one frontend (repeatable)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per corpus; the fastest is reported")
+    parser.add_argument("--output", type=Path, default=BASELINE)
+    args = parser.parse_args()
+
+    results = json.loads(args.output.read_text(encoding="utf-8")) if args.output.exists() else {}
+    if results.get("format") != FORMAT_VERSION:
+        results = {"format": FORMAT_VERSION, "frontends": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.frontend or sorted(FRONTENDS):
+            results["frontends"][name] = bench(name, sorted(args.lines), args.repeat, Path(tmp))
+    results["generated"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    results["host"] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(f"[bench-frontends] wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
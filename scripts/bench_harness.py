@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Repeated-run latency harness: warmup, N measured runs, robust summary and bootstrap regression test."""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE_PATH = ROOT / "reports" / "perf" / "smoke_baseline.json"
+RESAMPLES = 2000
+CONFIDENCE = 0.95
+
+
+def measure(command: Sequence[str], warmup: int = 2, runs: int = 10) -> list[float]:
+    """Run ``command`` ``warmup`` times unrecorded, then return ``runs`` wall-clock samples in ms."""
+    samples = []
+    for index in range(warmup + runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=False)
+        elapsed = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            sys.stderr.write(result.stderr.decode("utf-8", errors="replace"))
+            raise SystemExit(f"[bench] {command[0]} exited with {result.returncode}")
+        if index >= warmup:
+            samples.append(round(elapsed, 3))
+    return samples
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of an already sorted sequence."""
+    position = (len(ordered) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def _interval(estimates: list[float]) -> list[float]:
+    estimates.sort()
+    tail = (1 - CONFIDENCE) / 2
+    return [round(percentile(estimates, tail), 3), round(percentile(estimates, 1 - tail), 3)]
+
+
+def summarize(samples: Sequence[float], seed: int = 0) -> dict:
+    """min/median/mean/p95/stdev plus a bootstrap confidence interval for the median."""
+    ordered = sorted(samples)
+    rng = random.Random(seed)
+    medians = [statistics.median(rng.choices(ordered, k=len(ordered))) for _ in range(RESAMPLES)]
+    return {
+        "runs": len(ordered),
+        "min_ms": ordered[0],
+        "median_ms": round(statistics.median(ordered), 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p95_ms": round(percentile(ordered, 0.95), 3),
+        "stdev_ms": round(statistics.stdev(ordered), 3) if len(ordered) > 1 else 0.0,
+        "median_ci_ms": _interval(medians),
+    }
+
+
+def compare(current: Sequence[float], baseline: Sequence[float], seed: int = 0) -> dict:
+    """Bootstrap the relative change of the median (percent) between two sample sets.
+
+    ``delta_ci_pct`` is the confidence interval of that change; a regression is
+    only real when the whole interval sits above the allowed delta.
+    """
+    rng = random.Random(seed)
+    deltas = []
+    for _ in range(RESAMPLES):
+        now = statistics.median(rng.choices(current, k=len(current)))
+        before = statistics.median(rng.choices(baseline, k=len(baseline)))
+        deltas.append((now - before) / before * 100)
+    point = (statistics.median(current) - statistics.median(baseline)) / statistics.median(baseline) * 100
+    return {"delta_pct": round(point, 3), "delta_ci_pct": _interval(deltas)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("command", nargs="+", help="Command to benchmark (put it after --)")
+    parser.add_argument("--warmup", type=int, default=2, help="Unrecorded runs before measuring")
+    parser.add_argument("--runs", type=int, default=10, help="Measured runs")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Stored baseline distribution to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these samples as the new baseline")
+    parser.add_argument("--output", type=Path, help="Write samples, summary and comparison here (default: stdout)")
+    args = parser.parse_args()
+    if args.runs < 2:
+        parser.error("--runs must be at least 2 for a distribution")
+
+    samples = measure(args.command, args.warmup, args.runs)
+    result = {"command": args.command, "warmup": args.warmup, "samples_ms": samples, **summarize(samples)}
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"[bench] stored baseline distribution in {args.baseline}", file=sys.stderr)
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        result["baseline"] = str(args.baseline.relative_to(ROOT) if args.baseline.is_relative_to(ROOT) else args.baseline)
+        result.update(compare(samples, baseline["samples_ms"]))
+    else:
+        # Never compare a run against itself: without a stored baseline there is no delta.
+        print(f"[bench] WARNING: no baseline at {args.baseline}, comparison skipped; store one with --save-baseline", file=sys.stderr)
+        result.update(baseline=None, delta_pct=None, delta_ci_pct=None)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    delta = "n/a" if result["delta_pct"] is None else f"{result['delta_pct']}% ci={result['delta_ci_pct']}"
+    print(f"[bench] median={result['median_ms']}ms p95={result['p95_ms']}ms delta={delta}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark the TSIR binary container against JSON IR (size, encode, decode, random access)."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "frontends"))
+
+from common.irpack import IRPack, encode  # noqa: E402
+
+EFFECTS = ([], ["io"], ["io", "alloc"])
+CAPABILITIES = (["borrow", "immut"], ["borrow", "mut"], ["immut"])
+
+
+def synthetic_ir(functions: int) -> dict:
+    """Module shaped like trisynk-rs output: repeated effects/resources/capabilities, unique names and spans."""
+    fns = []
+    offset = 0
+    for i in range(functions):
+        length = 40 + i % 200
+        fns.append(
+            {
+                "name": f"module_{i % 97}::function_{i}",
+                "effects": EFFECTS[i % 3],
+                "resources": {"memory": "affine"},
+                "capabilities": CAPABILITIES[i % 3],
+                "span": {"start_line": i * 5 + 1, "end_line": i * 5 + 4, "start": offset, "end": offset + length},
+            }
+        )
+        offset += length + 1
+    return {
+        "module": "src/generated.rs",
+        "language": "rust",
+        "functions": fns,
+        "abi": {"calling_convention": "trisynk_fastcall", "capabilities": ["borrow", "mut"], "layout_hash": 123456789},
+    }
+
+
+def best_of(repeat: int, fn) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--functions", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Write JSON results here")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.functions:
+            ir = synthetic_ir(count)
+            compact = json.dumps(ir, separators=(",", ":"))
+            pretty = json.dumps(ir, indent=2)
+            packed = encode(ir)
+            if IRPack(packed).to_ir() != ir:
+                raise SystemExit("[bench-irpack] round trip mismatch")
+            json_path = Path(tmp) / f"ir_{count}.json"
+            tsir_path = Path(tmp) / f"ir_{count}.tsir"
+            json_path.write_text(compact, encoding="utf-8")
+            tsir_path.write_bytes(packed)
+            probe = ir["functions"][count // 2]["name"]
+
+            def json_lookup() -> dict:
+                doc = json.loads(json_path.read_text(encoding="utf-8"))
+                return next(fn for fn in doc["functions"] if fn["name"] == probe)
+
+            def tsir_lookup() -> dict:
+                with IRPack.open(tsir_path) as pack:
+                    return pack.find(probe)
+
+            if json_lookup() != tsir_lookup():
+                raise SystemExit("[bench-irpack] random access mismatch")
+            row = {
+                "functions": count,
+                "json_pretty_bytes": len(pretty.encode("utf-8")),
+                "json_compact_bytes": len(compact.encode("utf-8")),
+                "tsir_bytes": len(packed),
+                "size_ratio": round(len(packed) / len(compact.encode("utf-8")), 3),
+                "encode_ms": {
+                    "json": round(best_of(args.repeat, lambda: json.dumps(ir, separators=(",", ":"))) * 1000, 3),
+                    "tsir": round(best_of(args.repeat, lambda: encode(ir)) * 1000, 3),
+                },
+                "decode_ms": {
+                    "json": round(best_of(args.repeat, lambda: json.loads(compact)) * 1000, 3),
+                    "tsir": round(best_of(args.repeat, lambda: IRPack(packed).to_ir()) * 1000, 3),
+                },
+                "lookup_one_ms": {
+                    "json": round(best_of(args.repeat, json_lookup) * 1000, 3),
+                    "tsir_mmap": round(best_of(args.repeat, tsir_lookup) * 1000, 3),
+                },
+            }
+            results.append(row)
+            print(f"[bench-irpack] {json.dumps(row)}")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,27 +6,95 @@ import json
 import sys
 from pathlib import Path
 
+import criterion_ingest
+from bench_harness import BASELINE_PATH, compare
+from memory_metrics import budget_mb
+
 METRICS_PATH = Path("reports/metrics.json")
 TARGET_COVERAGE = 85.0
 MAX_LATENCY_DELTA = 5.0  # percent over baseline
 
 
+def latency_verdict(data: dict) -> tuple[bool, str]:
+    """Fail only when the whole confidence interval of the latency change exceeds the allowed delta.
+
+    Samples recorded by ``bench_harness.py`` are re-compared against the stored
+    baseline distribution; metrics without samples fall back to the point delta.
+    Without a baseline there is nothing to compare, so the gate is skipped with a warning.
+    """
+    samples = data.get("latency", {}).get("samples_ms")
+    if samples and not BASELINE_PATH.exists():
+        print(
+            f"[metrics] WARNING: latency gate skipped, no baseline at {BASELINE_PATH};"
+            " save one with bench_harness.py --save-baseline"
+        )
+        return True, "perf_latency=n/a (no baseline)"
+    if samples:
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+        result = compare(samples, baseline["samples_ms"])
+        low, high = result["delta_ci_pct"]
+        text = f"perf_latency={result['delta_pct']}% (95% CI {low}%..{high}%)"
+        return low <= MAX_LATENCY_DELTA, text
+    if data.get("perf_latency_pct", 100) is None:
+        print("[metrics] WARNING: latency gate skipped, metrics were recorded without a baseline")
+        return True, "perf_latency=n/a (no baseline)"
+    latency = float(data.get("perf_latency_pct", 100))
+    return latency <= MAX_LATENCY_DELTA, f"perf_latency={latency}% (single run)"
+
+
+def criterion_failures() -> list[str]:
+    """Per-benchmark gate for Criterion estimates in ``reports/cargo_metrics.json``.
+
+    Until a baseline is committed the gate is skipped with a warning, so a
+    missing baseline is visible without failing every run.
+    """
+    if not criterion_ingest.CARGO_METRICS.exists():
+        return []
+    benchmarks = json.loads(criterion_ingest.CARGO_METRICS.read_text(encoding="utf-8")).get("benchmarks", {})
+    if not benchmarks:
+        return []
+    if not criterion_ingest.BASELINE_PATH.exists():
+        print(
+            f"[metrics] WARNING: Criterion gate skipped, no baseline at {criterion_ingest.BASELINE_PATH};"
+            " save one with criterion_ingest.py --save-baseline"
+        )
+        return []
+    baseline = json.loads(criterion_ingest.BASELINE_PATH.read_text(encoding="utf-8"))["benchmarks"]
+    return criterion_ingest.regressions(benchmarks, baseline)
+
+
+def memory_failures(data: dict) -> list[str]:
+    """Peak RSS per target against the ``memory_mb`` budget its intent declares today."""
+    failures = []
+    for name, entry in sorted(data.get("memory", {}).items()):
+        budget = budget_mb(entry["intent"]) if entry.get("intent") else None
+        if budget is not None and entry["peak_rss_mb"] > budget:
+            failures.append(f"{name} peak RSS {entry['peak_rss_mb']} MB > {budget:g} MB ({entry['intent']})")
+    return failures
+
+
 def main() -> int:
     if not METRICS_PATH.exists():
         raise SystemExit(f"Missing metrics file: {METRICS_PATH}")
     data = json.loads(METRICS_PATH.read_text(encoding="utf-8"))
     coverage = float(data.get("coverage", 0))
-    latency = float(data.get("perf_latency_pct", 100))
+    latency_ok, latency_text = latency_verdict(data)
     ok = True
     if coverage < TARGET_COVERAGE:
         print(f"[metrics] Coverage {coverage}% < target {TARGET_COVERAGE}%")
         ok = False
-    if latency > MAX_LATENCY_DELTA:
-        print(f"[metrics] Perf latency delta {latency}% > {MAX_LATENCY_DELTA}%")
+    if not latency_ok:
+        print(f"[metrics] Perf regression: {latency_text} > {MAX_LATENCY_DELTA}%")
+        ok = False
+    for failure in criterion_failures():
+        print(f"[metrics] Criterion gate: {failure}")
+        ok = False
+    for failure in memory_failures(data):
+        print(f"[metrics] Memory budget exceeded: {failure}")
         ok = False
     if ok:
         print(
-            f"[metrics] OK – coverage={coverage}%, perf_latency={latency}% (targets: >= {TARGET_COVERAGE}%, <= {MAX_LATENCY_DELTA}%)"
+            f"[metrics] OK – coverage={coverage}%, {latency_text} (targets: >= {TARGET_COVERAGE}%, <= {MAX_LATENCY_DELTA}%)"
         )
         return 0
     return 1
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Build, run and cover every sample in frontends/samples/ concurrently, then merge into one report.
+
+Each ``.cpp`` sample is built with ``clang++ -fprofile-instr-generate
+-fcoverage-mapping`` and each ``.rs`` sample with ``rustc -C
+instrument-coverage``. C++ samples without ``main`` are linked against a stub
+driver so their mappings still count (uninstantiated templates show as
+uncovered). Every binary runs with its own ``LLVM_PROFILE_FILE`` pattern
+(``<sample>-%p-%m.profraw``). When all samples have finished, the profiles of
+each toolchain (clang, rustc) are merged and exported on their own, and the
+per-toolchain exports are aggregated. The report keeps per-file and aggregate
+line, function and region coverage for the sample sources only.
+
+The profile tools must be at least as new as the LLVM inside the compiler whose
+profiles they read, and clang and rustc usually ship different LLVM versions.
+Rust profiles are read with the ``llvm-tools`` component of the active Rust
+toolchain when it is installed, clang profiles with the system LLVM. A
+toolchain whose profiles cannot be merged is skipped with a warning. Override
+both with ``--llvm-profdata``/``--llvm-cov`` or ``LLVM_PROFDATA``/``LLVM_COV``.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLES_DIR = ROOT / "frontends" / "samples"
+WORK_DIR = ROOT / "data" / "outbox" / "coverage"
+REPORT_PATH = WORK_DIR / "coverage.json"
+STUB_MAIN = "int main() { return 0; }\n"
+STUB_NAME = "stub_main.cpp"
+KINDS = ("lines", "functions", "regions")
+TOOLCHAINS = {".cpp": "clang", ".rs": "rust"}
+
+
+def find_tool(name: str, env: str, prefer_rust: bool) -> str | None:
+    """Explicit override, then (for Rust) the toolchain's llvm-tools, then PATH and versioned LLVM installs."""
+    if os.environ.get(env):
+        return os.environ[env]
+    candidates: list[str] = []
+    if prefer_rust and shutil.which("rustc"):
+        sysroot = subprocess.run(["rustc", "--print", "sysroot"], capture_output=True, text=True, check=False)
+        candidates += sorted(glob.glob(f"{sysroot.stdout.strip()}/lib/rustlib/*/bin/{name}"))
+    if shutil.which(name):
+        candidates.append(shutil.which(name))
+    candidates += sorted(glob.glob(f"/usr/bin/{name}-*"), reverse=True)
+    candidates += sorted(glob.glob(f"/usr/lib/llvm-*/bin/{name}"), reverse=True)
+    return next((path for path in candidates if os.access(path, os.X_OK)), None)
+
+
+def build_command(sample: Path, binary: Path, work: Path) -> list[str] | None:
+    if sample.suffix == ".rs":
+        if not shutil.which("rustc"):
+            return None
+        return ["rustc", "-C", "instrument-coverage", "-C", "opt-level=0", str(sample), "-o", str(binary)]
+    clangpp = find_tool("clang++", "CLANGXX", False)
+    if clangpp is None:
+        return None
+    command = [clangpp, "-std=c++20", "-fprofile-instr-generate", "-fcoverage-mapping", str(sample)]
+    if "main(" not in sample.read_text(encoding="utf-8"):
+        command.append(str(work / STUB_NAME))  # written by collect() before the pool starts
+    return [*command, "-o", str(binary)]
+
+
+def cover_sample(sample: Path, work: Path) -> dict:
+    """Compile and run one sample; returns its status, timings, binary and raw profiles."""
+    stem = f"{sample.stem}_{sample.suffix[1:]}"
+    binary = work / f"{stem}_cov"
+    result: dict = {"sample": sample.name, "binary": str(binary), "profiles": []}
+    command = build_command(sample, binary, work)
+    if command is None:
+        tool = "rustc" if sample.suffix == ".rs" else "clang++"
+        return {**result, "status": "skipped", "reason": f"{tool} not found"}
+    for stale in work.glob(f"{stem}-*.profraw"):
+        stale.unlink()
+    started = time.perf_counter()
+    build = subprocess.run(command, cwd=work, capture_output=True, text=True, check=False)
+    result["compile_s"] = round(time.perf_counter() - started, 3)
+    if build.returncode != 0:
+        return {**result, "status": "failed", "reason": build.stderr.strip()[-2000:]}
+    env = {**os.environ, "LLVM_PROFILE_FILE": str(work / f"{stem}-%p-%m.profraw")}
+    started = time.perf_counter()
+    run = subprocess.run([str(binary)], cwd=work, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False)
+    result["run_s"] = round(time.perf_counter() - started, 3)
+    result["exit"] = run.returncode
+    result["profiles"] = sorted(str(path) for path in work.glob(f"{stem}-*.profraw"))
+    if not result["profiles"]:
+        return {**result, "status": "failed", "reason": f"no profile written (exit {run.returncode}) {run.stderr.strip()}"}
+    return {**result, "status": "ok"}
+
+
+def _ratio(covered: int, count: int) -> dict:
+    return {"count": count, "covered": covered, "percent": round(100.0 * covered / count, 2) if count else 0.0}
+
+
+def summarize(export: dict, samples_dir: Path) -> tuple[dict, dict]:
+    """Per-file and aggregate coverage for files under ``samples_dir`` from ``llvm-cov export -summary-only``."""
+    files: dict[str, dict] = {}
+    totals = {kind: [0, 0] for kind in KINDS}
+    root = samples_dir.resolve()
+    for data in export.get("data", []):
+        for entry in data.get("files", []):
+            path = Path(entry["filename"]).resolve()
+            if root not in path.parents:
+                continue  # std, system headers and the stub driver
+            summary = entry["summary"]
+            files[str(path.relative_to(ROOT))] = {
+                kind: _ratio(summary[kind]["covered"], summary[kind]["count"]) for kind in KINDS
+            }
+            for kind in KINDS:
+                totals[kind][0] += summary[kind]["covered"]
+                totals[kind][1] += summary[kind]["count"]
+    return files, {kind: _ratio(covered, count) for kind, (covered, count) in totals.items()}
+
+
+def export_toolchain(toolchain: str, covered: list[dict], work: Path) -> tuple[dict | None, str]:
+    """Merge and export one toolchain's profiles with its own LLVM tools; returns ``(export, profdata or reason)``."""
+    rust = toolchain == "rust"
+    profdata = find_tool("llvm-profdata", "LLVM_PROFDATA", rust)
+    llvm_cov = find_tool("llvm-cov", "LLVM_COV", rust)
+    if profdata is None or llvm_cov is None:
+        return None, "llvm-profdata/llvm-cov not found"
+    merged = work / f"merged_{toolchain}.profdata"
+    profiles = [profile for result in covered for profile in result["profiles"]]
+    merge = subprocess.run(
+        [profdata, "merge", "-sparse", *profiles, "-o", str(merged)], capture_output=True, text=True, check=False
+    )
+    if merge.returncode != 0:
+        hint = " (rustup component add llvm-tools)" if rust else ""
+        return None, f"{profdata} could not merge the profiles; it must be at least as new as the compiler's LLVM{hint}: {merge.stderr.strip()[-500:]}"
+    binaries = [result["binary"] for result in covered]
+    objects = [arg for binary in binaries[1:] for arg in ("-object", binary)]
+    export = subprocess.run(
+        [llvm_cov, "export", "-summary-only", f"-instr-profile={merged}", binaries[0], *objects],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if export.returncode != 0:
+        return None, f"{llvm_cov} export failed: {export.stderr.strip()[-500:]}"
+    return json.loads(export.stdout), str(merged)
+
+
+def collect(samples: list[Path], work: Path, jobs: int) -> dict:
+    work.mkdir(parents=True, exist_ok=True)
+    (work / STUB_NAME).write_text(STUB_MAIN, encoding="utf-8")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(lambda sample: cover_sample(sample, work), samples))
+    for result in results:
+        if result["status"] != "ok":
+            print(f"[coverage] {result['status']} {result['sample']}: {result['reason']}", file=sys.stderr)
+    groups: dict[str, list[dict]] = {}
+    for result in results:
+        if result["status"] == "ok":
+            groups.setdefault(TOOLCHAINS[Path(result["sample"]).suffix], []).append(result)
+    if not groups:
+        raise SystemExit("[coverage] no sample produced a profile")
+
+    data: list[dict] = []
+    profdata: dict[str, str] = {}
+    for toolchain, covered in sorted(groups.items()):
+        export, detail = export_toolchain(toolchain, covered, work)
+        if export is None:
+            print(f"[coverage] WARNING: skipping {toolchain} samples: {detail}", file=sys.stderr)
+            for result in covered:
+                result.update(status="skipped", reason=f"{toolchain} profiles not merged: {detail}")
+            continue
+        data += export.get("data", [])
+        profdata[toolchain] = detail
+    if not profdata:
+        raise SystemExit("[coverage] no toolchain's profiles could be merged and exported")
+    files, totals = summarize({"data": data}, SAMPLES_DIR)
+    return {
+        "coverage": totals["lines"]["percent"],
+        "totals": totals,
+        "files": files,
+        "samples": {
+            result["sample"]: {key: result[key] for key in ("status", "compile_s", "run_s", "reason") if key in result}
+            for result in results
+        },
+        "profdata": profdata,
+        "jobs": jobs,
+        "wall_s": round(time.perf_counter() - started, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("samples", nargs="*", type=Path, help="Samples to cover (default: every .cpp/.rs in frontends/samples)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--work-dir", type=Path, default=WORK_DIR)
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    parser.add_argument("--llvm-profdata", help="llvm-profdata to use (env: LLVM_PROFDATA)")
+    parser.add_argument("--llvm-cov", help="llvm-cov to use (env: LLVM_COV)")
+    args = parser.parse_args()
+    if args.llvm_profdata:
+        os.environ["LLVM_PROFDATA"] = args.llvm_profdata
+    if args.llvm_cov:
+        os.environ["LLVM_COV"] = args.llvm_cov
+
+    samples = [path.resolve() for path in args.samples] or sorted(
+        path for path in SAMPLES_DIR.iterdir() if path.suffix in (".cpp", ".rs")
+    )
+    report = collect(samples, args.work_dir.resolve(), max(1, args.jobs))
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    for name, summary in sorted(report["files"].items()):
+        print(f"[coverage] {name}: lines={summary['lines']['percent']}% functions={summary['functions']['percent']}%")
+    totals = report["totals"]
+    print(
+        f"[coverage] TOTAL lines={totals['lines']['percent']}% functions={totals['functions']['percent']}% "
+        f"regions={totals['regions']['percent']}% ({len(report['files'])} files, wall={report['wall_s']}s, -j {report['jobs']})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Collect Criterion estimates (target/criterion/**/new/estimates.json) into reports/cargo_metrics.json."""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CRITERION_DIR = ROOT / "metrics" / "demo" / "target" / "criterion"
+CARGO_METRICS = ROOT / "reports" / "cargo_metrics.json"
+BASELINE_PATH = ROOT / "reports" / "perf" / "criterion_baseline.json"
+MAX_DELTA = 5.0  # percent, unless a benchmark's baseline sets max_delta_pct
+
+
+def _estimate(estimates: dict, key: str) -> tuple[float, list[float]] | None:
+    value = estimates.get(key)
+    if not value:
+        return None
+    interval = value["confidence_interval"]
+    return value["point_estimate"], [interval["lower_bound"], interval["upper_bound"]]
+
+
+def _required(estimates: dict, key: str, path: Path) -> tuple[float, list[float]]:
+    value = _estimate(estimates, key)
+    if value is None:
+        raise ValueError(f"{path}: no {key!r} estimate")
+    return value
+
+
+def _throughput(spec: dict | None, mean_ns: float) -> dict | None:
+    """Criterion records ``{"Bytes": n}`` / ``{"Elements": n}`` per iteration; report it per second."""
+    if not spec or mean_ns <= 0:
+        return None
+    kind, amount = next(iter(spec.items()))
+    unit = "bytes" if kind.lower().startswith("bytes") else "elements"
+    return {f"{unit}_per_sec": round(amount / (mean_ns * 1e-9), 3)}
+
+
+def read_benchmark(new_dir: Path) -> tuple[str, dict]:
+    """Summarise one ``<bench>/new`` directory as ``(full_id, metrics)``; times are nanoseconds."""
+    path = new_dir / "estimates.json"
+    estimates = json.loads(path.read_text(encoding="utf-8"))
+    info_path = new_dir / "benchmark.json"
+    info = json.loads(info_path.read_text(encoding="utf-8")) if info_path.exists() else {}
+    name = info.get("full_id") or new_dir.parent.name
+    mean, mean_ci = _required(estimates, "mean", path)
+    median, median_ci = _required(estimates, "median", path)
+    std_dev, _ = _required(estimates, "std_dev", path)
+    metrics = {
+        "mean_ns": mean,
+        "mean_ci_ns": mean_ci,
+        "median_ns": median,
+        "median_ci_ns": median_ci,
+        "std_dev_ns": std_dev,
+        "throughput": _throughput(info.get("throughput"), mean),
+    }
+    change_path = new_dir.parent / "change" / "estimates.json"
+    if change_path.exists():
+        change = _estimate(json.loads(change_path.read_text(encoding="utf-8")), "mean")
+        if change is not None:
+            metrics["change_vs_previous_pct"] = round(change[0] * 100, 3)
+    return name, metrics
+
+
+def collect(criterion_dir: Path = CRITERION_DIR) -> dict[str, dict]:
+    if not criterion_dir.is_dir():
+        return {}
+    found = (read_benchmark(path.parent) for path in criterion_dir.rglob("new/estimates.json"))
+    return dict(sorted(found))
+
+
+def regressions(benchmarks: dict[str, dict], baseline: dict[str, dict]) -> list[str]:
+    """Benchmarks whose whole mean interval sits more than the allowed delta above the baseline's.
+
+    Comparing the current lower bound with the baseline upper bound keeps the
+    gate quiet unless the two confidence intervals are clearly separated.
+    """
+    failures = []
+    for name, reference in sorted(baseline.items()):
+        current = benchmarks.get(name)
+        if current is None:
+            continue
+        allowed = reference.get("max_delta_pct", MAX_DELTA)
+        upper = reference["mean_ci_ns"][1]
+        delta = (current["mean_ci_ns"][0] - upper) / upper * 100
+        if delta > allowed:
+            failures.append(
+                f"{name}: mean {current['mean_ns']:.1f}ns, CI lower bound {delta:.2f}% above baseline "
+                f"upper bound {upper:.1f}ns (allowed {allowed}%)"
+            )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--criterion-dir", type=Path, default=CRITERION_DIR)
+    parser.add_argument("--output", type=Path, default=CARGO_METRICS, help="Merged into if it already exists")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Store these estimates in {BASELINE_PATH.name}")
+    args = parser.parse_args()
+
+    try:
+        benchmarks = collect(args.criterion_dir)
+    except ValueError as exc:
+        raise SystemExit(f"[criterion] {exc}")
+    if not benchmarks:
+        print(f"[criterion] no estimates under {args.criterion_dir}")
+        return 0
+    report = json.loads(args.output.read_text(encoding="utf-8")) if args.output.exists() else {}
+    report["benchmarks"] = benchmarks
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.save_baseline:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps({"benchmarks": benchmarks}, indent=2) + "\n", encoding="utf-8")
+        print(f"[criterion] stored baseline in {BASELINE_PATH}")
+    elif not BASELINE_PATH.exists():
+        print(f"[criterion] no baseline at {BASELINE_PATH}; check_metrics.py skips the gate until one is saved with --save-baseline")
+    for name, metrics in benchmarks.items():
+        print(f"[criterion] {name} mean={metrics['mean_ns']:.1f}ns median={metrics['median_ns']:.1f}ns")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
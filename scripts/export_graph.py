@@ -1,9 +1,24 @@
 #!/usr/bin/env python3
-"""Export issue + intent graph for automation."""
+"""Export issue + intent graph for automation.
+
+Parsed records are cached in ``data/cache/export_graph/manifest.json`` together
+with each source's SHA-256. A file is re-read only when its (mtime, size)
+changed, and re-parsed only when its digest did. Intents are loaded with
+libyaml's ``CSafeLoader`` when PyYAML was built with it. Issues come from
+``docs/issues.md`` and any ``docs/issues/*.md`` shards (see ``issue_store.py``).
+Each shard is its own cached source, so editing one shard re-parses only that
+shard. When at least ``POOL_THRESHOLD`` sources need parsing (a cold run), they
+are parsed across a process pool. The output is assembled from the records in
+source order, so it is byte-identical to ``--no-cache``. Sharding the monolith
+in document order changes only ``source.issues``, which lists both locations
+while the monolith and shards are mixed.
+"""
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import re
 import sys
 from pathlib import Path
@@ -13,25 +28,24 @@ try:
 except ModuleNotFoundError as exc:  # pragma: no cover
     raise SystemExit("PyYAML is required: pip install pyyaml") from exc
 
-ISSUE_MD = Path("docs/issues.md")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "frontends"))
+
+from common import tracing  # noqa: E402
+from issue_graph import IssueGraph  # noqa: E402
+from issue_store import ISSUE_MD, SHARD_DIR, extract_sections, issue_sources, map_sources  # noqa: E402
+
 INTENT_DIR = Path("intents")
+MANIFEST_PATH = Path("data/cache/export_graph/manifest.json")
+MANIFEST_FORMAT = 1  # bump when the record shape below changes
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 DOC_REF_RE = re.compile(r"([A-Za-z0-9_./-]+\.md#[A-Za-z0-9_./-]+)")
 ISSUE_LINK_RE = re.compile(r"ISS-\d+")
 
 
-def extract_sections(text: str):
-    header_re = re.compile(r"^##\s+(ISS-\d+)\s+\u2013\s+(.+)$", re.MULTILINE)
-    matches = list(header_re.finditer(text))
-    for idx, match in enumerate(matches):
-        start = match.start()
-        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
-        yield match.group(1), match.group(2).strip(), text[start:end].strip()
-
-
-def parse_issues() -> list[dict]:
-    raw = ISSUE_MD.read_text(encoding="utf-8")
+def parse_issues(raw: str) -> list[dict]:
     issues: list[dict] = []
-    for issue_id, title, body in extract_sections(raw):
+    for issue_id, title, start, end in extract_sections(raw):
+        title, body = title.strip(), raw[start:end].strip()
         references = sorted(set(DOC_REF_RE.findall(body)))
         deps = sorted({match for match in ISSUE_LINK_RE.findall(body) if match != issue_id})
         issues.append(
@@ -46,45 +60,128 @@ def parse_issues() -> list[dict]:
     return issues
 
 
-def parse_intents() -> list[dict]:
-    intents: list[dict] = []
-    for path in sorted(INTENT_DIR.glob("*.yaml")):
-        data = yaml.safe_load(path.read_text(encoding="utf-8"))
-        meta = data.get("meta", {})
-        intents.append(
-            {
-                "file": str(path),
-                "meta": meta,
-                "issue": meta.get("issue"),
-                "docs": meta.get("docs", []),
-                "state": meta.get("state", "open"),
-                "requirements": data.get("requirements", {}),
-                "constraints": data.get("constraints", {}),
-                "interop": data.get("interop", {}),
-            }
-        )
-    return intents
+def parse_intent(path: str, raw: bytes) -> dict:
+    with tracing.span("yaml.load", file=path):
+        data = yaml.load(raw.decode("utf-8"), Loader=YAML_LOADER)
+    meta = data.get("meta", {})
+    return {
+        "file": path,
+        "meta": meta,
+        "issue": meta.get("issue"),
+        "docs": meta.get("docs", []),
+        "state": meta.get("state", "open"),
+        "requirements": data.get("requirements", {}),
+        "constraints": data.get("constraints", {}),
+        "interop": data.get("interop", {}),
+    }
+
+
+def parse_source(item: tuple[str, bytes]) -> list[dict] | dict:
+    """Issue list of a Markdown source, or the record of an intent."""
+    path, raw = item
+    if path.endswith(".md"):
+        with tracing.span("parse_issues", file=path):
+            return parse_issues(raw.decode("utf-8"))
+    return parse_intent(path, raw)
+
+
+class Manifest:
+    """Per-source stat, digest and parsed record from the previous export."""
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        if path is not None and path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("format") == MANIFEST_FORMAT and data.get("loader") == YAML_LOADER.__name__:
+                self.entries = data["entries"]
+        self.parsed = 0
+
+    def lookup(self, path: Path) -> tuple[object | None, dict]:
+        """Cached record for ``path`` if its content is unchanged; otherwise ``None`` plus the new entry to fill."""
+        stat = path.stat()
+        entry = self.entries.get(str(path))
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["record"], entry
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        fresh = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest, "raw": raw}
+        if entry and entry["sha256"] == digest:
+            fresh["record"] = entry["record"]  # touched but identical
+            return entry["record"], fresh
+        return None, fresh
+
+    def store(self, entries: dict[str, dict]) -> None:
+        self.entries = {name: {key: value for key, value in entry.items() if key != "raw"} for name, entry in entries.items()}
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        data = {"format": MANIFEST_FORMAT, "loader": YAML_LOADER.__name__, "entries": self.entries}
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def load_sources(manifest: Manifest, jobs: int) -> tuple[list[dict], list[dict]]:
+    entries: dict[str, dict] = {}
+    issue_paths = issue_sources()
+    intent_paths = sorted(INTENT_DIR.glob("*.yaml"))
+    stale: list[tuple[str, bytes]] = []
+    for path in (*issue_paths, *intent_paths):
+        record, entry = manifest.lookup(path)
+        entries[str(path)] = entry
+        if record is None:
+            stale.append((str(path), entry["raw"]))
+    with tracing.span("parse_sources", changed=len(stale), total=len(entries)):
+        parsed = map_sources(parse_source, stale, jobs)
+    for (path, _), record in zip(stale, parsed):
+        entries[path]["record"] = record
+    manifest.parsed += len(parsed)
+    manifest.store(entries)
+    issues = [issue for path in issue_paths for issue in entries[str(path)]["record"]]
+    return issues, [entries[str(path)]["record"] for path in intent_paths]
+
+
+def issue_source_label() -> str | list[str]:
+    """``docs/issues.md`` or ``docs/issues``, or both in read order when the monolith and shards are mixed."""
+    labels = [str(ISSUE_MD)] if ISSUE_MD.exists() else []
+    if any(SHARD_DIR.glob("*.md")):
+        labels.append(str(SHARD_DIR))
+    return labels[0] if len(labels) == 1 else labels
 
 
-def export_graph(dest: Path) -> None:
+def export_graph(dest: Path, manifest_path: Path | None = MANIFEST_PATH, jobs: int = 0) -> None:
+    manifest = Manifest(manifest_path)
+    issues, intents = load_sources(manifest, jobs or os.cpu_count() or 1)
+    with tracing.span("issue_graph"):
+        graph = IssueGraph.build(issues, intents)
     payload = {
-        "issues": parse_issues(),
-        "intents": parse_intents(),
+        "issues": issues,
+        "intents": intents,
+        "graph": graph.to_json(),
         "source": {
-            "issues": str(ISSUE_MD),
+            "issues": issue_source_label(),
             "intents": str(INTENT_DIR),
         },
     }
     dest.parent.mkdir(parents=True, exist_ok=True)
-    dest.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"[export-graph] wrote {dest}")
+    with tracing.span("write", file=str(dest)):
+        dest.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"[export-graph] wrote {dest} (parsed {manifest.parsed}/{len(manifest.entries)} sources)")
+    for cycle in graph.cycles():
+        print(f"[export-graph] warning: dependency cycle {' -> '.join(cycle)}")
+    for issue_id, missing in sorted(graph.dangling.items()):
+        print(f"[export-graph] warning: {issue_id} depends on unknown {', '.join(missing)}")
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
     parser.add_argument("--output", default="data/outbox/issues_intents.json")
+    parser.add_argument("--manifest", type=Path, default=MANIFEST_PATH, help="Digest/record cache for incremental runs")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every source and leave the manifest untouched")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker processes for cold runs (default: CPU count)")
     args = parser.parse_args()
-    export_graph(Path(args.output))
+    export_graph(Path(args.output), None if args.no_cache else args.manifest, args.jobs)
     return 0
 
 
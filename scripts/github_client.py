@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""Shared GitHub REST/GraphQL client: keep-alive pooling, bounded concurrency, retries and rate-limit pacing.
+
+Connections are plain ``http.client`` connections kept alive per origin and
+reused by whichever worker thread needs one. ``GitHubClient.map`` runs calls
+on at most ``max_workers`` threads.
+
+Retries:
+
+* 429, and 403 responses that carry ``Retry-After``, a "secondary rate limit"
+  message or ``X-RateLimit-Remaining: 0``, wait for ``Retry-After`` or the
+  ``X-RateLimit-Reset`` time, then retry.
+* Any method is retried after a rate limit, since GitHub did not act on the
+  request.
+* 5xx responses and dropped connections back off exponentially with jitter.
+  These are retried only for idempotent calls (everything except POST, unless
+  the caller says otherwise). A repeated issue POST could create a duplicate.
+* The exception: a pooled keep-alive connection that the server has already
+  idle-closed fails with a reset or broken pipe before any response arrives.
+  Such a call is resent once, on a new connection, whatever its method.
+
+Pacing: each response updates the remaining-quota view. Once fewer than
+``PACE_BELOW`` requests remain, calls are spread evenly over the time left
+until the reset. At ``reserve`` or fewer, calls wait for the reset.
+
+``GITHUB_API_URL`` (set by GitHub Actions) overrides the API root, so the
+sync scripts can be pointed at a local stand-in server.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, TypeVar
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "frontends"))
+
+from common import tracing  # noqa: E402
+
+GITHUB_API = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+API_VERSION = "2022-11-28"
+PACE_BELOW = 100
+BACKOFF_BASE_S = 1.0
+BACKOFF_CAP_S = 60.0
+MAX_RATE_LIMIT_WAIT_S = 900.0
+PAGE_RE = re.compile(r"([?&]page=)(\d+)")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class GitHubError(RuntimeError):
+    def __init__(self, status: int, method: str, url: str, body: str) -> None:
+        super().__init__(f"GitHub API error {status} on {method} {url}: {body}")
+        self.status = status
+        self.body = body
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict[str, str]
+    data: Any
+    links: dict[str, str] = field(default_factory=dict)
+
+
+def _parse_links(header: str | None) -> dict[str, str]:
+    """``Link: <url>; rel="next", <url>; rel="last"`` -> ``{"next": url, "last": url}``."""
+    links = {}
+    for part in (header or "").split(","):
+        if ";" not in part:
+            continue
+        target, *params = part.split(";")
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "rel":
+                links[value.strip('"')] = target.strip().strip("<>")
+    return links
+
+
+class GitHubClient:
+    def __init__(
+        self,
+        token: str = "",
+        base_url: str = GITHUB_API,
+        max_workers: int = 4,
+        max_retries: int = 5,
+        timeout: float = 30.0,
+        reserve: int | None = None,
+    ) -> None:
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.reserve = self.max_workers if reserve is None else reserve
+        self._pools: dict[tuple[str, str, int | None], queue.LifoQueue] = {}
+        self._pools_lock = threading.Lock()
+        self._pace_lock = threading.Lock()
+        self._next_slot = 0.0
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "not_modified": 0, "retries": 0, "connections": 0, "rate_limit_waits": 0}
+
+    def _count(self, name: str) -> None:
+        # Requests run on map() worker threads; += on a shared dict entry is not atomic.
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    # -- connections -------------------------------------------------------
+    def _origin(self, url: str) -> tuple[tuple[str, str, int | None], str]:
+        parts = urlsplit(url if "://" in url else self.base_url + url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        return (parts.scheme, parts.hostname or "", parts.port), target
+
+    def _acquire(self, origin: tuple[str, str, int | None], fresh: bool = False) -> http.client.HTTPConnection:
+        with self._pools_lock:
+            pool = self._pools.setdefault(origin, queue.LifoQueue())
+        try:
+            if fresh:
+                raise queue.Empty
+            return pool.get_nowait()
+        except queue.Empty:
+            scheme, host, port = origin
+            factory = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            self._count("connections")
+            return factory(host, port, timeout=self.timeout)
+
+    def _release(self, origin: tuple[str, str, int | None], conn: http.client.HTTPConnection) -> None:
+        self._pools[origin].put(conn)
+
+    def close(self) -> None:
+        with self._pools_lock:
+            for pool in self._pools.values():
+                while not pool.empty():
+                    pool.get_nowait().close()
+            self._pools.clear()
+
+    def __enter__(self) -> GitHubClient:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- pacing ------------------------------------------------------------
+    def _record_limits(self, headers: dict[str, str]) -> None:
+        if "x-ratelimit-remaining" in headers and "x-ratelimit-reset" in headers:
+            with self._pace_lock:
+                self.remaining = int(headers["x-ratelimit-remaining"])
+                self.reset_at = float(headers["x-ratelimit-reset"])
+
+    def _pace(self) -> None:
+        with self._pace_lock:
+            now = time.time()
+            if self.remaining is None or self.reset_at is None or self.reset_at <= now:
+                return
+            if self.remaining <= self.reserve:
+                slot = self.reset_at + 1
+                self._count("rate_limit_waits")
+            elif self.remaining < PACE_BELOW:
+                slot = max(now, self._next_slot) + (self.reset_at - now) / self.remaining
+            else:
+                return
+            self._next_slot = slot
+            self.remaining -= 1
+        time.sleep(min(max(0.0, slot - time.time()), MAX_RATE_LIMIT_WAIT_S))
+
+    def _retry_delay(self, status: int, headers: dict[str, str], body: str, attempt: int) -> float | None:
+        """Seconds to wait before retrying, or ``None`` when the response is final."""
+        if status in (403, 429):
+            limited = (
+                status == 429
+                or "retry-after" in headers
+                or headers.get("x-ratelimit-remaining") == "0"
+                or "secondary rate limit" in body.lower()
+            )
+            if not limited:
+                return None
+            if "retry-after" in headers:
+                return float(headers["retry-after"])
+            if headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in headers:
+                return min(MAX_RATE_LIMIT_WAIT_S, max(1.0, float(headers["x-ratelimit-reset"]) - time.time() + 1))
+            return self._backoff(attempt)
+        return None
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return min(BACKOFF_CAP_S, BACKOFF_BASE_S * 2**attempt) * random.uniform(0.5, 1.0)
+
+    # -- requests ----------------------------------------------------------
+    def request(
+        self,
+        method: str,
+        url: str,
+        payload: Any = None,
+        headers: dict[str, str] | None = None,
+        idempotent: bool | None = None,
+    ) -> Response:
+        """One API call with pooling, pacing and retries; ``url`` is absolute or relative to ``base_url``."""
+        origin, target = self._origin(url)
+        idempotent = method != "POST" if idempotent is None else idempotent
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        send_headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": API_VERSION,
+            "User-Agent": "trisynk-sync",
+            **({"Authorization": f"Bearer {self.token}"} if self.token else {}),
+            **({"Content-Type": "application/json"} if body is not None else {}),
+            **(headers or {}),
+        }
+        attempt = 0
+        refreshed = False
+        while True:
+            self._pace()
+            conn = self._acquire(origin, fresh=refreshed)
+            reused = conn.sock is not None
+            responded = False
+            try:
+                with tracing.span("http", cat="github", method=method, url=url, attempt=attempt):
+                    conn.request(method, target, body=body, headers=send_headers)
+                    resp = conn.getresponse()
+                    responded = True
+                    raw = resp.read()
+            except (http.client.HTTPException, ConnectionError, TimeoutError, OSError) as exc:
+                conn.close()
+                if reused and not responded and not refreshed and isinstance(exc, ConnectionError):
+                    # The server dropped an idle keep-alive connection, so it never saw the request.
+                    self._count("retries")
+                    refreshed = True
+                    continue
+                if not idempotent or attempt >= self.max_retries:
+                    raise GitHubError(0, method, url, f"connection failed: {exc}") from exc
+                self._count("retries")
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            self._count("requests")
+            if resp.status == 304:
+                self._count("not_modified")
+            response_headers = {key.lower(): value for key, value in resp.getheaders()}
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(origin, conn)
+            self._record_limits(response_headers)
+            text = raw.decode("utf-8", errors="replace")
+            if resp.status < 400:
+                data = json.loads(text) if text.strip() else None
+                return Response(resp.status, response_headers, data, _parse_links(response_headers.get("link")))
+            delay = self._retry_delay(resp.status, response_headers, text, attempt)
+            if delay is None and resp.status >= 500 and idempotent:
+                delay = self._backoff(attempt)
+            if delay is None or attempt >= self.max_retries:
+                raise GitHubError(resp.status, method, url, text)
+            self._count("retries")
+            time.sleep(delay)
+            attempt += 1
+
+    def call(self, method: str, url: str, payload: Any = None, **kwargs: Any) -> Any:
+        """``request`` returning only the decoded JSON body."""
+        return self.request(method, url, payload, **kwargs).data
+
+    def paginate(self, url: str, headers: dict[str, str] | None = None) -> tuple[Response, list[Any]]:
+        """The first page's response and all items of a paginated list endpoint.
+
+        ``headers`` (e.g. ``If-None-Match``) apply to the first page only; a 304
+        there returns no items. Later pages are fetched concurrently when ``Link``
+        names the last one.
+        """
+        first = self.request("GET", url, headers=headers)
+        items = list(first.data or [])
+        last = first.links.get("last")
+        if last is None:
+            page = first
+            while "next" in page.links:
+                page = self.request("GET", page.links["next"])
+                items.extend(page.data or [])
+            return first, items
+        match = PAGE_RE.search(last)
+        if match is None:
+            raise GitHubError(0, "GET", last, "rel=last link without a page parameter")
+
+        def fetch(page: int) -> list[Any]:
+            return self.call("GET", PAGE_RE.sub(rf"\g<1>{page}", last)) or []
+
+        pages = range(2, int(match.group(2)) + 1)
+        for chunk in self.map(fetch, pages):
+            items.extend(chunk)
+        return first, items
+
+    def map(self, func: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """``func`` over ``items`` on at most ``max_workers`` threads; results in input order."""
+        items = list(items)
+        if self.max_workers == 1 or len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items)), thread_name_prefix="github") as pool:
+            return list(pool.map(func, items))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("method", choices=("GET", "POST", "PATCH", "PUT", "DELETE"))
+    parser.add_argument("url", help="Absolute URL or path under GITHUB_API_URL, e.g. /rate_limit")
+    parser.add_argument("--data", help="JSON request body")
+    args = parser.parse_args()
+    with GitHubClient(os.environ.get("GITHUB_TOKEN", "")) as client:
+        response = client.request(args.method, args.url, json.loads(args.data) if args.data else None)
+    print(json.dumps(response.data, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
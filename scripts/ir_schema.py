@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""Compiled, parallel validator for frontend IR artifacts."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "frontends"))
+
+from common.irpack import IRPack  # noqa: E402
+
+SCHEMA_PATH = ROOT / "schema" / "frontend_ir.schema.json"
+ANNOTATIONS = {"$schema", "$id", "title", "description", "$comment", "examples", "default"}
+ARTIFACT_SUFFIXES = (".json", ".jsonl", ".ndjson", ".tsir")
+
+# A compiled check returns None when the instance is valid, else "path: message".
+Check = Callable[[Any, str], "str | None"]
+
+TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def _type_name(value: Any) -> str:
+    for name in ("null", "boolean", "integer", "number", "string", "array", "object"):
+        if TYPE_CHECKS[name](value):
+            return name
+    return type(value).__name__
+
+
+def compile_schema(schema: dict | bool) -> Check:
+    """Turn a (draft 2020-12 subset) schema into nested closures, resolving every keyword up front.
+
+    Unsupported keywords raise at compile time so a schema change can never be
+    silently ignored by the validator.
+    """
+    if schema is True or schema == {}:
+        return lambda value, path: None
+    if schema is False:
+        return lambda value, path: f"{path}: no value is allowed here"
+    unknown = set(schema) - ANNOTATIONS - COMPILERS.keys()
+    if unknown:
+        raise ValueError(f"Unsupported schema keywords: {sorted(unknown)}")
+    checks = [COMPILERS[key](schema[key], schema) for key in schema if key in COMPILERS]
+    checks = [check for check in checks if check is not None]
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value: Any, path: str) -> str | None:
+        for check in checks:
+            error = check(value, path)
+            if error is not None:
+                return error
+        return None
+
+    return check_all
+
+
+def _compile_type(spec: str | list[str], schema: dict) -> Check:
+    names = [spec] if isinstance(spec, str) else list(spec)
+    tests = tuple(TYPE_CHECKS[name] for name in names)
+    expected = " or ".join(names)
+
+    def check(value: Any, path: str) -> str | None:
+        for test in tests:
+            if test(value):
+                return None
+        return f"{path}: expected {expected}, got {_type_name(value)}"
+
+    return check
+
+
+def _compile_enum(options: list, schema: dict) -> Check:
+    allowed = [json.dumps(option, sort_keys=True) for option in options]
+    hashable = all(not isinstance(option, (dict, list)) for option in options)
+    fast = {(type(option), option) for option in options} if hashable else None
+
+    def check(value: Any, path: str) -> str | None:
+        if fast is not None and not isinstance(value, (dict, list)):
+            if (type(value), value) in fast:
+                return None
+        elif json.dumps(value, sort_keys=True) in allowed:
+            return None
+        return f"{path}: {value!r} is not one of {options}"
+
+    return check
+
+
+def _compile_const(const: Any, schema: dict) -> Check:
+    return _compile_enum([const], schema)
+
+
+def _compile_required(keys: list[str], schema: dict) -> Check:
+    keys = tuple(keys)
+
+    def check(value: Any, path: str) -> str | None:
+        if isinstance(value, dict):
+            for key in keys:
+                if key not in value:
+                    return f"{path}: missing required property {key!r}"
+        return None
+
+    return check
+
+
+def _compile_properties(properties: dict, schema: dict) -> Check:
+    compiled = {key: compile_schema(sub) for key, sub in properties.items()}
+    extra_spec = schema.get("additionalProperties", True)
+    extra = None if extra_spec is True else compile_schema(extra_spec)
+
+    def check(value: Any, path: str) -> str | None:
+        if not isinstance(value, dict):
+            return None
+        for key, item in value.items():
+            sub = compiled.get(key, extra)
+            if sub is not None:
+                error = sub(item, f"{path}.{key}")
+                if error is not None:
+                    return error
+        return None
+
+    return check
+
+
+def _compile_additional(spec: dict | bool, schema: dict) -> Check | None:
+    if "properties" in schema or spec is True:
+        return None  # folded into _compile_properties
+    return _compile_properties({}, schema)
+
+
+def _compile_items(spec: dict | bool, schema: dict) -> Check:
+    item_check = compile_schema(spec)
+
+    def check(value: Any, path: str) -> str | None:
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                error = item_check(item, f"{path}[{index}]")
+                if error is not None:
+                    return error
+        return None
+
+    return check
+
+
+def _compile_bound(keyword: str, size: Callable[[Any], int | None], compare: Callable[[int, int], bool], text: str):
+    def compiler(limit: int, schema: dict) -> Check:
+        def check(value: Any, path: str) -> str | None:
+            measured = size(value)
+            if measured is not None and not compare(measured, limit):
+                return f"{path}: {text} {limit} ({keyword})"
+            return None
+
+        return check
+
+    return compiler
+
+
+def _len_of(kind: type) -> Callable[[Any], int | None]:
+    return lambda value: len(value) if isinstance(value, kind) else None
+
+
+def _number(value: Any) -> Any:
+    return value if TYPE_CHECKS["number"](value) else None
+
+
+COMPILERS: dict[str, Callable[[Any, dict], Check | None]] = {
+    "type": _compile_type,
+    "enum": _compile_enum,
+    "const": _compile_const,
+    "required": _compile_required,
+    "properties": _compile_properties,
+    "additionalProperties": _compile_additional,
+    "items": _compile_items,
+    "minItems": _compile_bound("minItems", _len_of(list), lambda n, k: n >= k, "expected at least"),
+    "maxItems": _compile_bound("maxItems", _len_of(list), lambda n, k: n <= k, "expected at most"),
+    "minLength": _compile_bound("minLength", _len_of(str), lambda n, k: n >= k, "expected length at least"),
+    "maxLength": _compile_bound("maxLength", _len_of(str), lambda n, k: n <= k, "expected length at most"),
+    "minimum": _compile_bound("minimum", _number, lambda n, k: n >= k, "expected at least"),
+    "maximum": _compile_bound("maximum", _number, lambda n, k: n <= k, "expected at most"),
+}
+
+
+def load_validator(path: Path = SCHEMA_PATH) -> Check:
+    return compile_schema(json.loads(path.read_text(encoding="utf-8")))
+
+
+def iter_documents(path: Path) -> Iterator[tuple[str, Any]]:
+    """Yield ``(label, document)`` pairs from JSON, JSON Lines, NDJSON IR records or a TSIR container."""
+    if path.suffix == ".tsir":
+        with IRPack.open(path) as pack:
+            yield str(path), pack.to_ir()
+        return
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        yield str(path), json.loads(text)
+        return
+    module: dict | None = None
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        kind = item.pop("record", None) if isinstance(item, dict) else None
+        if kind is None:
+            yield f"{path}:{number}", item
+        elif kind == "module":
+            module = {**item, "functions": []}
+        elif module is None:
+            raise ValueError(f"{path}:{number}: {kind!r} record before module header")
+        elif kind == "function":
+            module["functions"].append(item)
+        elif kind == "abi":
+            module["abi"] = item
+            yield f"{path}:{number}", module
+            module = None
+    if module is not None:
+        raise ValueError(f"{path}: truncated IR stream (missing abi record)")
+
+
+_VALIDATOR: Check | None = None
+
+
+def _init_worker(schema_path: str) -> None:
+    global _VALIDATOR
+    _VALIDATOR = load_validator(Path(schema_path))
+
+
+def validate_file(path: Path) -> dict:
+    """Worker entry point; uses the validator compiled once per process."""
+    start = time.perf_counter()
+    error = None
+    documents = 0
+    try:
+        for label, document in iter_documents(path):
+            documents += 1
+            error = _VALIDATOR(document, "$")
+            if error is not None:
+                error = f"{label}: {error}"
+                break
+    except (OSError, ValueError) as exc:
+        error = str(exc)
+    return {
+        "path": str(path),
+        "ok": error is None,
+        "documents": documents,
+        "error": error,
+        "ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def expand(paths: Iterable[Path]) -> list[Path]:
+    found: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            found.extend(sorted(p for p in path.rglob("*") if p.suffix in ARTIFACT_SUFFIXES and p.is_file()))
+        else:
+            found.append(path)
+    return found
+
+
+def validate_paths(
+    paths: list[Path], jobs: int = 0, keep_going: bool = False, schema_path: Path = SCHEMA_PATH
+) -> dict:
+    """Validate artifacts across a process pool, stopping at the first failure unless ``keep_going``."""
+    start = time.perf_counter()
+    jobs = jobs or os.cpu_count() or 1
+    results: list[dict] = []
+    if jobs == 1 or len(paths) < 2:
+        _init_worker(str(schema_path))
+        for path in paths:
+            results.append(validate_file(path))
+            if not results[-1]["ok"] and not keep_going:
+                break
+    else:
+        chunksize = max(1, min(256, len(paths) // (jobs * 4)))
+        with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(str(schema_path),)) as pool:
+            for result in pool.map(validate_file, paths, chunksize=chunksize):
+                results.append(result)
+                if not result["ok"] and not keep_going:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    break
+    failures = [result for result in results if not result["ok"]]
+    return {
+        "schema": str(schema_path.relative_to(ROOT) if schema_path.is_relative_to(ROOT) else schema_path),
+        "ok": not failures and len(results) == len(paths),
+        "artifacts": len(paths),
+        "validated": len(results),
+        "documents": sum(result["documents"] for result in results),
+        "failures": len(failures),
+        "seconds": round(time.perf_counter() - start, 4),
+        "results": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", type=Path, help="IR files (.json, .jsonl, .ndjson, .tsir) or directories")
+    parser.add_argument("--schema", type=Path, default=SCHEMA_PATH)
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker processes (default: CPU count)")
+    parser.add_argument("--keep-going", action="store_true", help="Report every failure instead of stopping at the first")
+    parser.add_argument("--report", type=Path, help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    paths = expand(args.paths)
+    if not paths:
+        raise SystemExit("[ir-schema] no artifacts found")
+    report = validate_paths(paths, args.jobs, args.keep_going, args.schema)
+    text = json.dumps(report, indent=2)
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    for failure in (result for result in report["results"] if not result["ok"]):
+        print(f"[ir-schema] FAIL {failure['error']}", file=sys.stderr)
+    print(
+        f"[ir-schema] {report['validated']}/{report['artifacts']} artifacts, "
+        f"{report['documents']} documents in {report['seconds']}s",
+        file=sys.stderr,
+    )
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Indexed issue dependency graph: adjacency, reverse adjacency, topological order, cycles.
+
+``export_graph.py`` stores ``IssueGraph.to_json()`` under ``graph`` in
+``issues_intents.json``. Node ``i`` is ``issues[i]``. ``adjacency[i]`` lists the
+issues that ``i`` depends on (its blockers) and ``reverse[i]`` the issues that
+depend on it. ``order`` puts every issue after its blockers, and members of a
+cycle sit next to each other. ``cycles`` lists every strongly connected
+component with more than one issue. ``dangling`` records dependencies on
+issues that do not exist. ``intents`` maps an issue id to indexes into
+``intents``.
+
+Construction, ordering and SCCs are linear in issues plus edges (iterative
+Tarjan). A transitive blocker/dependent query is linear in the part of the
+graph it reaches.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from collections import deque
+from pathlib import Path
+from typing import Any, Iterable
+
+GRAPH_PATH = Path("data/outbox/issues_intents.json")
+
+
+class IssueGraph:
+    def __init__(
+        self,
+        ids: list[str],
+        adjacency: list[list[int]],
+        intents: dict[str, list[int]],
+        dangling: dict[str, list[str]] | None = None,
+    ) -> None:
+        self.ids = ids
+        self.index = {issue_id: position for position, issue_id in enumerate(ids)}
+        self.adjacency = adjacency
+        self.reverse: list[list[int]] = [[] for _ in ids]
+        for node, targets in enumerate(adjacency):
+            for target in targets:
+                self.reverse[target].append(node)
+        self.intents = intents
+        self.dangling = dangling or {}
+        self._components: list[list[int]] | None = None
+        self._order: list[str] | None = None
+        self._cycles: list[list[str]] | None = None
+
+    @classmethod
+    def build(cls, issues: Iterable[dict[str, Any]], intents: Iterable[dict[str, Any]] = ()) -> IssueGraph:
+        issues = list(issues)
+        ids = [issue["id"] for issue in issues]
+        index = {issue_id: position for position, issue_id in enumerate(ids)}
+        adjacency: list[list[int]] = []
+        dangling: dict[str, list[str]] = {}
+        for issue in issues:
+            targets = []
+            for dep in issue.get("dependencies", []):
+                if dep in index:
+                    targets.append(index[dep])
+                else:
+                    dangling.setdefault(issue["id"], []).append(dep)
+            adjacency.append(targets)
+        by_issue: dict[str, list[int]] = {}
+        for position, intent in enumerate(intents):
+            if intent.get("issue"):
+                by_issue.setdefault(intent["issue"], []).append(position)
+        return cls(ids, adjacency, by_issue, dangling)
+
+    @classmethod
+    def from_export(cls, graph: dict[str, Any]) -> IssueGraph:
+        """Use the precomputed ``graph`` section of an export, or derive it from older exports."""
+        data = graph.get("graph")
+        if data is None:
+            return cls.build(graph.get("issues", []), graph.get("intents", []))
+        built = cls(data["nodes"], data["adjacency"], data["intents"], data["dangling"])
+        built._order, built._cycles = data["order"], data["cycles"]
+        return built
+
+    # -- structure ---------------------------------------------------------
+    def components(self) -> list[list[int]]:
+        """Strongly connected components, each listed after every component it depends on (iterative Tarjan)."""
+        if self._components is None:
+            self._components = self._tarjan()
+        return self._components
+
+    def _tarjan(self) -> list[list[int]]:
+        count = len(self.ids)
+        order = [-1] * count
+        low = [0] * count
+        on_stack = [False] * count
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter = 0
+        for root in range(count):
+            if order[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work.pop()
+                if edge == 0:
+                    order[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                targets = self.adjacency[node]
+                while edge < len(targets):
+                    target = targets[edge]
+                    edge += 1
+                    if order[target] == -1:
+                        work.append((node, edge))
+                        work.append((target, 0))
+                        break
+                    if on_stack[target]:
+                        low[node] = min(low[node], order[target])
+                else:
+                    if low[node] == order[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(sorted(component))
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+        return components
+
+    def order(self) -> list[str]:
+        """Every issue after all of its blockers; issues in a cycle are adjacent."""
+        if self._order is None:
+            self._order = [self.ids[node] for component in self.components() for node in component]
+        return self._order
+
+    def cycles(self) -> list[list[str]]:
+        if self._cycles is None:
+            self._cycles = [[self.ids[node] for node in component] for component in self.components() if len(component) > 1]
+        return self._cycles
+
+    # -- queries -----------------------------------------------------------
+    def _reach(self, issue_id: str, edges: list[list[int]]) -> list[str]:
+        start = self.index[issue_id]
+        seen = {start}
+        queue = deque([start])
+        found = []
+        while queue:
+            for target in edges[queue.popleft()]:
+                if target not in seen:
+                    seen.add(target)
+                    found.append(target)
+                    queue.append(target)
+        return [self.ids[node] for node in found]
+
+    def blockers(self, issue_id: str) -> list[str]:
+        """Every issue ``issue_id`` transitively depends on, nearest first."""
+        return self._reach(issue_id, self.adjacency)
+
+    def dependents(self, issue_id: str) -> list[str]:
+        """Every issue that transitively depends on ``issue_id``, nearest first."""
+        return self._reach(issue_id, self.reverse)
+
+    def intents_for(self, issue_id: str, intents: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [intents[position] for position in self.intents.get(issue_id, [])]
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "nodes": self.ids,
+            "adjacency": self.adjacency,
+            "reverse": self.reverse,
+            "order": self.order(),
+            "cycles": self.cycles(),
+            "dangling": self.dangling,
+            "intents": self.intents,
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--graph", type=Path, default=GRAPH_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("order", help="Print issues in dependency order")
+    sub.add_parser("cycles", help="Print dependency cycles and dangling references; exit 1 if any")
+    for name in ("blockers", "dependents"):
+        query = sub.add_parser(name, help=f"Print the transitive {name} of an issue")
+        query.add_argument("issue")
+    args = parser.parse_args()
+
+    graph = IssueGraph.from_export(json.loads(args.graph.read_text(encoding="utf-8")))
+    if args.command == "order":
+        print("\n".join(graph.order()))
+        return 0
+    if args.command == "cycles":
+        for cycle in graph.cycles():
+            print(f"[issue-graph] cycle: {' -> '.join(cycle)}")
+        for issue_id, missing in sorted(graph.dangling.items()):
+            print(f"[issue-graph] {issue_id} depends on unknown {', '.join(missing)}")
+        return 1 if graph.cycles() or graph.dangling else 0
+    if args.issue not in graph.index:
+        raise SystemExit(f"[issue-graph] unknown issue {args.issue}")
+    print("\n".join(getattr(graph, args.command)(args.issue)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
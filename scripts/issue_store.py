@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Issue sources (docs/issues.md plus docs/issues/*.md shards) and their ID -> file/byte-range index.
+
+Issues may live in the monolithic ``docs/issues.md``, in shards under
+``docs/issues/``, or both. Sources are read in that order, with shards sorted
+by file name, so splitting the monolith into shards named in document order
+yields the same combined issue list.
+
+``IssueIndex`` keeps ``data/cache/issue_store/index.json`` with each source's
+(mtime, size, SHA-256) and the byte range of every ``## ISS-xxx – Title``
+section in it. A refresh rescans only sources whose stat changed. Rescans run
+across a process pool once ``POOL_THRESHOLD`` sources are stale. Consumers
+compare a source's digest with their own cache to decide what to reprocess.
+An issue ID defined in more than one source is reported in ``duplicates``.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+ISSUE_MD = Path("docs/issues.md")
+SHARD_DIR = Path("docs/issues")
+INDEX_PATH = Path("data/cache/issue_store/index.json")
+INDEX_FORMAT = 1
+POOL_THRESHOLD = 64
+HEADER_RE = re.compile(r"^##\s+(ISS-\d+)\s+\u2013\s+(.+)$", re.MULTILINE)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def issue_sources() -> list[Path]:
+    sources = [ISSUE_MD] if ISSUE_MD.exists() else []
+    return sources + sorted(SHARD_DIR.glob("*.md"))
+
+
+def extract_sections(text: str) -> Iterator[tuple[str, str, int, int]]:
+    """``(issue_id, title, start, end)`` per section; a section runs to the next header or the end of ``text``."""
+    matches = list(HEADER_RE.finditer(text))
+    for idx, match in enumerate(matches):
+        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
+        yield match.group(1), match.group(2), match.start(), end
+
+
+def scan(raw: bytes) -> list[dict[str, Any]]:
+    """Sections of one source with byte (not character) offsets into ``raw``."""
+    text = raw.decode("utf-8")
+    sections = []
+    position = offset = 0
+    for issue_id, title, start, end in extract_sections(text):
+        offset += len(text[position:start].encode("utf-8"))
+        length = len(text[start:end].encode("utf-8"))
+        sections.append({"id": issue_id, "title": title.strip(), "start": offset, "end": offset + length})
+        position, offset = end, offset + length
+    return sections
+
+
+def _apply_batch(args: tuple[Callable[[T], R], list[T]]) -> list[R]:
+    func, items = args
+    return [func(item) for item in items]
+
+
+def map_sources(func: Callable[[T], R], items: list[T], jobs: int) -> list[R]:
+    """``func`` over ``items`` in order, across ``jobs`` processes once there are ``POOL_THRESHOLD`` items."""
+    if len(items) < POOL_THRESHOLD or jobs <= 1:
+        return [func(item) for item in items]
+    size = max(1, len(items) // (jobs * 4))
+    batches = [(func, items[start : start + size]) for start in range(0, len(items), size)]
+    with ProcessPoolExecutor(jobs) as pool:
+        return [result for chunk in pool.map(_apply_batch, batches) for result in chunk]
+
+
+def _scan_source(path: str) -> tuple[str, int, int, str, list[dict[str, Any]]]:
+    file = Path(path)
+    stat = file.stat()
+    raw = file.read_bytes()
+    return path, stat.st_mtime_ns, stat.st_size, hashlib.sha256(raw).hexdigest(), scan(raw)
+
+
+class IssueIndex:
+    """Per-source stat, digest and section byte ranges, plus the combined ID -> (file, start, end) map."""
+
+    def __init__(self, path: Path | None = INDEX_PATH) -> None:
+        self.path = path
+        self.sources: dict[str, dict[str, Any]] = {}
+        if path is not None and path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("format") == INDEX_FORMAT:
+                self.sources = data["sources"]
+        self.issues: dict[str, tuple[str, int, int]] = {}
+        self.duplicates: dict[str, list[str]] = {}
+        self.scanned = 0
+
+    def refresh(self, jobs: int = 0) -> IssueIndex:
+        paths = [str(path) for path in issue_sources()]
+        stale = []
+        for path in paths:
+            stat = Path(path).stat()
+            entry = self.sources.get(path)
+            if not entry or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                stale.append(path)
+        for path, mtime_ns, size, digest, sections in map_sources(_scan_source, stale, jobs or os.cpu_count() or 1):
+            self.sources[path] = {"mtime_ns": mtime_ns, "size": size, "sha256": digest, "sections": sections}
+        self.sources = {path: self.sources[path] for path in paths}
+        self.scanned = len(stale)
+        self.issues, self.duplicates = {}, {}
+        for path, entry in self.sources.items():
+            for section in entry["sections"]:
+                if section["id"] in self.issues:
+                    self.duplicates.setdefault(section["id"], [self.issues[section["id"]][0]]).append(path)
+                    continue
+                self.issues[section["id"]] = (path, section["start"], section["end"])
+        if stale and self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"format": INDEX_FORMAT, "sources": self.sources}), encoding="utf-8")
+            os.replace(tmp, self.path)
+        return self
+
+    def read(self, issue_id: str) -> str:
+        path, start, end = self.issues[issue_id]
+        with open(path, "rb") as fh:
+            fh.seek(start)
+            return fh.read(end - start).decode("utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index", type=Path, default=INDEX_PATH)
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker processes for large rescans (default: CPU count)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("index", help="Refresh the index and print the ID -> file/byte-range map")
+    show = sub.add_parser("show", help="Print one issue's section")
+    show.add_argument("issue")
+    args = parser.parse_args()
+
+    index = IssueIndex(args.index).refresh(args.jobs)
+    if args.command == "show":
+        if args.issue not in index.issues:
+            raise SystemExit(f"[issue-store] unknown issue {args.issue}")
+        print(index.read(args.issue), end="")
+        return 0
+    for issue_id, (path, start, end) in index.issues.items():
+        print(f"{issue_id}\t{path}\t{start}-{end}")
+    print(f"[issue-store] {len(index.issues)} issues in {len(index.sources)} sources (rescanned {index.scanned})", file=sys.stderr)
+    for issue_id, paths in sorted(index.duplicates.items()):
+        print(f"[issue-store] {issue_id} defined in {', '.join(paths)}", file=sys.stderr)
+    return 1 if index.duplicates else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,9 +9,10 @@ if (( ${#files[@]} == 0 )); then
   exit 0
 fi
 
-for file in "${files[@]}"; do
-  echo "[lint-intents] Validating $file"
-  .agents/tools/intent_schema.py < "$file"
-done
+echo "[lint-intents] Validating ${#files[@]} intents"
+if ! .agents/tools/intent_schema.py "${files[@]}"; then
+  echo "[lint-intents] Intent validation failed" >&2
+  exit 1
+fi
 
 echo "[lint-intents] All intents valid"
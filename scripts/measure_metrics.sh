@@ -1,65 +1,45 @@
 #!/usr/bin/env bash
 set -euo pipefail
-find_tool() {
-  local name="$1"
-  if command -v "$name" >/dev/null 2>&1; then
-    command -v "$name"
-    return 0
-  fi
-  for path in /usr/bin/$name-* /usr/lib/llvm-*/bin/$name; do
-    if [[ -x "$path" ]]; then
-      echo "$path"
-      return 0
-    fi
-  done
-  return 1
-}
-
 ROOT="$(git rev-parse --show-toplevel)"
 export ROOT
 COV_DIR="$ROOT/data/outbox/coverage"
-SAMPLE_CPP="$ROOT/frontends/samples/sample.cpp"
-INPUT_BIN="$COV_DIR/sample_cov"
-PROFILE_RAW="$COV_DIR/sample.profraw"
-PROFILE_DATA="$COV_DIR/sample.profdata"
-REPORT_TXT="$COV_DIR/llvm_cov_report.txt"
+COVERAGE_JSON="$COV_DIR/coverage.json"
 mkdir -p "$COV_DIR"
 
-CLANGPP=$(find_tool clang++) || { echo "clang++ not found" >&2; exit 1; }
-LLVM_PROFDATA=$(find_tool llvm-profdata) || { echo "llvm-profdata not found" >&2; exit 1; }
-LLVM_COV=$(find_tool llvm-cov) || { echo "llvm-cov not found" >&2; exit 1; }
-
-"$CLANGPP" -std=c++20 -fprofile-instr-generate -fcoverage-mapping "$SAMPLE_CPP" -o "$INPUT_BIN"
-LLVM_PROFILE_FILE="$PROFILE_RAW" "$INPUT_BIN" >/dev/null
-"$LLVM_PROFDATA" merge -sparse "$PROFILE_RAW" -o "$PROFILE_DATA"
-"$LLVM_COV" report "$INPUT_BIN" -instr-profile="$PROFILE_DATA" > "$REPORT_TXT"
-COVERAGE=$(awk '/TOTAL/{print $(NF-3)}' "$REPORT_TXT" | tr -d '%')
-START=$(date +%s%3N)
+# Every sample in frontends/samples/ is built, run and merged concurrently;
+# per-file results stay in coverage.json, the aggregate line coverage is gated.
+python3 "$ROOT/scripts/collect_coverage.py" --work-dir "$COV_DIR" --output "$COVERAGE_JSON"
 "$ROOT/frontends/tests/run_smoke.sh" > "$ROOT/data/outbox/frontend_smoke.log"
-END=$(date +%s%3N)
-export DURATION_MS=$((END - START))
-export COVERAGE
-BASELINE=150
-export BASELINE
-PERF_DELTA=$(python3 - <<PY
-from __future__ import annotations
-import os
-baseline = int(os.environ["BASELINE"])
-duration = int(os.environ["DURATION_MS"])
-print(((duration - baseline) / baseline) * 100)
-PY
-)
-export PERF_DELTA
+# Warmup plus repeated runs; the summary and a bootstrap comparison against
+# reports/perf/smoke_baseline.json replace the old single run vs. a constant.
+LATENCY_JSON="$COV_DIR/smoke_latency.json"
+python3 "$ROOT/scripts/bench_harness.py" --warmup "${BENCH_WARMUP:-2}" --runs "${BENCH_RUNS:-10}" \
+  --output "$LATENCY_JSON" -- "$ROOT/frontends/tests/run_smoke.sh"
+# Peak RSS of the frontends (on a generated MEMORY_LINES-line module) and the export/sync
+# scripts; MEMORY_ALLOC_TOP=N adds a tracemalloc run with the top N allocation sites.
+MEMORY_JSON="$COV_DIR/memory.json"
+python3 "$ROOT/scripts/memory_metrics.py" --lines "${MEMORY_LINES:-100000}" --alloc-top "${MEMORY_ALLOC_TOP:-0}" \
+  --output "$MEMORY_JSON"
+export COVERAGE_JSON LATENCY_JSON MEMORY_JSON
 python3 - <<PY
 import json, os
 root = os.getenv("ROOT")
+latency = json.load(open(os.environ["LATENCY_JSON"], encoding="utf-8"))
+coverage = json.load(open(os.environ["COVERAGE_JSON"], encoding="utf-8"))
+memory = json.load(open(os.environ["MEMORY_JSON"], encoding="utf-8"))
 metrics = {
-    "coverage": float(os.environ["COVERAGE"]),
-    "perf_latency_pct": float(os.environ["PERF_DELTA"]),
-    "duration_ms": int(os.environ["DURATION_MS"]),
-    "notes": "Coverage via llvm-cov on frontends/samples/sample.cpp"
+    "coverage": coverage["coverage"],
+    "coverage_files": {name: summary["lines"]["percent"] for name, summary in coverage["files"].items()},
+    "perf_latency_pct": latency["delta_pct"],
+    "perf_latency_ci_pct": latency["delta_ci_pct"],
+    "duration_ms": round(latency["median_ms"]),
+    "peak_rss_mb": max(entry["peak_rss_mb"] for entry in memory.values()),
+    "memory": memory,
+    "latency": {key: latency[key] for key in ("runs", "min_ms", "median_ms", "p95_ms", "median_ci_ms", "samples_ms", "baseline")},
+    "notes": "Coverage = merged llvm-cov line coverage over frontends/samples/* via scripts/collect_coverage.py; latency = run_smoke.sh via scripts/bench_harness.py"
 }
 with open(os.path.join(root, "reports", "metrics.json"), "w", encoding="utf-8") as fh:
     json.dump(metrics, fh, indent=2)
-print(f"[measure] coverage={metrics['coverage']:.2f}% perf_delta={metrics['perf_latency_pct']:.2f}% duration_ms={metrics['duration_ms']}")
+delta = "n/a (no baseline)" if metrics["perf_latency_pct"] is None else f"{metrics['perf_latency_pct']:.2f}%"
+print(f"[measure] coverage={metrics['coverage']:.2f}% perf_delta={delta} ci={metrics['perf_latency_ci_pct']} median_ms={metrics['duration_ms']} peak_rss_mb={metrics['peak_rss_mb']}")
 PY
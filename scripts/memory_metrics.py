@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Peak RSS (and optionally top allocation sites) of the frontends and the export/sync scripts.
+
+Each target runs as its own subprocess and its peak RSS comes from ``wait4``.
+The frontends get a generated corpus of ``--lines`` lines (the
+``bench_frontends.py`` units), so the number reflects a large module rather than
+the tiny samples. Each frontend runs twice: uncached with ``--format compact``,
+which builds the whole document, and as ``<frontend>-ndjson`` with
+``--format ndjson`` and a fresh IR cache. The second run measures streaming
+output while the cache entry is being written. With ``--alloc-top N``, each target runs a second time under
+``tracemalloc``. That run records the peak traced Python heap and the N
+source lines holding the most memory near that peak. It is kept separate
+because tracing inflates RSS.
+
+Every target maps to the intent whose ``constraints.resources.memory_mb`` is
+its budget. ``budget_mb`` reads the intent at check time, so
+``check_metrics.py`` gates on whatever the intents currently declare.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import yaml
+except ModuleNotFoundError as exc:  # pragma: no cover
+    raise SystemExit("PyYAML is required: pip install pyyaml") from exc
+
+from bench_frontends import FRONTENDS, generate
+
+ROOT = Path(__file__).resolve().parents[1]
+INTENT_DIR = ROOT / "intents"
+REPORT_PATH = ROOT / "data" / "outbox" / "coverage" / "memory.json"
+DEFAULT_LINES = 100_000
+
+# Runs ``script`` as __main__ under tracemalloc. A watcher thread snapshots the heap each
+# time it grows 10% past the previous snapshot, so the top sites describe the peak, not exit.
+ALLOC_BOOTSTRAP = """
+import atexit, json, runpy, sys, threading, tracemalloc
+out, top, root, script = sys.argv[1], int(sys.argv[2]), sys.argv[3], sys.argv[4]
+state = {"size": 0, "snapshot": None}
+lock = threading.Lock()  # the watcher thread keeps running while atexit calls dump()
+def take():
+    with lock:
+        if not tracemalloc.is_tracing():
+            return
+        current = tracemalloc.get_traced_memory()[0]
+        if state["snapshot"] is None or current > state["size"] * 1.1:
+            snapshot = tracemalloc.take_snapshot()
+            state["size"], state["snapshot"] = current, snapshot
+def watch():
+    while tracemalloc.is_tracing():
+        take()
+        threading.Event().wait(0.01)
+def dump():
+    take()
+    with lock:
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = state["snapshot"]
+        tracemalloc.stop()
+    snapshot = snapshot.filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen *>"), tracemalloc.Filter(False, "<string>")]
+    )
+    sites = []
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        name = frame.filename[len(root) + 1:] if frame.filename.startswith(root + "/") else frame.filename
+        sites.append({"site": f"{name}:{frame.lineno}", "kib": round(stat.size / 1024, 1), "blocks": stat.count})
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump({"peak_traced_mb": round(peak / 2**20, 2), "top_allocations": sites}, fh)
+tracemalloc.start(1)
+atexit.register(dump)
+threading.Thread(target=watch, daemon=True).start()
+sys.argv = sys.argv[4:]
+sys.path[0] = script.rsplit("/", 1)[0]
+runpy.run_path(script, run_name="__main__")
+"""
+
+
+@dataclass(frozen=True)
+class Target:
+    name: str
+    script: str
+    intent: str
+    stream: bool = False  # frontends: --format ndjson with a (cold) IR cache instead of compact --no-cache
+
+    @property
+    def frontend(self) -> str:
+        return Path(self.script).parent.name
+
+
+TARGETS = (
+    Target("trisynk-rs", "frontends/trisynk-rs/frontend.py", "INT-2025-0001"),
+    Target("trisynk-cpp", "frontends/trisynk-cpp/frontend.py", "INT-2025-0004"),
+    Target("trisynk-rs-ndjson", "frontends/trisynk-rs/frontend.py", "INT-2025-0001", stream=True),
+    Target("trisynk-cpp-ndjson", "frontends/trisynk-cpp/frontend.py", "INT-2025-0004", stream=True),
+    Target("export-graph", "scripts/export_graph.py", "INT-2025-0009"),
+    Target("sync-issues", "scripts/sync_issues.py", "INT-2025-0009"),
+    Target("sync-projects", "scripts/sync_projects.py", "INT-2025-0009"),
+)
+
+
+def budget_mb(intent: str) -> float | None:
+    """``constraints.resources.memory_mb`` of ``intents/<intent>.yaml``, if declared."""
+    path = INTENT_DIR / f"{intent}.yaml"
+    if not path.exists():
+        return None
+    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    value = data.get("constraints", {}).get("resources", {}).get("memory_mb")
+    return float(value) if value is not None else None
+
+
+def target_args(target: Target, workdir: Path, lines: int) -> list[str]:
+    graph = workdir / "issues_intents.json"
+    if target.frontend in FRONTENDS:
+        _, suffix, unit, _ = FRONTENDS[target.frontend]
+        source = workdir / f"module{suffix}"
+        if not source.exists():
+            generate(source, unit, lines)
+        if target.stream:
+            output = workdir / f"{target.name}.ndjson"
+            return [str(source), "--output", str(output), "--format", "ndjson", "--cache-dir", str(cache_dir(target, workdir))]
+        return [str(source), "--output", str(workdir / f"{target.name}.json"), "--format", "compact", "--no-cache"]
+    if target.name == "export-graph":
+        return ["--output", str(graph), "--no-cache"]
+    if target.name == "sync-issues":
+        return ["--graph", str(graph)]
+    return ["--graph", str(graph), "--plan", str(workdir / "projects_plan.json")]
+
+
+def cache_dir(target: Target, workdir: Path) -> Path:
+    return workdir / f"{target.name}-cache"
+
+
+def peak_rss(command: list[str]) -> tuple[float, float]:
+    """Run ``command`` from the repo root; return (seconds, peak RSS in MiB from wait4)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    stderr = proc.stderr.read().decode("utf-8", errors="replace")
+    proc.stderr.close()
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise SystemExit(f"[memory] {' '.join(command[1:3])} failed:\n{stderr}")
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def allocations(script: Path, args: list[str], top: int, workdir: Path) -> dict:
+    out = workdir / "alloc.json"
+    command = [sys.executable, "-c", ALLOC_BOOTSTRAP, str(out), str(top), str(ROOT), str(script), *args]
+    subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+    return json.loads(out.read_text(encoding="utf-8"))
+
+
+def measure(targets: list[Target], lines: int, alloc_top: int) -> dict:
+    report: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="trisynk-memory-") as tmp:
+        workdir = Path(tmp)
+        # export-graph first: the sync targets read the graph it writes.
+        for target in sorted(targets, key=lambda item: item.name != "export-graph"):
+            script = ROOT / target.script
+            args = target_args(target, workdir, lines)
+            shutil.rmtree(cache_dir(target, workdir), ignore_errors=True)
+            seconds, rss = peak_rss([sys.executable, str(script), *args])
+            entry = {"peak_rss_mb": round(rss, 1), "seconds": round(seconds, 3), "intent": target.intent}
+            budget = budget_mb(target.intent)
+            if budget is not None:
+                entry["budget_mb"] = budget
+            if target.frontend in FRONTENDS:
+                entry["lines"] = lines
+            if alloc_top > 0:
+                shutil.rmtree(cache_dir(target, workdir), ignore_errors=True)  # measure the miss path again
+                entry.update(allocations(script, args, alloc_top, workdir))
+            report[target.name] = entry
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=[target.name for target in TARGETS], action="append", help="Limit to one target (repeatable)")
+    parser.add_argument("--lines", type=int, default=DEFAULT_LINES, help="Generated corpus size for the frontends")
+    parser.add_argument("--alloc-top", type=int, default=0, help="Also record the top N allocation sites via tracemalloc")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args()
+
+    targets = [target for target in TARGETS if not args.target or target.name in args.target]
+    report = measure(targets, args.lines, args.alloc_top)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    for name, entry in report.items():
+        budget = f" / {entry['budget_mb']:g} MB ({entry['intent']})" if "budget_mb" in entry else ""
+        traced = f", traced peak {entry['peak_traced_mb']} MB" if "peak_traced_mb" in entry else ""
+        print(f"[memory] {name}: peak RSS {entry['peak_rss_mb']} MB{budget}{traced}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Time-segmented metrics history with a fixed-width offset index and hourly/daily rollups.
+
+Layout under ``reports/history/``::
+
+    index.json                  segment list (one UTC day each) and rollup watermark
+    segments/<day>.jsonl        raw entries, append-only
+    segments/<day>.idx          16 bytes per entry: f64 epoch seconds, u64 byte offset
+    rollups/hourly.jsonl        per-hour count/mean/min/max of numeric fields (nested ones dotted)
+    rollups/daily.jsonl         the same per day
+
+Appends write one line plus one index record and touch ``index.json`` only when
+a new day starts. ``tail(n)`` and ``between(start, end)`` use the ``.idx``
+records to seek straight to the entries they need. ``compact`` folds raw
+segments older than the retention window into the rollups and deletes them.
+Entries without an index record (a crash between the two writes) are ignored.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+HISTORY_DIR = ROOT / "reports" / "history"
+LEGACY_FILE = HISTORY_DIR / "metrics_history.jsonl"
+INDEX_RECORD = struct.Struct("<dQ")
+FORMAT_VERSION = 1
+RETENTION_DAYS = 30
+ROLLUPS = ("hourly", "daily")
+
+
+def parse_timestamp(value: str) -> datetime:
+    moment = datetime.fromisoformat(value)
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def numeric_fields(entry: dict, prefix: str = "") -> Iterator[tuple[str, float]]:
+    """Numeric leaves of ``entry``; nested objects become dotted keys (``criterion.accumulate.mean_ns``)."""
+    for key, value in entry.items():
+        if isinstance(value, dict):
+            yield from numeric_fields(value, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f"{prefix}{key}", float(value)
+
+
+def rollup(bucket: str, entries: Iterable[dict]) -> dict:
+    """Count plus mean/min/max of every numeric field across ``entries``."""
+    count = 0
+    fields: dict[str, list[float]] = {}
+    for entry in entries:
+        count += 1
+        for key, value in numeric_fields(entry):
+            stats = fields.setdefault(key, [0.0, value, value, 0])
+            stats[0] += value
+            stats[1] = min(stats[1], value)
+            stats[2] = max(stats[2], value)
+            stats[3] += 1
+    return {
+        "timestamp": bucket,
+        "count": count,
+        "fields": {
+            key: {"mean": round(total / n, 4), "min": low, "max": high} for key, (total, low, high, n) in fields.items()
+        },
+    }
+
+
+class MetricsStore:
+    def __init__(self, root: Path = HISTORY_DIR) -> None:
+        self.root = root
+        self.segments_dir = root / "segments"
+        self.rollups_dir = root / "rollups"
+        self.index_path = root / "index.json"
+        self.index = self._load_index()
+
+    # -- index -------------------------------------------------------------
+    def _load_index(self) -> dict:
+        if self.index_path.exists():
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if index.get("format") == FORMAT_VERSION:
+                return index
+        return {"format": FORMAT_VERSION, "segments": [], "rolled_up_through": None}
+
+    def _save_index(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.index, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def _paths(self, day: str) -> tuple[Path, Path]:
+        return self.segments_dir / f"{day}.jsonl", self.segments_dir / f"{day}.idx"
+
+    def _records(self, day: str) -> list[tuple[float, int]]:
+        _, idx_path = self._paths(day)
+        data = idx_path.read_bytes() if idx_path.exists() else b""
+        usable = len(data) - len(data) % INDEX_RECORD.size
+        return list(INDEX_RECORD.iter_unpack(data[:usable]))
+
+    # -- writes ------------------------------------------------------------
+    def append(self, entry: dict) -> None:
+        moment = parse_timestamp(entry["timestamp"])
+        day = moment.astimezone(timezone.utc).date().isoformat()
+        data_path, idx_path = self._paths(day)
+        if day not in self.index["segments"]:
+            self.segments_dir.mkdir(parents=True, exist_ok=True)
+            self.index["segments"] = sorted({*self.index["segments"], day})
+            self._save_index()
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with data_path.open("ab") as fh:
+            offset = fh.tell()
+            fh.write(line)
+        with idx_path.open("ab") as fh:
+            fh.write(INDEX_RECORD.pack(moment.timestamp(), offset))
+
+    def compact(self, retention_days: int = RETENTION_DAYS, now: datetime | None = None) -> list[str]:
+        """Roll raw segments older than ``retention_days`` into hourly/daily rollups; return the days folded."""
+        cutoff = ((now or datetime.now(timezone.utc)) - timedelta(days=retention_days)).date().isoformat()
+        folded = [day for day in self.index["segments"] if day < cutoff]
+        if not folded:
+            return []
+        self.rollups_dir.mkdir(parents=True, exist_ok=True)
+        with (self.rollups_dir / "hourly.jsonl").open("a", encoding="utf-8") as hourly, (
+            self.rollups_dir / "daily.jsonl"
+        ).open("a", encoding="utf-8") as daily:
+            for day in folded:
+                entries = list(self._read(day, self._records(day)))
+                hours: dict[str, list[dict]] = {}
+                for entry in entries:
+                    moment = parse_timestamp(entry["timestamp"]).astimezone(timezone.utc)
+                    hours.setdefault(moment.replace(minute=0, second=0, microsecond=0).isoformat(), []).append(entry)
+                for bucket in sorted(hours):
+                    hourly.write(json.dumps(rollup(bucket, hours[bucket])) + "\n")
+                daily.write(json.dumps(rollup(f"{day}T00:00:00+00:00", entries)) + "\n")
+        self.index["segments"] = [day for day in self.index["segments"] if day >= cutoff]
+        self.index["rolled_up_through"] = max(folded[-1], self.index.get("rolled_up_through") or "")
+        self._save_index()
+        for day in folded:
+            for path in self._paths(day):
+                path.unlink(missing_ok=True)
+        return folded
+
+    def import_jsonl(self, path: Path) -> int:
+        """Move a legacy single-file history into the store."""
+        count = 0
+        with path.open(encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "timestamp" in entry:
+                    self.append(entry)
+                    count += 1
+        return count
+
+    # -- reads -------------------------------------------------------------
+    def _read(self, day: str, records: list[tuple[float, int]]) -> Iterator[dict]:
+        if not records:
+            return
+        data_path, _ = self._paths(day)
+        with data_path.open("rb") as fh:
+            fh.seek(records[0][1])
+            position = records[0][1]
+            for _, offset in records:
+                if offset != position:
+                    fh.seek(offset)
+                line = fh.readline()
+                position = offset + len(line)
+                yield json.loads(line)
+
+    def tail(self, count: int) -> list[dict]:
+        """The last ``count`` raw entries, oldest first, reading only the newest segments."""
+        picked: list[list[dict]] = []
+        remaining = count
+        for day in reversed(self.index["segments"]):
+            if remaining <= 0:
+                break
+            records = self._records(day)[-remaining:]
+            picked.append(list(self._read(day, records)))
+            remaining -= len(records)
+        return [entry for chunk in reversed(picked) for entry in chunk]
+
+    def between(self, start: datetime | None = None, end: datetime | None = None) -> Iterator[dict]:
+        """Raw entries with ``start <= timestamp < end``; segments outside the range are never opened."""
+        low = start.timestamp() if start else float("-inf")
+        high = end.timestamp() if end else float("inf")
+        first_day = start.astimezone(timezone.utc).date().isoformat() if start else ""
+        last_day = end.astimezone(timezone.utc).date().isoformat() if end else "9999-12-31"
+        for day in self.index["segments"]:
+            if first_day <= day <= last_day:
+                yield from self._read(day, [r for r in self._records(day) if low <= r[0] < high])
+
+    def rollups(self, kind: str, count: int | None = None) -> list[dict]:
+        path = self.rollups_dir / f"{kind}.jsonl"
+        if not path.exists():
+            return []
+        with path.open(encoding="utf-8") as fh:
+            rows = [json.loads(line) for line in fh if line.strip()]
+        return rows if count is None else rows[-count:]
+
+    def holds(self, cursor: dict) -> bool:
+        """Whether ``cursor`` points into this store: an indexed segment with at least that many records, or a rolled-up one."""
+        day = cursor["day"]
+        if day in self.index["segments"]:
+            return cursor["records"] <= len(self._records(day))
+        rolled = self.index.get("rolled_up_through")
+        return day == "" or (rolled is not None and day <= rolled)
+
+    def since(self, cursor: dict | None) -> tuple[list[dict], dict]:
+        """Entries appended after ``cursor`` and the cursor that follows them.
+
+        A cursor is ``{"day": <segment>, "records": <entries consumed>}``; ``None``
+        reads the whole store. Segments folded into rollups are skipped.
+        """
+        day, seen = (cursor["day"], cursor["records"]) if cursor else ("", 0)
+        entries: list[dict] = []
+        after = cursor or {"day": "", "records": 0}
+        for segment in self.index["segments"]:
+            if segment < day:
+                continue
+            records = self._records(segment)
+            entries.extend(self._read(segment, records[seen if segment == day else 0 :]))
+            after = {"day": segment, "records": len(records)}
+        return entries, after
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=HISTORY_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    tail = sub.add_parser("tail", help="Print the last N entries")
+    tail.add_argument("count", type=int, nargs="?", default=10)
+    between = sub.add_parser("range", help="Print entries in [--start, --end)")
+    between.add_argument("--start", type=parse_timestamp)
+    between.add_argument("--end", type=parse_timestamp)
+    rollups = sub.add_parser("rollups", help="Print hourly or daily rollups")
+    rollups.add_argument("kind", choices=ROLLUPS)
+    rollups.add_argument("--count", type=int)
+    compact = sub.add_parser("compact", help="Fold segments older than --retention-days into rollups")
+    compact.add_argument("--retention-days", type=int, default=RETENTION_DAYS)
+    args = parser.parse_args()
+
+    store = MetricsStore(args.root)
+    if args.command == "tail":
+        rows: Iterable[dict] = store.tail(args.count)
+    elif args.command == "range":
+        rows = store.between(args.start, args.end)
+    elif args.command == "rollups":
+        rows = store.rollups(args.kind, args.count)
+    else:
+        print(f"[metrics-store] folded {store.compact(args.retention_days)}")
+        return 0
+    for row in rows:
+        print(json.dumps(row))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
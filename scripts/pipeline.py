@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""Dependency-aware check pipeline: runs independent steps concurrently and skips steps whose inputs are unchanged."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "frontends"))
+
+from common import tracing  # noqa: E402
+
+STATE_PATH = ROOT / "data" / "cache" / "pipeline" / "state.json"
+FRONTEND_SOURCES = ("frontends/**/*.py", "frontends/samples/*", "schema/*.json")
+
+
+@dataclass(frozen=True)
+class Step:
+    name: str
+    command: tuple[str, ...]
+    inputs: tuple[str, ...] = ()  # globs relative to the repo root; the step's own script is always included
+    outputs: tuple[str, ...] = ()
+    deps: tuple[str, ...] = ()
+    env: tuple[str, ...] = ()  # environment variables that change the result
+    tools: tuple[str, ...] = ()  # executables whose resolved path is part of the cache key
+    exclusive: bool = False  # timing-sensitive: run with nothing else in flight
+    cache: bool = True
+
+
+STEPS = (
+    Step("lint", ("scripts/lint_intents.sh",), ("intents/*.yaml", ".agents/tools/intent_schema.py")),
+    Step("validate", ("scripts/validate_issues.py",), ("docs/issues.md", "docs/issues/*.md", "scripts/issue_store.py")),
+    Step(
+        "export",
+        ("scripts/export_graph.py", "--output", "data/outbox/issues_intents.json"),
+        ("docs/issues.md", "docs/issues/*.md", "intents/*.yaml", "scripts/issue_graph.py", "scripts/issue_store.py"),
+        ("data/outbox/issues_intents.json",),
+        deps=("lint", "validate"),
+    ),
+    Step(
+        "sync-issues",
+        ("scripts/sync_issues.py",),
+        ("data/outbox/issues_intents.json", "scripts/issue_graph.py", "scripts/github_client.py"),
+        ("data/outbox/github_sync_payload.json",),
+        deps=("export",),
+        env=("GITHUB_REPO", "GITHUB_API_URL"),
+    ),
+    Step(
+        "sync-projects",
+        ("scripts/sync_projects.py", "--plan", "data/outbox/projects_sync_payload.json"),
+        ("data/outbox/issues_intents.json", "scripts/issue_graph.py", "scripts/github_client.py"),
+        ("data/outbox/projects_sync_payload.json",),
+        deps=("export",),
+        env=("GITHUB_REPO",),
+    ),
+    Step(
+        "measure",
+        ("scripts/measure_metrics.sh",),
+        (
+            *FRONTEND_SOURCES,
+            "scripts/collect_coverage.py",
+            "scripts/memory_metrics.py",
+            "scripts/bench_frontends.py",
+            "scripts/export_graph.py",
+            "scripts/sync_issues.py",
+            "scripts/sync_projects.py",
+            "scripts/issue_graph.py",
+            "scripts/issue_store.py",
+            "scripts/github_client.py",
+            "scripts/bench_harness.py",
+            "scripts/ir_schema.py",
+            "frontends/tests/run_smoke.sh",
+            "intents/*.yaml",
+            "docs/issues.md",
+            "docs/issues/*.md",
+            "reports/perf/smoke_baseline.json",
+        ),
+        ("reports/metrics.json",),
+        env=("BENCH_WARMUP", "BENCH_RUNS", "MEMORY_LINES", "MEMORY_ALLOC_TOP"),
+        tools=("clang++", "rustc", "llvm-profdata", "llvm-cov"),
+        exclusive=True,
+        cache=False,  # latency and RSS are measurements of this run, not functions of the inputs
+    ),
+    Step(
+        "cargo",
+        ("scripts/run_cargo_metrics.sh",),
+        ("metrics/demo/Cargo.*", "metrics/demo/src/**/*.rs", "metrics/demo/benches/*.rs", "scripts/criterion_ingest.py"),
+        ("reports/cargo_metrics.json",),
+        tools=("cargo",),
+        exclusive=True,
+    ),
+    Step("frontends", ("scripts/test_frontends.py",), (*FRONTEND_SOURCES, "scripts/ir_schema.py")),
+    Step(
+        "toolchain",
+        ("frontends/tests/run_toolchain.sh",),
+        ("frontends/samples/*",),
+        tools=("rustc", "clang++"),
+    ),
+    Step(
+        "lowering",
+        ("scripts/run_lowering.sh",),
+        FRONTEND_SOURCES,
+        ("data/outbox/lowering/rust/sample.mir", "data/outbox/lowering/clang/sample.ast.json"),
+        tools=("rustc", "rustup", "clang++"),
+    ),
+    Step(
+        "history",
+        ("scripts/update_metrics_history.py",),
+        ("reports/metrics.json", "reports/cargo_metrics.json", "scripts/metrics_store.py"),
+        ("reports/history/index.json",),
+        deps=("measure", "cargo"),
+        cache=False,  # every run appends its own history entry
+    ),
+    Step(
+        "dashboard",
+        ("scripts/update_dashboard.py",),
+        (
+            "reports/history/index.json",
+            "reports/history/segments/*",
+            "reports/cargo_metrics.json",
+            "scripts/metrics_store.py",
+            "scripts/bench_harness.py",
+        ),
+        ("reports/dashboard/metrics_dashboard.json",),
+        deps=("history",),
+    ),
+    Step(
+        "check",
+        ("scripts/check_metrics.py",),
+        (
+            "reports/metrics.json",
+            "reports/cargo_metrics.json",
+            "reports/perf/*.json",
+            "scripts/bench_harness.py",
+            "scripts/criterion_ingest.py",
+            "scripts/memory_metrics.py",
+            "intents/*.yaml",
+        ),
+        deps=("history",),
+    ),
+)
+
+
+class HashMemo:
+    """SHA-256 per file, reused while (mtime, size) are unchanged."""
+
+    def __init__(self, memo: dict[str, list]) -> None:
+        self.memo = memo
+        self.lock = threading.Lock()
+
+    def file(self, rel: str) -> str | None:
+        path = ROOT / rel
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        with self.lock:
+            cached = self.memo.get(rel)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        with self.lock:
+            self.memo[rel] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
+
+    def expand(self, patterns: tuple[str, ...]) -> list[str]:
+        found = set()
+        for pattern in patterns:
+            if any(char in pattern for char in "*?["):
+                found.update(
+                    p.relative_to(ROOT).as_posix()
+                    for p in ROOT.glob(pattern)
+                    if p.is_file() and "__pycache__" not in p.parts
+                )
+            else:
+                found.add(pattern)
+        return sorted(found)
+
+
+def step_key(step: Step, hashes: HashMemo) -> str:
+    digest = hashlib.sha256(json.dumps(step.command).encode("utf-8"))
+    for rel in hashes.expand((step.command[0], *step.inputs)):
+        digest.update(f"{rel}\0{hashes.file(rel)}\n".encode("utf-8"))
+    for name in step.env:
+        digest.update(f"${name}={os.environ.get(name, '')}\n".encode("utf-8"))
+    for tool in step.tools:
+        digest.update(f"!{tool}={shutil.which(tool)}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def outputs_intact(step: Step, record: dict, hashes: HashMemo) -> bool:
+    return all(hashes.file(rel) == digest for rel, digest in record.get("outputs", {}).items())
+
+
+def closure(names: list[str], by_name: dict[str, Step]) -> set[str]:
+    selected: set[str] = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(by_name[name].deps)
+    return selected
+
+
+def critical_path(results: dict[str, dict], by_name: dict[str, Step]) -> tuple[float, list[str]]:
+    """Longest chain of measured step times through the dependency graph."""
+    best: dict[str, tuple[float, list[str]]] = {}
+
+    def visit(name: str) -> tuple[float, list[str]]:
+        if name not in best:
+            chains = [visit(dep) for dep in by_name[name].deps if dep in results]
+            seconds, path = max(chains, default=(0.0, []))
+            best[name] = (seconds + results[name]["seconds"], [*path, name])
+        return best[name]
+
+    return max((visit(name) for name in results), default=(0.0, []))
+
+
+def run_step(step: Step) -> tuple[int, str]:
+    with tracing.span(f"step:{step.name}", cat="pipeline", command=" ".join(step.command)) as event:
+        try:
+            proc = subprocess.run(step.command, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=False)
+        except OSError as exc:  # missing or not executable: report it as this step's failure
+            if tracing.enabled():
+                event.args["error"] = str(exc)
+            return 127 if isinstance(exc, FileNotFoundError) else 126, f"cannot run {step.command[0]}: {exc}"
+        if tracing.enabled():
+            event.args["exit"] = proc.returncode
+    return proc.returncode, proc.stdout.decode("utf-8", errors="replace")
+
+
+def run_pipeline(steps: tuple[Step, ...], jobs: int, use_cache: bool, verbose: bool) -> dict:
+    state = json.loads(STATE_PATH.read_text(encoding="utf-8")) if STATE_PATH.exists() else {}
+    hashes = HashMemo(state.setdefault("files", {}))
+    records: dict[str, dict] = state.setdefault("steps", {})
+    by_name = {step.name: step for step in steps}
+    results: dict[str, dict] = {}
+    done: set[str] = set()
+    failed = False
+    running: dict[Future, tuple[Step, str, float]] = {}
+    pending = list(steps)
+    start = time.perf_counter()
+
+    def finish(step: Step, status: str, seconds: float, output: str = "") -> None:
+        results[step.name] = {"status": status, "seconds": round(seconds, 3)}
+        print(f"[pipeline] {step.name}: {status} ({seconds:.2f}s)")
+        if output and (verbose or status == "failed"):
+            sys.stdout.write("".join(f"  {line}\n" for line in output.splitlines()))
+        sys.stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            exclusive_running = any(step.exclusive for step, _, _ in running.values())
+            for step in list(pending):
+                if failed:
+                    break
+                if not all(dep in done for dep in step.deps):
+                    continue
+                if exclusive_running or len(running) >= jobs:
+                    break
+                if step.exclusive and running:
+                    continue
+                pending.remove(step)
+                with tracing.span(f"cache-key:{step.name}", cat="pipeline"):
+                    key = step_key(step, hashes)
+                record = records.get(step.name)
+                if use_cache and step.cache and record and record["key"] == key and outputs_intact(step, record, hashes):
+                    done.add(step.name)
+                    finish(step, "cached", 0.0)
+                    continue
+                running[pool.submit(run_step, step)] = (step, key, time.perf_counter())
+                exclusive_running = step.exclusive
+            if failed:
+                for step in pending:
+                    finish(step, "skipped", 0.0)
+                pending.clear()
+            if not running:
+                if pending:  # every remaining step waits on a dependency that was never scheduled
+                    raise SystemExit(f"[pipeline] unsatisfiable dependencies: {[step.name for step in pending]}")
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step, key, began = running.pop(future)
+                code, output = future.result()
+                seconds = time.perf_counter() - began
+                if code == 0:
+                    done.add(step.name)
+                    records[step.name] = {
+                        "key": key,
+                        "outputs": {rel: hashes.file(rel) for rel in hashes.expand(step.outputs)},
+                        "seconds": round(seconds, 3),
+                    }
+                    finish(step, "ran", seconds, output)
+                else:
+                    failed = True
+                    records.pop(step.name, None)
+                    finish(step, "failed", seconds, output)
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    STATE_PATH.write_text(json.dumps(state, indent=1) + "\n", encoding="utf-8")
+    path_seconds, path = critical_path({k: v for k, v in results.items() if v["status"] != "skipped"}, by_name)
+    return {
+        "ok": not failed,
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "serial_seconds": round(sum(result["seconds"] for result in results.values()), 3),
+        "critical_path": {"seconds": round(path_seconds, 3), "steps": path},
+        "steps": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("steps", nargs="*", help="Run only these steps (plus their dependencies)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Concurrent steps (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Run every step even if its inputs are unchanged")
+    parser.add_argument("--list", action="store_true", help="Print the step graph and exit")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Echo the output of successful steps too")
+    parser.add_argument("--report", type=Path, help="Write per-step status and timings as JSON")
+    parser.add_argument("--trace", type=Path, help="Write a Chrome trace of the pipeline and every traced step (env: TRISYNK_TRACE)")
+    parser.add_argument("--sample-ms", type=float, help="With --trace, also sample Python stacks every N ms")
+    args = parser.parse_args()
+    if args.trace:
+        tracing.start(args.trace, args.sample_ms, fresh=True)
+
+    by_name = {step.name: step for step in STEPS}
+    unknown = [name for name in args.steps if name not in by_name]
+    if unknown:
+        parser.error(f"unknown steps {unknown}; choose from {sorted(by_name)}")
+    if args.list:
+        for step in STEPS:
+            print(f"{step.name:14} deps={list(step.deps)} inputs={list(step.inputs)} outputs={list(step.outputs)}")
+        return 0
+    selected = closure(args.steps, by_name) if args.steps else set(by_name)
+    steps = tuple(step for step in STEPS if step.name in selected)
+    with tracing.span("pipeline", cat="pipeline", steps=len(steps)):
+        report = run_pipeline(steps, args.jobs, not args.no_cache, args.verbose)
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(
+        f"[pipeline] {'PASS' if report['ok'] else 'FAIL'} wall={report['wall_seconds']}s "
+        f"serial={report['serial_seconds']}s critical_path={report['critical_path']['seconds']}s "
+        f"({' -> '.join(report['critical_path']['steps'])})"
+    )
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -14,16 +14,22 @@ required_files=(
   .agents/tools/intent_schema.py
   scripts/lint_intents.sh
   scripts/validate_issues.py
+  scripts/issue_store.py
   scripts/export_graph.py
   scripts/sync_issues.py
   scripts/sync_projects.py
   scripts/measure_metrics.sh
+  scripts/collect_coverage.py
+  scripts/memory_metrics.py
   scripts/run_cargo_metrics.sh
   scripts/test_frontends.py
   scripts/run_lowering.sh
   scripts/update_metrics_history.py
   scripts/update_dashboard.py
   scripts/check_metrics.py
+  scripts/pipeline.py
+  scripts/bench_harness.py
+  reports/perf/smoke_baseline.json
   .env.example
   AGENTS.md
   docs/frontends.md
@@ -64,18 +70,8 @@ for f in "${required_files[@]}"; do
 done
 
 
-scripts/lint_intents.sh
-scripts/validate_issues.py
-scripts/export_graph.py --output data/outbox/issues_intents.json
-scripts/sync_issues.py > /dev/null
-scripts/sync_projects.py --plan data/outbox/projects_sync_payload.json
-scripts/measure_metrics.sh
-scripts/run_cargo_metrics.sh
-scripts/test_frontends.py
-frontends/tests/run_toolchain.sh
-scripts/run_lowering.sh
-scripts/update_metrics_history.py
-scripts/update_dashboard.py
-scripts/check_metrics.py
+# Steps, their inputs/outputs and dependencies are declared in scripts/pipeline.py;
+# independent steps run concurrently and unchanged ones are skipped (--no-cache to force).
+scripts/pipeline.py "$@"
 
 echo "[PASS] Documentation baseline + linting verified."
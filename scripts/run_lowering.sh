@@ -4,10 +4,20 @@ ROOT="$(git rev-parse --show-toplevel)"
 RUST_SAMPLE="$ROOT/frontends/samples/sample.rs"
 CLANG_SAMPLE="$ROOT/frontends/samples/sample.cpp"
 RUST_OUT="$ROOT/data/outbox/lowering/rust/sample.mir"
+RUST_IR="$ROOT/data/outbox/lowering/rust/sample.ir.json"
 CLANG_OUT="$ROOT/data/outbox/lowering/clang/sample.ast.json"
+CLANG_IR="$ROOT/data/outbox/lowering/clang/sample.ir.json"
 
 log() { printf '[lowering] %s\n' "$1"; }
 
+import_rust_mir() {
+  if python3 "$ROOT/frontends/trisynk-rs/frontend.py" "$RUST_SAMPLE" --mir "$RUST_OUT" --output "$RUST_IR"; then
+    log "attributed effects from MIR"
+  else
+    log "rust MIR import failed"
+  fi
+}
+
 run_rust_lowering() {
   if ! command -v rustc >/dev/null 2>&1; then
     echo 'rustc not found; install Rust toolchain' > "$RUST_OUT"
@@ -19,6 +29,7 @@ run_rust_lowering() {
     if rustc -Zunpretty=mir "$RUST_SAMPLE" > "$RUST_OUT" 2>"$RUST_OUT.err"; then
       rm -f "$RUST_OUT.err"
       log "wrote MIR via rustc nightly"
+      import_rust_mir
       return
     fi
   fi
@@ -27,6 +38,7 @@ run_rust_lowering() {
     if rustup run nightly rustc -Zunpretty=mir "$RUST_SAMPLE" > "$RUST_OUT" 2>"$RUST_OUT.err"; then
       rm -f "$RUST_OUT.err"
       log "wrote MIR via rustup nightly"
+      import_rust_mir
       return
     fi
   fi
@@ -45,6 +57,11 @@ run_clang_lowering() {
   if clang++ -std=c++20 -Xclang -ast-dump=json -fsyntax-only "$CLANG_SAMPLE" > "$CLANG_OUT" 2>"$CLANG_OUT.err"; then
     rm -f "$CLANG_OUT.err"
     log "wrote Clang AST JSON"
+    if python3 "$ROOT/frontends/trisynk-cpp/clang_import.py" "$CLANG_OUT" --module "$CLANG_SAMPLE" --output "$CLANG_IR"; then
+      log "imported Clang AST into IR"
+    else
+      log "clang AST import failed"
+    fi
   else
     echo 'failed to dump AST; see .err' > "$CLANG_OUT"
     log "clang AST dump failed"
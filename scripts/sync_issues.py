@@ -1,18 +1,34 @@
 #!/usr/bin/env python3
-"""Sync docs/issues + intents into GitHub Issues/Projects descriptors."""
+"""Sync docs/issues + intents into GitHub Issues/Projects descriptors.
+
+``--apply`` keeps a per-repo snapshot in ``data/cache/sync_issues/``. It holds
+the last known remote fields of every ``tri-sync`` issue, the listing's
+``since`` watermark and ETag, and for each issue the digest of the payload last
+pushed plus the ``updated_at`` that push produced. A sync lists only issues
+updated since the watermark, sending ``If-None-Match`` with the stored ETag;
+a 304 means nothing changed remotely. Results are sorted by ``updated`` so any
+change lands on the first page. A payload whose digest matches and whose issue
+is unchanged remotely is skipped without a request. Other payloads are diffed
+against the snapshot rather than refetched. ``--full`` ignores the snapshot.
+"""
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import sys
-from collections import defaultdict
 from pathlib import Path
 from typing import Any
-from urllib import request, error
+
+from github_client import GitHubClient
+from issue_graph import IssueGraph
 
 GRAPH_PATH = Path("data/outbox/issues_intents.json")
-GITHUB_API = "https://api.github.com"
+SNAPSHOT_DIR = Path("data/cache/sync_issues")
+SNAPSHOT_FORMAT = 1
+ISSUE_FIELDS = ("number", "title", "body", "state", "updated_at")
+LISTING_PAGE = 100
 
 
 def load_graph(path: Path) -> dict[str, Any]:
@@ -22,15 +38,12 @@ def load_graph(path: Path) -> dict[str, Any]:
 
 
 def build_payloads(graph: dict[str, Any]) -> list[dict[str, Any]]:
-    intents_by_issue: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for intent in graph.get("intents", []):
-        issue_id = intent.get("issue")
-        if issue_id:
-            intents_by_issue[issue_id].append(intent)
+    index = IssueGraph.from_export(graph)
+    intents = graph.get("intents", [])
     payloads: list[dict[str, Any]] = []
     for issue in graph.get("issues", []):
         body_parts = [issue["body"]]
-        linked = intents_by_issue.get(issue["id"], [])
+        linked = index.intents_for(issue["id"], intents)
         state = "open"
         if linked:
             lines = ["### Linked Intents"]
@@ -57,47 +70,116 @@ def build_payloads(graph: dict[str, Any]) -> list[dict[str, Any]]:
     return payloads
 
 
-def github_request(method: str, url: str, token: str, payload: dict[str, Any] | None = None) -> Any:
-    data = None
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {token}",
-        "X-GitHub-Api-Version": "2022-11-28",
+def payload_digest(payload: dict[str, Any]) -> str:
+    fields = {key: payload.get(key) for key in ("title", "body", "labels", "state")}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class Snapshot:
+    """Last-synced remote state for one repository (see module docstring)."""
+
+    def __init__(self, repo: str, root: Path = SNAPSHOT_DIR, fresh: bool = False) -> None:
+        self.path = root / f"{repo.replace('/', '__')}.json"
+        data = {}
+        if not fresh and self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("format") != SNAPSHOT_FORMAT or data.get("repo") != repo:
+                data = {}
+        self.repo = repo
+        self.since: str | None = data.get("since")
+        self.listing: dict[str, str] = data.get("listing", {})
+        self.issues: dict[str, dict[str, Any]] = data.get("issues", {})
+        self.pushed: dict[str, dict[str, str]] = data.get("pushed", {})
+
+    def record(self, tri_id: str, issue: dict[str, Any]) -> dict[str, Any]:
+        self.issues[tri_id] = {key: issue.get(key) for key in ISSUE_FIELDS}
+        return self.issues[tri_id]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "format": SNAPSHOT_FORMAT,
+            "repo": self.repo,
+            "since": self.since,
+            "listing": self.listing,
+            "issues": self.issues,
+            "pushed": self.pushed,
+        }
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def fetch_existing(repo: str, client: GitHubClient, snapshot: Snapshot) -> int:
+    """Fold issues updated since the snapshot's watermark into it; returns how many were listed (0 on a 304)."""
+    url = f"/repos/{repo}/issues?state=all&labels=tri-sync&sort=updated&direction=desc&per_page={LISTING_PAGE}"
+    if snapshot.since:
+        url += f"&since={snapshot.since}"
+    url += "&page=1"
+    headers = {"If-None-Match": snapshot.listing["etag"]} if snapshot.listing.get("url") == url else None
+    first, changed = client.paginate(url, headers)
+    if first.status == 304:
+        return 0
+    for issue in changed:
+        tri_id = issue.get("title", "").split(":", 1)[0]
+        snapshot.record(tri_id, issue)
+    if snapshot.since is None or len(changed) > LISTING_PAGE:
+        # Moving the watermark changes the URL, and with it the ETag. Only move it once the
+        # delta no longer fits on one page; until then the same URL keeps answering 304.
+        snapshot.since = max((issue["updated_at"] for issue in changed if issue.get("updated_at")), default=None)
+    if "etag" in first.headers:
+        snapshot.listing = {"url": url, "etag": first.headers["etag"]}
+    return len(changed)
+
+
+def sync_payload(payload: dict[str, Any], snapshot: Snapshot, repo: str, client: GitHubClient) -> str | None:
+    """Create or update one issue; returns a log line, or ``None`` when it is already in sync."""
+    tri_id = payload["tri_id"]
+    title = payload["title"]
+    target_state = payload.get("state", "open")
+    digest = payload_digest(payload)
+    issue = snapshot.issues.get(tri_id)
+    pushed = snapshot.pushed.get(tri_id)
+    if issue and pushed and pushed["digest"] == digest and pushed["updated_at"] == issue.get("updated_at"):
+        return None
+    if issue:
+        updates: dict[str, Any] = {}
+        if issue.get("title") != title:
+            updates["title"] = title
+        if issue.get("body") != payload["body"]:
+            updates["body"] = payload["body"]
+        desired_state = "closed" if target_state == "closed" else "open"
+        if issue.get("state") != desired_state:
+            updates["state"] = desired_state
+        line = None
+        if updates:
+            issue = snapshot.record(tri_id, client.call("PATCH", f"/repos/{repo}/issues/{issue['number']}", updates))
+            line = f"[sync-issues] Updating {tri_id} -> {updates.keys()}"
+        snapshot.pushed[tri_id] = {"digest": digest, "updated_at": issue.get("updated_at")}
+        return line
+
+    body = {
+        "title": title,
+        "body": payload["body"],
+        "labels": payload["labels"],
     }
-    if payload is not None:
-        data = json.dumps(payload).encode("utf-8")
-        headers["Content-Type"] = "application/json"
-    req = request.Request(url, data=data, method=method, headers=headers)
-    try:
-        with request.urlopen(req) as resp:
-            charset = resp.headers.get_content_charset("utf-8")
-            return json.loads(resp.read().decode(charset))
-    except error.HTTPError as exc:  # noqa: BLE001
-        text = exc.read().decode("utf-8", errors="replace")
-        raise RuntimeError(f"GitHub API error {exc.code}: {text}") from exc
-
-
-def fetch_existing(repo: str | None, token: str) -> dict[str, dict[str, Any]]:
-    if not repo:
-        return {}
-    issues: dict[str, dict[str, Any]] = {}
-    page = 1
-    while True:
-        url = f"{GITHUB_API}/repos/{repo}/issues?state=all&labels=tri-sync&per_page=100&page={page}"
-        batch = github_request("GET", url, token)
-        if not batch:
-            break
-        for issue in batch:
-            title = issue.get("title", "")
-            tri_id = title.split(":", 1)[0]
-            issues[tri_id] = issue
-        page += 1
-        if len(batch) < 100:
-            break
-    return issues
-
-
-def push_payloads(payloads: list[dict[str, Any]], repo: str | None, token: str, dry_run: bool, mock_output: Path | None) -> None:
+    created = client.call("POST", f"/repos/{repo}/issues", body)
+    if payload.get("state") == "closed":
+        # The create endpoint has no state field, so a closed issue still takes a follow-up PATCH.
+        created = client.call("PATCH", f"/repos/{repo}/issues/{created['number']}", {"state": "closed"})
+    issue = snapshot.record(tri_id, created)
+    snapshot.pushed[tri_id] = {"digest": digest, "updated_at": issue.get("updated_at")}
+    return f"[sync-issues] Creating issue for {title}"
+
+
+def push_payloads(
+    payloads: list[dict[str, Any]],
+    repo: str | None,
+    client: GitHubClient,
+    dry_run: bool,
+    mock_output: Path | None,
+    full: bool = False,
+) -> None:
     if dry_run:
         print(json.dumps({"preview": payloads}, indent=2, ensure_ascii=False))
         return
@@ -108,46 +190,21 @@ def push_payloads(payloads: list[dict[str, Any]], repo: str | None, token: str,
         print(f"[sync-issues] Mock sync wrote {target}")
         return
 
-    existing = fetch_existing(repo, token)
-    for payload in payloads:
-        tri_id = payload["tri_id"]
-        title = payload["title"]
-        target_state = payload.get("state", "open")
-        issue = existing.get(tri_id)
-        if issue:
-            updates: dict[str, Any] = {}
-            if issue.get("title") != title:
-                updates["title"] = title
-            if issue.get("body") != payload["body"]:
-                updates["body"] = payload["body"]
-            desired_state = "closed" if target_state == "closed" else "open"
-            if issue.get("state") != desired_state:
-                updates["state"] = desired_state
-            if updates:
-                print(f"[sync-issues] Updating {tri_id} -> {updates.keys()}")
-                github_request(
-                    "PATCH",
-                    f"{GITHUB_API}/repos/{repo}/issues/{issue['number']}",
-                    token,
-                    updates,
-                )
-            continue
-
-        url = f"{GITHUB_API}/repos/{repo}/issues"
-        body = {
-            "title": title,
-            "body": payload["body"],
-            "labels": payload["labels"],
-        }
-        print(f"[sync-issues] Creating issue for {title}")
-        created = github_request("POST", url, token, body)
-        if payload.get("state") == "closed":
-            github_request(
-                "PATCH",
-                f"{GITHUB_API}/repos/{repo}/issues/{created['number']}",
-                token,
-                {"state": "closed"},
-            )
+    snapshot = Snapshot(repo, fresh=full)
+    changed = fetch_existing(repo, client, snapshot)
+    try:
+        results = client.map(lambda payload: sync_payload(payload, snapshot, repo, client), payloads)
+    finally:
+        snapshot.save()  # keep what did get pushed even if a later call failed
+    for line in results:
+        if line:
+            print(line)
+    stats = client.stats
+    print(
+        f"[sync-issues] listing returned {changed} issues, {sum(line is None for line in results)}/{len(payloads)} payloads unchanged;"
+        f" {stats['requests']} requests ({stats['not_modified']} not modified) over {stats['connections']} connections,"
+        f" {stats['retries']} retries, {stats['rate_limit_waits']} rate-limit waits"
+    )
 
 
 def main() -> int:
@@ -156,6 +213,8 @@ def main() -> int:
     parser.add_argument("--repo", default=os.environ.get("GITHUB_REPO"))
     parser.add_argument("--apply", action="store_true", help="Create issues via GitHub API")
     parser.add_argument("--mock-output", type=Path, help="Write payloads to file instead of hitting GitHub")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="Concurrent GitHub requests")
+    parser.add_argument("--full", action="store_true", help="Ignore the local snapshot and crawl every tri-sync issue")
     args = parser.parse_args()
 
     graph = load_graph(Path(args.graph))
@@ -164,7 +223,8 @@ def main() -> int:
     dry_run = not args.apply
     if args.apply and (not token or not args.repo):
         raise SystemExit("--apply requires GITHUB_TOKEN and --repo or GITHUB_REPO")
-    push_payloads(payloads, args.repo, token or "", dry_run=dry_run, mock_output=args.mock_output)
+    with GitHubClient(token or "", max_workers=args.jobs) as client:
+        push_payloads(payloads, args.repo, client, dry_run=dry_run, mock_output=args.mock_output, full=args.full)
     return 0
 
 
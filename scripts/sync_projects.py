@@ -1,18 +1,30 @@
 #!/usr/bin/env python3
-"""Synchronize tri-sync Issues with GitHub Projects v2 via GraphQL."""
+"""Synchronize tri-sync Issues with GitHub Projects v2 via GraphQL.
+
+Project items are read together with their current value of the status field.
+Only real changes are sent: items missing from the project, and items whose
+status option differs from the desired one. Changes go out as aliased
+multi-mutation documents of ``--batch-size`` operations. All additions are
+sent first, then all status updates, so new items are known before their
+status is set. The applied plan records each issue's actions and every
+batch's size and latency.
+"""
 from __future__ import annotations
 
 import argparse
 import json
 import os
 import sys
+import time
 from pathlib import Path
 from typing import Any
-from urllib import error, request
+
+from github_client import GITHUB_API, GitHubClient
+from issue_graph import IssueGraph
 
 GRAPH_PATH = Path("data/outbox/issues_intents.json")
-GRAPHQL_URL = "https://api.github.com/graphql"
-REST_ROOT = "https://api.github.com"
+GRAPHQL_URL = os.environ.get("GITHUB_GRAPHQL_URL", f"{GITHUB_API}/graphql")
+BATCH_SIZE = 20
 
 
 def load_graph(path: Path) -> dict[str, Any]:
@@ -22,17 +34,12 @@ def load_graph(path: Path) -> dict[str, Any]:
 
 
 def build_issue_payloads(graph: dict[str, Any]) -> list[dict[str, Any]]:
-    intents_by_issue: dict[str, list[dict[str, Any]]] = {}
-    for intent in graph.get("intents", []):
-        issue_id = intent.get("issue")
-        if not issue_id:
-            continue
-        intents_by_issue.setdefault(issue_id, []).append(intent)
-
+    index = IssueGraph.from_export(graph)
+    intents = graph.get("intents", [])
     payloads: list[dict[str, Any]] = []
     for issue in graph.get("issues", []):
         tri_id = issue["id"]
-        linked = intents_by_issue.get(tri_id, [])
+        linked = index.intents_for(tri_id, intents)
         desired_state = "open"
         for intent in linked:
             state = intent.get("state", "open")
@@ -48,58 +55,48 @@ def build_issue_payloads(graph: dict[str, Any]) -> list[dict[str, Any]]:
     return payloads
 
 
-def rest_request(token: str, url: str) -> Any:
-    headers = {"Accept": "application/vnd.github+json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    req = request.Request(url, headers=headers)
-    with request.urlopen(req) as resp:  # noqa: S310
-        charset = resp.headers.get_content_charset("utf-8")
-        return json.loads(resp.read().decode(charset))
+def graphql_request(client: GitHubClient, query: str, variables: dict[str, Any], mutation: bool = False) -> Any:
+    # Both mutations used here are idempotent (re-adding an item returns the existing one), so retries are safe.
+    data = client.call("POST", GRAPHQL_URL, {"query": query, "variables": variables}, idempotent=True)
+    if data.get("errors"):
+        raise RuntimeError(f"GraphQL errors{' in mutation batch' if mutation else ''}: {data['errors']}")
+    return data
 
 
-def graphql_request(token: str, query: str, variables: dict[str, Any]) -> Any:
-    body = json.dumps({"query": query, "variables": variables}).encode("utf-8")
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
-    req = request.Request(GRAPHQL_URL, data=body, headers=headers)
-    try:
-        with request.urlopen(req) as resp:  # noqa: S310
-            charset = resp.headers.get_content_charset("utf-8")
-            data = json.loads(resp.read().decode(charset))
-            if data.get("errors"):
-                raise RuntimeError(f"GraphQL errors: {data['errors']}")
-            return data
-    except error.HTTPError as exc:  # noqa: BLE001
-        text = exc.read().decode("utf-8", errors="replace")
-        raise RuntimeError(f"GraphQL error {exc.code}: {text}") from exc
-
-
-def fetch_tri_issues(repo: str, token: str) -> dict[str, dict[str, Any]]:
+def fetch_tri_issues(repo: str, client: GitHubClient) -> dict[str, dict[str, Any]]:
     issues: dict[str, dict[str, Any]] = {}
-    page = 1
-    while True:
-        url = f"{REST_ROOT}/repos/{repo}/issues?state=all&labels=tri-sync&per_page=100&page={page}"
-        batch = rest_request(token, url)
-        if not batch:
-            break
-        for issue in batch:
-            tri_id = issue.get("title", "").split(":", 1)[0]
-            issues[tri_id] = issue
-        page += 1
-        if len(batch) < 100:
-            break
+    _, batch = client.paginate(f"/repos/{repo}/issues?state=all&labels=tri-sync&per_page=100&page=1")
+    for issue in batch:
+        tri_id = issue.get("title", "").split(":", 1)[0]
+        issues[tri_id] = issue
     return issues
 
 
-def fetch_project_items(project_id: str, token: str) -> dict[str, str]:
-    items: dict[str, str] = {}
+def fetch_field_name(field_id: str, client: GitHubClient) -> str:
+    query = """
+    query($field: ID!) {
+      node(id: $field) {
+        ... on ProjectV2SingleSelectField { name }
+      }
+    }
+    """
+    node = graphql_request(client, query, {"field": field_id}).get("data", {}).get("node")
+    if not node or not node.get("name"):
+        raise RuntimeError(f"Project field {field_id} is not a single-select field")
+    return node["name"]
+
+
+def fetch_project_items(project_id: str, field_id: str, client: GitHubClient) -> dict[str, dict[str, str | None]]:
+    """Issue node id -> ``{"item": project item id, "option": current status option id or None}``.
+
+    The status value is selected by field name, so it is found however many
+    other fields the project has.
+    """
+    items: dict[str, dict[str, str | None]] = {}
     cursor = None
+    field_name = fetch_field_name(field_id, client)
     query = """
-    query($project: ID!, $after: String) {
+    query($project: ID!, $after: String, $field: String!) {
       node(id: $project) {
         ... on ProjectV2 {
           items(first: 100, after: $after) {
@@ -108,6 +105,9 @@ def fetch_project_items(project_id: str, token: str) -> dict[str, str]:
               content {
                 ... on Issue { id title }
               }
+              fieldValueByName(name: $field) {
+                ... on ProjectV2ItemFieldSingleSelectValue { optionId }
+              }
             }
             pageInfo { hasNextPage endCursor }
           }
@@ -116,7 +116,7 @@ def fetch_project_items(project_id: str, token: str) -> dict[str, str]:
     }
     """
     while True:
-        data = graphql_request(token, query, {"project": project_id, "after": cursor})
+        data = graphql_request(client, query, {"project": project_id, "after": cursor, "field": field_name})
         node = data.get("data", {}).get("node")
         if not node:
             break
@@ -124,8 +124,9 @@ def fetch_project_items(project_id: str, token: str) -> dict[str, str]:
         for entry in items_page["nodes"]:
             content = entry.get("content") or {}
             issue_id = content.get("id")
-            if issue_id:
-                items[issue_id] = entry["id"]
+            if not issue_id:
+                continue
+            items[issue_id] = {"item": entry["id"], "option": (entry.get("fieldValueByName") or {}).get("optionId")}
         page_info = items_page["pageInfo"]
         if not page_info["hasNextPage"]:
             break
@@ -133,48 +134,74 @@ def fetch_project_items(project_id: str, token: str) -> dict[str, str]:
     return items
 
 
-def add_project_item(project_id: str, content_id: str, token: str) -> str:
-    mutation = """
-    mutation($project: ID!, $content: ID!) {
-      addProjectV2ItemById(input: {projectId: $project, contentId: $content}) {
-        item { id }
-      }
-    }
-    """
-    data = graphql_request(token, mutation, {"project": project_id, "content": content_id})
-    item = data.get("data", {}).get("addProjectV2ItemById", {}).get("item")
-    if not item:
-        raise RuntimeError("Failed to add project item")
-    return item["id"]
-
-
-def update_project_status(project_id: str, item_id: str, field_id: str, option_id: str, token: str) -> None:
-    mutation = """
-    mutation($project: ID!, $item: ID!, $field: ID!, $option: String!) {
-      updateProjectV2ItemFieldValue(input: {
-        projectId: $project,
-        itemId: $item,
-        fieldId: $field,
-        value: { singleSelectOptionId: $option }
-      }) {
-        projectV2Item { id }
-      }
-    }
-    """
-    graphql_request(token, mutation, {"project": project_id, "item": item_id, "field": field_id, "option": option_id})
+def add_items_document(count: int) -> str:
+    params = "".join(f", $c{index}: ID!" for index in range(count))
+    body = "\n".join(
+        f"  a{index}: addProjectV2ItemById(input: {{projectId: $project, contentId: $c{index}}}) {{ item {{ id }} }}"
+        for index in range(count)
+    )
+    return f"mutation($project: ID!{params}) {{\n{body}\n}}"
+
+
+def update_status_document(count: int) -> str:
+    params = "".join(f", $i{index}: ID!, $o{index}: String!" for index in range(count))
+    body = "\n".join(
+        f"  u{index}: updateProjectV2ItemFieldValue(input: {{projectId: $project, itemId: $i{index}, fieldId: $field,"
+        f" value: {{singleSelectOptionId: $o{index}}}}}) {{ projectV2Item {{ id }} }}"
+        for index in range(count)
+    )
+    return f"mutation($project: ID!, $field: ID!{params}) {{\n{body}\n}}"
+
+
+def run_batches(
+    kind: str, operations: list[dict[str, str]], batch_size: int, send: Any, batches: list[dict[str, Any]]
+) -> list[Any]:
+    """Send ``operations`` in chunks via ``send(chunk)``; append size and latency per chunk to ``batches``."""
+    results: list[Any] = []
+    for start in range(0, len(operations), batch_size):
+        chunk = operations[start : start + batch_size]
+        began = time.perf_counter()
+        results.extend(send(chunk))
+        batches.append({"kind": kind, "size": len(chunk), "latency_ms": round((time.perf_counter() - began) * 1000, 1)})
+    return results
+
 
+def add_project_items(project_id: str, content_ids: list[str], client: GitHubClient, batch_size: int, batches: list) -> list[str]:
+    def send(chunk: list[str]) -> list[str]:
+        variables: dict[str, Any] = {"project": project_id}
+        variables.update({f"c{index}": content for index, content in enumerate(chunk)})
+        data = graphql_request(client, add_items_document(len(chunk)), variables, mutation=True)["data"]
+        return [data[f"a{index}"]["item"]["id"] for index in range(len(chunk))]
 
-def write_plan(plan: list[dict[str, Any]], path: Path) -> None:
+    return run_batches("add", content_ids, batch_size, send, batches)
+
+
+def update_statuses(
+    project_id: str, field_id: str, updates: list[tuple[str, str]], client: GitHubClient, batch_size: int, batches: list
+) -> None:
+    def send(chunk: list[tuple[str, str]]) -> list[None]:
+        variables: dict[str, Any] = {"project": project_id, "field": field_id}
+        for index, (item_id, option_id) in enumerate(chunk):
+            variables[f"i{index}"] = item_id
+            variables[f"o{index}"] = option_id
+        graphql_request(client, update_status_document(len(chunk)), variables, mutation=True)
+        return [None] * len(chunk)
+
+    run_batches("status", updates, batch_size, send, batches)
+
+
+def write_plan(plan: Any, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(plan, indent=2, ensure_ascii=False), encoding="utf-8")
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
     parser.add_argument("--graph", default=str(GRAPH_PATH))
     parser.add_argument("--repo", default=os.environ.get("GITHUB_REPO"))
     parser.add_argument("--apply", action="store_true", help="Apply mutations against GitHub")
     parser.add_argument("--plan", default="data/outbox/projects_sync_payload.json", help="Where to store dry-run plan")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Mutations per GraphQL document")
     args = parser.parse_args()
 
     graph = load_graph(Path(args.graph))
@@ -193,39 +220,59 @@ def main() -> int:
     if not all([token, project_id, field_id, status_map_raw, repo]):
         raise SystemExit("Missing PROJECT_ID/PROJECT_FIELD_STATUS_ID/PROJECT_STATUS_MAP/GITHUB_TOKEN/GITHUB_REPO")
     status_map = json.loads(status_map_raw)
+    batch_size = max(1, args.batch_size)
 
-    tri_issues = fetch_tri_issues(repo, token)
-    project_items = fetch_project_items(project_id, token)
-
-    plan: list[dict[str, Any]] = []
-    for payload in payloads:
-        tri_id = payload["tri_id"]
-        desired_state = payload["state"]
-        issue = tri_issues.get(tri_id)
-        record = {"issue": tri_id, "state": desired_state, "actions": []}
-        if not issue:
-            record["actions"].append("missing_issue")
-            plan.append(record)
-            continue
-        content_id = issue.get("node_id")
-        if not content_id:
-            record["actions"].append("missing_node_id")
-            plan.append(record)
-            continue
-        item_id = project_items.get(content_id)
-        if not item_id:
-            item_id = add_project_item(project_id, content_id, token)
-            project_items[content_id] = item_id
+    with GitHubClient(token) as client:
+        tri_issues, project_items = client.map(
+            lambda fetch: fetch(),
+            [lambda: fetch_tri_issues(repo, client), lambda: fetch_project_items(project_id, field_id, client)],
+        )
+
+        records: list[dict[str, Any]] = []
+        to_add: list[tuple[dict[str, Any], str, str]] = []  # (record, content id, option id)
+        to_update: list[tuple[dict[str, Any], str, str]] = []  # (record, item id, option id)
+        for payload in payloads:
+            tri_id = payload["tri_id"]
+            desired_state = payload["state"]
+            issue = tri_issues.get(tri_id)
+            record = {"issue": tri_id, "state": desired_state, "actions": []}
+            records.append(record)
+            if not issue:
+                record["actions"].append("missing_issue")
+                continue
+            content_id = issue.get("node_id")
+            if not content_id:
+                record["actions"].append("missing_node_id")
+                continue
+            option_id = status_map.get(desired_state) or status_map.get("default")
+            if not option_id:
+                raise SystemExit(f"Missing status option for state {desired_state}")
+            current = project_items.get(content_id)
+            if current is None:
+                to_add.append((record, content_id, option_id))
+            elif current["option"] != option_id:
+                to_update.append((record, current["item"], option_id))
+            else:
+                record["actions"].append("unchanged")
+
+        batches: list[dict[str, Any]] = []
+        added = add_project_items(project_id, [content for _, content, _ in to_add], client, batch_size, batches)
+        to_set = [(record, item_id, option_id) for (record, _, option_id), item_id in zip(to_add, added)]
+        for record, _, _ in to_set:
             record["actions"].append("added_item")
-        option_id = status_map.get(desired_state) or status_map.get("default")
-        if not option_id:
-            raise SystemExit(f"Missing status option for state {desired_state}")
-        update_project_status(project_id, item_id, field_id, option_id, token)
-        record["actions"].append("updated_status")
-        plan.append(record)
-
-    write_plan(plan, Path(args.plan))
-    print(f"[sync-projects] applied plan written to {args.plan}")
+        statuses = [(item, option) for _, item, option in to_update + to_set]
+        update_statuses(project_id, field_id, statuses, client, batch_size, batches)
+        for record, _, _ in to_update:
+            record["actions"].append("updated_status")
+        for record, _, _ in to_set:
+            record["actions"].append("set_status")
+
+    write_plan({"items": records, "batches": batches, "batch_size": batch_size}, Path(args.plan))
+    print(
+        f"[sync-projects] {len(to_add)} added (status set), {len(to_update)} status updates,"
+        f" {sum(record['actions'] == ['unchanged'] for record in records)} unchanged in {len(batches)} batches;"
+        f" applied plan written to {args.plan}"
+    )
     return 0
 
 
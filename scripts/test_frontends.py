@@ -2,57 +2,151 @@
 """Smoke-test frontends JSON structure."""
 from __future__ import annotations
 
+import argparse
 import json
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
+from typing import Iterable, Iterator
 
 ROOT = Path(__file__).resolve().parents[1]
 RS_SAMPLES = sorted((ROOT / "frontends" / "samples").glob("*.rs"))
 CPP_SAMPLES = sorted((ROOT / "frontends" / "samples").glob("*.cpp"))
 RS_FRONTEND = ROOT / "frontends" / "trisynk-rs" / "frontend.py"
 CPP_FRONTEND = ROOT / "frontends" / "trisynk-cpp" / "frontend.py"
-SCHEMA = json.loads((ROOT / "schema" / "frontend_ir.schema.json").read_text(encoding="utf-8"))
 
+sys.path.insert(0, str(ROOT / "scripts"))
 
-def run(cmd: list[str]) -> str:
-    result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-    return result.stdout
+from ir_schema import load_validator  # noqa: E402
+
+SCHEMA_CHECK = load_validator()
+
+
+def check(payload: dict) -> str | None:
+    """Schema errors first, then conventions the schema leaves open."""
+    error = SCHEMA_CHECK(payload, "$")
+    if error is None and payload["abi"]["calling_convention"] != "trisynk_fastcall":
+        error = "$.abi.calling_convention: ABI calling convention mismatch"
+    return error
+
+
+def span_error(payload: dict) -> str | None:
+    """Each span's lines must be the lines of its offsets (the declaration start, e.g. a ``template<...>`` line)."""
+    path = Path(payload.get("module", ""))
+    if not path.is_file():
+        return None
+    text = path.read_text(encoding="utf-8")
+    for fn in payload["functions"]:
+        span = fn.get("span")
+        if span is None:
+            continue
+        lines = (text.count("\n", 0, span["start"]) + 1, text.count("\n", 0, span["end"] - 1) + 1)
+        if lines != (span["start_line"], span["end_line"]):
+            return f"$.functions[{fn['name']}].span: lines {span['start_line']}-{span['end_line']} != offsets' lines {lines[0]}-{lines[1]}"
+    return None
 
 
 def validate(payload: dict) -> None:
-    for key in SCHEMA["required"]:
-        if key not in payload:
-            raise SystemExit(f"Missing key {key}")
-    if payload["language"] not in {"rust", "cpp"}:
-        raise SystemExit(f"Unsupported language {payload['language']}")
-    functions = payload.get("functions", [])
-    if not isinstance(functions, list) or not functions:
-        raise SystemExit("Functions list empty")
-    for fn in functions:
-        for field in ("name", "effects", "resources"):
-            if field not in fn:
-                raise SystemExit(f"Function missing {field}: {fn}")
-        if not isinstance(fn["effects"], list):
-            raise SystemExit("effects must be list")
-        if not isinstance(fn["resources"], dict):
-            raise SystemExit("resources must be object")
-    abi = payload.get("abi", {})
-    if abi.get("calling_convention") != "trisynk_fastcall":
-        raise SystemExit("ABI calling convention mismatch")
+    error = check(payload)
+    if error is not None:
+        raise SystemExit(error)
+
+
+def iter_modules(lines: Iterable[str]) -> Iterator[tuple[dict, float]]:
+    """Reassemble NDJSON IR records into modules as they arrive, with the time spent reading each."""
+    module = None
+    start = time.perf_counter()
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        kind = record.pop("record", None)
+        if kind == "module":
+            if module is not None:
+                raise SystemExit(f"Module {record.get('module')} started before previous abi record")
+            module = {**record, "functions": []}
+        elif kind == "function" and module is not None:
+            module["functions"].append(record)
+        elif kind == "abi" and module is not None:
+            module["abi"] = record
+            yield module, time.perf_counter() - start
+            module = None
+            start = time.perf_counter()
+        else:
+            raise SystemExit(f"Unexpected {kind!r} record")
+    if module is not None:
+        raise SystemExit("Truncated IR stream (missing abi record)")
+
+
+def validate_stream(lines: Iterable[str], results: list[dict] | None = None) -> int:
+    """Validate NDJSON IR records module by module while the frontend streams them."""
+    modules = 0
+    for module, produced in iter_modules(lines):
+        start = time.perf_counter()
+        error = check(module) or span_error(module)
+        if results is not None:
+            results.append(
+                {
+                    "module": module.get("module"),
+                    "ok": error is None,
+                    "error": error,
+                    "produce_ms": round(produced * 1000, 3),
+                    "validate_ms": round((time.perf_counter() - start) * 1000, 3),
+                }
+            )
+        if error is not None:
+            raise SystemExit(f"{module.get('module')}: {error}")
+        modules += 1
+    return modules
 
 
 def main() -> int:
-    outputs = []
-    for sample in RS_SAMPLES:
-        blob = run([sys.executable, str(RS_FRONTEND), str(sample)])
-        outputs.append(blob)
-    for sample in CPP_SAMPLES:
-        blob = run([sys.executable, str(CPP_FRONTEND), str(sample)])
-        outputs.append(blob)
-    for blob in outputs:
-        validate(json.loads(blob))
-    print(f"[test-frontends] ok ({len(outputs)} artifacts)")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--report", type=Path, help="Write per-artifact timing as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results: list[dict] = []
+    failures: list[str] = []
+    procs = []
+    for frontend, samples in ((RS_FRONTEND, RS_SAMPLES), (CPP_FRONTEND, CPP_SAMPLES)):
+        # Both frontends stream concurrently; records are validated while each one produces them.
+        cmd = [sys.executable, str(frontend), "--jobs", "1", "--format", "ndjson", *map(str, samples)]
+        procs.append((frontend, subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)))
+
+    def consume(frontend: Path, proc: subprocess.Popen) -> None:
+        try:
+            validate_stream(proc.stdout, results)
+        except (SystemExit, ValueError) as exc:
+            failures.append(f"{frontend.parent.name}: {exc}")
+            for _, other in procs:
+                other.kill()  # first failure stops every producer
+
+    threads = [threading.Thread(target=consume, args=item) for item in procs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for frontend, proc in procs:
+        proc.stdout.close()
+        if proc.wait() and not failures:
+            failures.append(f"{frontend} exited with {proc.returncode}")
+
+    if args.report:
+        report = {
+            "ok": not failures,
+            "artifacts": len(results),
+            "seconds": round(time.perf_counter() - start, 4),
+            "failures": failures,
+            "results": results,
+        }
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if failures:
+        raise SystemExit(failures[0])
+    print(f"[test-frontends] ok ({len(results)} artifacts)")
     return 0
 
 
@@ -1,30 +1,177 @@
 #!/usr/bin/env python3
-"""Generate lightweight dashboard data from metrics history."""
+"""Generate columnar dashboard data with precomputed trends from metrics history.
+
+Every numeric field of the history entries becomes one series, with nested
+fields dotted (``criterion.accumulate.mean_ns``, ``memory.trisynk-rs.peak_rss_mb``).
+Each series stores aligned columns: ``value``, the rolling ``median`` and the
+``p05``/``p95`` band over the last ``WINDOW`` points, and an ``ewma``. A series
+missing from an entry gets ``null`` at that position. Change points come from a
+two-sided CUSUM on the deviation from the EWMA, scaled by the window's median
+absolute deviation. After a change the window restarts at the new level.
+
+The dashboard file itself carries the resume state: besides the last
+``SERIES_LENGTH`` points it stores the rolling trend state and a cursor into the
+history store under ``resume``. Both are committed next to
+``reports/history/index.json``, so every checkout (CI included) reads only the
+entries appended since the dashboard was last written, and the file stays the
+same size however long the history grows. A cursor the history index does not
+hold (rewritten or reset history) falls back to a full rebuild, as does
+``--rebuild``.
+"""
 from __future__ import annotations
 
+import argparse
 import json
+import os
+from datetime import datetime, timezone
 from pathlib import Path
 
+from bench_harness import percentile
+from metrics_store import MetricsStore, numeric_fields
+
 ROOT = Path(__file__).resolve().parents[1]
-HISTORY = ROOT / "reports" / "history" / "metrics_history.jsonl"
 DASHBOARD = ROOT / "reports" / "dashboard" / "metrics_dashboard.json"
+CARGO_METRICS = ROOT / "reports" / "cargo_metrics.json"
+FORMAT_VERSION = 1
+SERIES_LENGTH = 100
+WINDOW = 20
+EWMA_ALPHA = 0.2
+CUSUM_SLACK = 0.5  # deviations (in robust sigmas) absorbed per point
+CUSUM_LIMIT = 5.0  # accumulated deviation that marks a change
+MIN_POINTS = 5  # no change detection until the window holds this many points
+COLUMNS = ("value", "median", "p05", "p95", "ewma")
+
+
+def _robust_sigma(window: list[float]) -> float:
+    ordered = sorted(window)
+    middle = percentile(ordered, 0.5)
+    mad = percentile(sorted(abs(value - middle) for value in ordered), 0.5)
+    # A flat window has no spread; fall back to 1% of its level so a step still registers.
+    return 1.4826 * mad or abs(middle) * 0.01 or 1e-9
+
+
+def _advance(trend: dict, value: float) -> tuple[dict, str | None]:
+    """Fold one point into a series' rolling state; return its derived columns and any change direction."""
+    window = trend["window"]
+    change = None
+    if trend["ewma"] is not None and len(window) >= MIN_POINTS:
+        deviation = (value - trend["ewma"]) / _robust_sigma(window)
+        trend["pos"] = max(0.0, trend["pos"] + deviation - CUSUM_SLACK)
+        trend["neg"] = max(0.0, trend["neg"] - deviation - CUSUM_SLACK)
+        if trend["pos"] > CUSUM_LIMIT or trend["neg"] > CUSUM_LIMIT:
+            change = "up" if trend["pos"] > CUSUM_LIMIT else "down"
+            trend.update(pos=0.0, neg=0.0, ewma=None)
+            window.clear()
+    window.append(value)
+    del window[:-WINDOW]
+    trend["ewma"] = value if trend["ewma"] is None else EWMA_ALPHA * value + (1 - EWMA_ALPHA) * trend["ewma"]
+    ordered = sorted(window)
+    row = {
+        "value": value,
+        "median": percentile(ordered, 0.5),
+        "p05": percentile(ordered, 0.05),
+        "p95": percentile(ordered, 0.95),
+        "ewma": trend["ewma"],
+    }
+    return {key: round(number, 4) for key, number in row.items()}, change
+
+
+def empty_state() -> dict:
+    return {"format": FORMAT_VERSION, "cursor": None, "timestamp": [], "series": {}, "trends": {}, "change_points": []}
+
+
+def load_state(path: Path, store: MetricsStore) -> dict:
+    """Resume from the dashboard at ``path`` when its cursor still points into ``store``."""
+    if not path.exists():
+        return empty_state()
+    dashboard = json.loads(path.read_text(encoding="utf-8"))
+    resume = dashboard.get("resume")
+    if dashboard.get("format") != FORMAT_VERSION or not resume or not store.holds(resume["cursor"]):
+        return empty_state()
+    return {
+        "format": FORMAT_VERSION,
+        "cursor": resume["cursor"],
+        "timestamp": dashboard["timestamp"],
+        "series": dashboard["series"],
+        "trends": resume["trends"],
+        "change_points": dashboard["change_points"],
+    }
+
+
+def apply(state: dict, entries: list[dict]) -> None:
+    """Append ``entries`` to the columns and trends in ``state``, then trim to ``SERIES_LENGTH`` points."""
+    timestamps, series, trends = state["timestamp"], state["series"], state["trends"]
+    for entry in entries:
+        position = len(timestamps)
+        timestamps.append(entry["timestamp"])
+        seen = set()
+        for name, value in numeric_fields(entry):
+            seen.add(name)
+            if name not in series:
+                series[name] = {column: [None] * position for column in COLUMNS}
+                trends[name] = {"window": [], "ewma": None, "pos": 0.0, "neg": 0.0}
+            row, change = _advance(trends[name], value)
+            for column in COLUMNS:
+                series[name][column].append(row[column])
+            if change:
+                state["change_points"].append(
+                    {"series": name, "timestamp": entry["timestamp"], "direction": change, "value": row["value"]}
+                )
+        for name in series.keys() - seen:
+            for column in COLUMNS:
+                series[name][column].append(None)
+    drop = len(timestamps) - SERIES_LENGTH
+    if drop > 0:
+        del timestamps[:drop]
+        for columns in series.values():
+            for values in columns.values():
+                del values[:drop]
+        for name in [name for name, columns in series.items() if not any(value is not None for value in columns["value"])]:
+            del series[name]  # series that stopped reporting before the visible range
+            del trends[name]
+    first = timestamps[0] if timestamps else ""
+    state["change_points"] = [point for point in state["change_points"] if point["timestamp"] >= first]
+
+
+def cargo_summary() -> dict:
+    """Current cargo/Criterion status and per-benchmark estimates, shown alongside the history series."""
+    if not CARGO_METRICS.exists():
+        return {}
+    data = json.loads(CARGO_METRICS.read_text(encoding="utf-8"))
+    return {"status": data.get("status"), "benchmarks": data.get("benchmarks", {})}
 
 
 def main() -> int:
-    entries = []
-    if HISTORY.exists():
-        with HISTORY.open(encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entries.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-    DASHBOARD.parent.mkdir(parents=True, exist_ok=True)
-    DASHBOARD.write_text(json.dumps({"series": entries[-100:]}, indent=2), encoding="utf-8")
-    print(f"[dashboard] wrote {DASHBOARD}")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the resume state and recompute from the full history")
+    parser.add_argument("--output", type=Path, default=DASHBOARD)
+    args = parser.parse_args()
+
+    store = MetricsStore()
+    state = empty_state() if args.rebuild else load_state(args.output, store)
+    entries, state["cursor"] = store.since(state["cursor"])
+    apply(state, entries)
+
+    dashboard = {
+        "format": FORMAT_VERSION,
+        "generated": datetime.now(timezone.utc).isoformat(),
+        "window": WINDOW,
+        "ewma_alpha": EWMA_ALPHA,
+        "length": len(state["timestamp"]),
+        "timestamp": state["timestamp"],
+        "series": state["series"],
+        "change_points": state["change_points"],
+        "cargo": cargo_summary(),
+        "resume": {"cursor": state["cursor"], "trends": state["trends"]},
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = args.output.with_suffix(".tmp")
+    tmp.write_text(json.dumps(dashboard, indent=1) + "\n", encoding="utf-8")
+    os.replace(tmp, args.output)
+    print(
+        f"[dashboard] wrote {args.output} ({len(entries)} new entries, {dashboard['length']} points,"
+        f" {len(state['series'])} series, {len(state['change_points'])} change points)"
+    )
     return 0
 
 
@@ -1,15 +1,17 @@
 #!/usr/bin/env python3
-"""Append current metrics.json to history log."""
+"""Append current metrics.json to the segmented history store."""
 from __future__ import annotations
 
 import json
 from datetime import datetime, timezone
 from pathlib import Path
 
+from metrics_store import LEGACY_FILE, MetricsStore
+
 ROOT = Path(__file__).resolve().parents[1]
 METRICS = ROOT / "reports" / "metrics.json"
-HISTORY_DIR = ROOT / "reports" / "history"
-HISTORY_FILE = HISTORY_DIR / "metrics_history.jsonl"
+CARGO_METRICS = ROOT / "reports" / "cargo_metrics.json"
+CRITERION_FIELDS = ("mean_ns", "median_ns", "std_dev_ns", "throughput")
 
 
 def main() -> int:
@@ -20,10 +22,26 @@ def main() -> int:
         "timestamp": datetime.now(timezone.utc).isoformat(),
         **data,
     }
-    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
-    with HISTORY_FILE.open("a", encoding="utf-8") as fh:
-        fh.write(json.dumps(entry) + "\n")
-    print(f"[metrics-history] appended entry, coverage={data.get('coverage')} perf={data.get('perf_latency_pct')}")
+    if CARGO_METRICS.exists():
+        benchmarks = json.loads(CARGO_METRICS.read_text(encoding="utf-8")).get("benchmarks", {})
+        if benchmarks:
+            entry["criterion"] = {
+                name: {key: metrics[key] for key in CRITERION_FIELDS if metrics.get(key) is not None}
+                for name, metrics in benchmarks.items()
+            }
+    store = MetricsStore()
+    if LEGACY_FILE.exists():
+        migrated = store.import_jsonl(LEGACY_FILE)
+        LEGACY_FILE.unlink()
+        print(f"[metrics-history] migrated {migrated} entries from {LEGACY_FILE.name}")
+    store.append(entry)
+    folded = store.compact()
+    print(
+        f"[metrics-history] appended entry, coverage={data.get('coverage')} perf={data.get('perf_latency_pct')}"
+        f" peak_rss_mb={data.get('peak_rss_mb')}"
+        f" benchmarks={len(entry.get('criterion', {}))}"
+        + (f", rolled up {len(folded)} segments" if folded else "")
+    )
     return 0
 
 
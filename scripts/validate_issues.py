@@ -1,21 +1,26 @@
 #!/usr/bin/env python3
-"""Validate docs/issues.md structure and references."""
+"""Validate docs/issues.md (and docs/issues/*.md shards) structure and references.
+
+Sections come from the ``issue_store`` index. Each source's failures are cached
+in ``data/cache/validate_issues/state.json`` under its SHA-256, so only
+sources that changed since the last run are validated. The state also records
+the SHA-256 of this script and is discarded when the rules change. Many changed sources
+are validated in parallel. Failures print in source order, as if every source
+had been checked.
+"""
 from __future__ import annotations
 
-import re
+import argparse
+import hashlib
+import json
+import os
 import sys
 from pathlib import Path
 
-ISSUE_MD = Path("docs/issues.md")
-HEADER_RE = re.compile(r"^##\s+(ISS-\d+)\s+\u2013\s+(.+)$", re.MULTILINE)
-
+from issue_store import INDEX_PATH, IssueIndex, map_sources
 
-def extract_sections(text: str):
-    matches = list(HEADER_RE.finditer(text))
-    for idx, match in enumerate(matches):
-        start = match.start()
-        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
-        yield match.group(1), text[start:end]
+STATE_PATH = Path("data/cache/validate_issues/state.json")
+VALIDATOR = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()  # cached verdicts are only valid for these rules
 
 
 def validate_section(issue_id: str, body: str):
@@ -35,23 +40,49 @@ def validate_section(issue_id: str, body: str):
     return errors
 
 
+def validate_source(item: tuple[str, list[dict]]) -> list[str]:
+    path, sections = item
+    raw = Path(path).read_bytes()
+    failures = []
+    for section in sections:
+        errs = validate_section(section["id"], raw[section["start"] : section["end"]].decode("utf-8"))
+        if errs:
+            failures.append(f"{section['id']}: {', '.join(errs)}")
+    return failures
+
+
 def main() -> int:
-    text = ISSUE_MD.read_text(encoding="utf-8")
-    sections = list(extract_sections(text))
-    if not sections:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-cache", action="store_true", help="Validate every source and leave the caches untouched")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker processes for many changed sources (default: CPU count)")
+    args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+
+    index = IssueIndex(None if args.no_cache else INDEX_PATH).refresh(jobs)
+    if not index.issues:
         print("[validate-issues] No issue sections found", file=sys.stderr)
         return 1
-    failures: list[str] = []
-    for issue_id, body in sections:
-        errs = validate_section(issue_id, body)
-        if errs:
-            failures.append(f"{issue_id}: {', '.join(errs)}")
+    state = {}
+    if not args.no_cache and STATE_PATH.exists():
+        saved = json.loads(STATE_PATH.read_text(encoding="utf-8"))
+        if saved.get("validator") == VALIDATOR:
+            state = saved["sources"]
+    stale = [path for path, entry in index.sources.items() if state.get(path, {}).get("sha256") != entry["sha256"]]
+    for path, failures in zip(stale, map_sources(validate_source, [(path, index.sources[path]["sections"]) for path in stale], jobs)):
+        state[path] = {"sha256": index.sources[path]["sha256"], "failures": failures}
+    state = {path: state[path] for path in index.sources}
+    if stale and not args.no_cache:
+        STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        STATE_PATH.write_text(json.dumps({"validator": VALIDATOR, "sources": state}), encoding="utf-8")
+
+    failures = [item for entry in state.values() for item in entry["failures"]]
+    failures += [f"{issue_id}: defined in {', '.join(paths)}" for issue_id, paths in sorted(index.duplicates.items())]
     if failures:
         print("[validate-issues] FAIL")
         for item in failures:
             print(f"  - {item}")
         return 1
-    print("[validate-issues] OK")
+    print(f"[validate-issues] OK ({len(stale)}/{len(index.sources)} sources checked)")
     return 0
 
 